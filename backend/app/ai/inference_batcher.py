@@ -0,0 +1,88 @@
+# backend/app/ai/inference_batcher.py
+
+import asyncio
+import contextvars
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Gathers concurrent inference requests into micro-batches.
+
+    Callers submit one input at a time (from any thread) and get back their own output.
+    A single worker thread waits for the first request, keeps collecting until `max_batch_size`
+    inputs are queued or `max_wait_ms` has passed, and calls `run_batch(inputs) -> outputs` once.
+    Each request carries its caller's context (request id, request timings) into the worker thread.
+    """
+
+    def __init__(self, name: str, run_batch, max_batch_size: int = 8, max_wait_ms: int = 20):
+        self.name = name
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0, max_wait_ms) / 1000.0
+        self._queue = queue.Queue()
+        self._worker = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._start_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name=f"{self.name}-batcher", daemon=True)
+                self._worker.start()
+
+    def submit(self, item) -> Future:
+        """ Queues one input and returns a Future resolving to its output. """
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((item, future, contextvars.copy_context()))
+        return future
+
+    def infer(self, item):
+        """ Blocking call: waits for the batch containing `item` and returns its output. """
+        return self.submit(item).result()
+
+    async def infer_async(self, item):
+        """ Awaits the output for `item` without blocking the event loop. """
+        return await asyncio.wrap_future(self.submit(item))
+
+    def _collect_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            # ✅ Skip requests whose callers already gave up
+            batch = [request for request in batch if request[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            # ✅ A batch of one runs in its caller's context; a shared batch belongs to no single request
+            context = batch[0][2] if len(batch) == 1 else contextvars.Context()
+            try:
+                outputs = context.run(self.run_batch, [item for item, _, _ in batch])
+            except Exception as e:
+                for _, future, caller_context in batch:
+                    caller_context.run(logger.error, "%s batch of %d failed: %s", self.name, len(batch), e)
+                    future.set_exception(e)
+                continue
+
+            for (_, future, _), output in zip(batch, outputs):
+                future.set_result(output)
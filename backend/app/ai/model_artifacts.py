@@ -0,0 +1,167 @@
+# backend/app/ai/model_artifacts.py
+
+import hashlib
+import json
+import logging
+import os
+from types import SimpleNamespace
+
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "manifest.json"
+CHUNK_SIZE = 1024 * 1024
+
+
+class ModelArtifactError(RuntimeError):
+    """ Raised when a pinned model artifact is missing, corrupt or cannot be built. """
+
+
+def _build_deeplabv3():
+    from torchvision.models.segmentation import deeplabv3_resnet101
+    return deeplabv3_resnet101(weights=None, weights_backbone=None, aux_loss=True)
+
+
+def _build_resnet18():
+    from torchvision.models import resnet18
+    return resnet18(weights=None)
+
+
+# ✅ Architectures that can be rebuilt locally to receive a `state_dict` artifact.
+# Models not listed here (e.g. MiDaS, whose code lives in the hub repo) must be pinned as TorchScript.
+ARCHITECTURES = {
+    "deeplabv3_resnet101": _build_deeplabv3,
+    "resnet18": _build_resnet18,
+}
+
+_manifest = None
+_verified = {}
+
+
+def artifacts_enabled() -> bool:
+    return bool(settings.MODEL_ARTIFACT_DIR)
+
+
+def get_manifest() -> dict:
+    """
+    Reads `manifest.json` from the artifact directory. Each entry looks like:
+    {"deeplabv3_resnet101": {"file": "deeplabv3.pt", "format": "torchscript", "sha256": "..."}}
+    """
+    global _manifest
+    if _manifest is None:
+        manifest_path = os.path.join(settings.MODEL_ARTIFACT_DIR, MANIFEST_FILENAME)
+        try:
+            with open(manifest_path) as f:
+                _manifest = json.load(f)
+        except FileNotFoundError:
+            raise ModelArtifactError(f"Model artifact manifest not found: {manifest_path}")
+        except ValueError as e:
+            raise ModelArtifactError(f"Invalid model artifact manifest {manifest_path}: {e}")
+    return _manifest
+
+
+def sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def resolve_artifact(name: str) -> dict:
+    """ Returns the manifest entry for `name` with an absolute `path`, after verifying its checksum. """
+    entry = get_manifest().get(name)
+    if not entry:
+        raise ModelArtifactError(f"No artifact pinned for model '{name}' in {settings.MODEL_ARTIFACT_DIR}")
+
+    path = os.path.join(settings.MODEL_ARTIFACT_DIR, entry["file"])
+    if not os.path.isfile(path):
+        raise ModelArtifactError(f"Artifact file for model '{name}' is missing: {path}")
+
+    # ✅ Hash each file once per process (keyed by size & mtime so a replaced file is re-checked)
+    stat = os.stat(path)
+    cache_key = (path, stat.st_size, stat.st_mtime)
+    if _verified.get(name) != cache_key:
+        expected = entry.get("sha256")
+        if not expected:
+            raise ModelArtifactError(f"Artifact for model '{name}' has no sha256 in the manifest")
+        actual = sha256_file(path)
+        if actual != expected.lower():
+            raise ModelArtifactError(f"Checksum mismatch for model '{name}': expected {expected}, got {actual}")
+        _verified[name] = cache_key
+
+    return {**entry, "path": path}
+
+
+def load_artifact(name: str):
+    """ Loads a pinned model from local disk (TorchScript or state_dict). Never touches the network. """
+    import torch
+
+    entry = resolve_artifact(name)
+    artifact_format = entry.get("format", "torchscript")
+
+    if artifact_format == "torchscript":
+        model = torch.jit.load(entry["path"], map_location="cpu")
+    elif artifact_format == "state_dict":
+        architecture = entry.get("architecture", name)
+        if architecture not in ARCHITECTURES:
+            raise ModelArtifactError(
+                f"Cannot rebuild architecture '{architecture}' for model '{name}'; pin it as TorchScript instead"
+            )
+        model = ARCHITECTURES[architecture]()
+        model.load_state_dict(torch.load(entry["path"], map_location="cpu", weights_only=True))
+    else:
+        raise ModelArtifactError(f"Unknown artifact format '{artifact_format}' for model '{name}'")
+
+    logger.info("Loaded model %s from pinned artifact %s", name, entry["path"])
+    return model
+
+
+def load_model(name: str, hub_loader):
+    """
+    Loads `name` from the artifact directory when it is pinned there.
+    Falls back to `hub_loader` only when offline mode is disabled.
+    """
+    if artifacts_enabled() and (settings.MODEL_OFFLINE or name in get_manifest()):
+        return load_artifact(name)
+
+    if settings.MODEL_OFFLINE:
+        raise ModelArtifactError(
+            f"Model '{name}' is not available offline; set MODEL_ARTIFACT_DIR and pin it in {MANIFEST_FILENAME}"
+        )
+    return hub_loader()
+
+
+def verify_artifacts(names) -> None:
+    """ Fails fast (at startup) when any of the given models is missing or corrupt in offline mode. """
+    if not settings.MODEL_OFFLINE:
+        return
+    if not artifacts_enabled():
+        raise ModelArtifactError("MODEL_OFFLINE is set but MODEL_ARTIFACT_DIR is empty")
+    for name in names:
+        resolve_artifact(name)
+
+
+def local_midas_transforms():
+    """
+    Offline equivalent of `torch.hub.load("intel-isl/MiDaS", "transforms")` for PIL input:
+    resizes the short side to the network size (keeping aspect, multiples of 32) and normalizes.
+    """
+    import torchvision.transforms as T
+    import torchvision.transforms.functional as F
+
+    def _build(net_size, mean, std):
+        def _resize(image):
+            width, height = image.size
+            scale = net_size / min(width, height)
+            new_w = max(32, int(round(width * scale / 32)) * 32)
+            new_h = max(32, int(round(height * scale / 32)) * 32)
+            return F.resize(image, [new_h, new_w], interpolation=T.InterpolationMode.BICUBIC)
+
+        return T.Compose([T.Lambda(_resize), T.ToTensor(), T.Normalize(mean=mean, std=std)])
+
+    return SimpleNamespace(
+        dpt_transform=_build(384, [0.5, 0.5, 0.5], [0.5, 0.5, 0.5]),
+        small_transform=_build(256, [0.485, 0.456, 0.406], [0.229, 0.224, 0.225]),
+    )
@@ -0,0 +1,166 @@
+# backend/app/ai/model_registry.py
+
+import logging
+import os
+import resource
+import threading
+import time
+
+from app.ai.model_artifacts import load_model, local_midas_transforms
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# ✅ Registered loaders (name -> zero-argument callable) and loaded instances
+_loaders = {}
+_models = {}
+_stats = {}
+_locks = {}
+_registry_lock = threading.Lock()
+
+
+def _current_rss_bytes() -> int:
+    """ Returns the current resident set size of this process in bytes. """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # ru_maxrss is in kilobytes on Linux (peak, not current, but better than nothing)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _parameter_bytes(model) -> int:
+    """ Returns the memory held by a torch module's parameters and buffers (0 for non-modules). """
+    total = 0
+    for attr in ("parameters", "buffers"):
+        tensors = getattr(model, attr, None)
+        if not callable(tensors):
+            continue
+        for tensor in tensors():
+            total += tensor.numel() * tensor.element_size()
+    return total
+
+
+def register_model(name: str, loader):
+    """
+    Registers a loader for a model. Nothing is loaded until `get_model(name)` is called.
+    Registering the same name twice keeps the first loader so every module shares one instance.
+    """
+    with _registry_lock:
+        if name not in _loaders:
+            _loaders[name] = loader
+            _locks[name] = threading.Lock()
+            _stats[name] = {"status": "registered"}
+
+
+def get_model(name: str):
+    """ Returns the shared instance of a registered model, loading it on first use. """
+    model = _models.get(name)
+    if model is not None:
+        return model
+
+    if name not in _loaders:
+        raise KeyError(f"Model not registered: {name}")
+
+    with _locks[name]:
+        # ✅ Another thread may have finished loading while we waited for the lock
+        if name in _models:
+            return _models[name]
+
+        _stats[name] = {"status": "loading"}
+        rss_before = _current_rss_bytes()
+        started = time.perf_counter()
+        try:
+            model = _loaders[name]()
+        except Exception as e:
+            _stats[name] = {"status": "failed", "error": str(e)}
+            logger.error("Failed to load model %s: %s", name, e)
+            raise
+
+        if hasattr(model, "eval"):
+            model.eval()
+
+        _models[name] = model
+        _stats[name] = {
+            "status": "loaded",
+            "load_seconds": round(time.perf_counter() - started, 3),
+            "rss_delta_bytes": max(_current_rss_bytes() - rss_before, 0),
+            "parameter_bytes": _parameter_bytes(model),
+        }
+        logger.info("Loaded model %s in %.2fs", name, _stats[name]["load_seconds"])
+        return model
+
+
+def is_loaded(name: str) -> bool:
+    return name in _models
+
+
+def warm_models(names=None, background: bool = True):
+    """
+    Loads the given models (all registered models by default).
+    With `background=True` loading happens in a daemon thread so startup is not blocked.
+    """
+    names = list(names) if names is not None else list(_loaders)
+
+    def _warm():
+        for name in names:
+            try:
+                get_model(name)
+            except Exception:
+                # Already recorded in the stats; requests will retry on first use
+                pass
+
+    if not background:
+        _warm()
+        return None
+
+    thread = threading.Thread(target=_warm, name="model-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def get_model_stats() -> dict:
+    """ Returns load status, load time and memory usage for every registered model. """
+    return {
+        "process_rss_bytes": _current_rss_bytes(),
+        "models": {name: dict(stats) for name, stats in _stats.items()},
+    }
+
+
+# ✅ Models shared by the AI processing modules (torch is only imported when a model is first used)
+DEEPLABV3 = "deeplabv3_resnet101"
+ROOM_CLASSIFIER = "resnet18"
+MIDAS = "midas_dpt_large"
+MIDAS_TRANSFORMS = "midas_transforms"
+
+
+def _hub_load(repo: str, model: str, **kwargs):
+    def _load():
+        import torch
+        return torch.hub.load(repo, model, **kwargs)
+    return _load
+
+
+def _load_deeplabv3():
+    return load_model(DEEPLABV3, _hub_load("pytorch/vision:v0.10.0", "deeplabv3_resnet101", pretrained=True))
+
+
+def _load_room_classifier():
+    return load_model(ROOM_CLASSIFIER, _hub_load("pytorch/vision:v0.10.0", "resnet18", pretrained=True))
+
+
+def _load_midas():
+    return load_model(MIDAS, _hub_load("intel-isl/MiDaS", "DPT_Large"))
+
+
+def _load_midas_transforms():
+    # Transforms are code, not weights: build them locally when the hub must not be used
+    if settings.MODEL_OFFLINE:
+        return local_midas_transforms()
+    return _hub_load("intel-isl/MiDaS", "transforms")()
+
+
+register_model(DEEPLABV3, _load_deeplabv3)
+register_model(ROOM_CLASSIFIER, _load_room_classifier)
+register_model(MIDAS, _load_midas)
+register_model(MIDAS_TRANSFORMS, _load_midas_transforms)
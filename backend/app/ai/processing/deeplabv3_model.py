@@ -1,45 +1,141 @@
 # backend/app/ai/processing/deeplabv3_model.py
 
 import torch
-import torchvision.transforms as T
-from PIL import Image
 import cv2
 import numpy as np
 import os
 import uuid
+import hashlib
 from datetime import datetime
 from app.core.database import SessionLocal
 from app.models.ai.room_segmentation import RoomSegmentation
-from app.ai.processing.detect_room_type import detect_room_type
+from app.ai.processing.detect_room_type import ROOM_INPUT_SIZE, detect_room_type_from_tensor
+from app.ai.model_registry import DEEPLABV3, ROOM_CLASSIFIER, get_model
+from app.ai.model_artifacts import artifacts_enabled, get_manifest
+from app.ai.inference_batcher import MicroBatcher
+from app.core.settings import settings
+from app.core.metrics import image_io_timer, inference_timer
 
-# Load a pre-trained DeepLabV3+ model from Torch Hub
-model = torch.hub.load('pytorch/vision:v0.10.0', 'deeplabv3_resnet101', pretrained=True)
-model.eval()
+# ✅ Both networks use ImageNet normalization, so one normalized tensor feeds both
+IMAGENET_MEAN = torch.tensor([0.485, 0.456, 0.406]).view(3, 1, 1)
+IMAGENET_STD = torch.tensor([0.229, 0.224, 0.225]).view(3, 1, 1)
+SEGMENTATION_SHORT_SIDE = 520
 
-# Define the transformation pipeline
-transform = T.Compose([
-    T.Resize(520),
-    T.ToTensor(),
-    T.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225])
-])
 
-def segment_image(image_path: str, output_dir: str) -> dict:
+def load_rgb_image(image_path: str) -> np.ndarray:
+    """ Decodes an image file once into an RGB uint8 array. """
+    with image_io_timer("decode"):
+        image = cv2.imread(image_path, cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError(f"Could not load image: {image_path}")
+    return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+
+def _resize_rgb(rgb_image: np.ndarray, size) -> np.ndarray:
+    """ Resizes a uint8 RGB image to `size` = (height, width); area averaging when shrinking. """
+    h, w = rgb_image.shape[:2]
+    interpolation = cv2.INTER_AREA if size[0] < h and size[1] < w else cv2.INTER_LINEAR
+    return cv2.resize(rgb_image, (size[1], size[0]), interpolation=interpolation)
+
+
+def _normalize(rgb_image: np.ndarray) -> torch.Tensor:
+    """ uint8 (H, W, 3) -> ImageNet-normalized float (3, H, W). """
+    tensor = torch.from_numpy(np.ascontiguousarray(rgb_image)).permute(2, 0, 1).float().div_(255.0)
+    return tensor.sub_(IMAGENET_MEAN).div_(IMAGENET_STD)
+
+
+def prepare_inputs(rgb_image: np.ndarray):
+    """
+    Shared preprocessing for the decoded image: the DeepLabV3+ input (short side 520) and the
+    room classifier input (224x224). Both are resized from the uint8 image first and normalized
+    afterwards, so a large photo never becomes a full-resolution float tensor.
+    """
+    h, w = rgb_image.shape[:2]
+    scale = SEGMENTATION_SHORT_SIDE / min(h, w)
+    seg_size = (max(1, int(h * scale)), max(1, int(w * scale)))
+    seg_input = _normalize(_resize_rgb(rgb_image, seg_size))
+    room_input = _normalize(_resize_rgb(rgb_image, ROOM_INPUT_SIZE))
+    return seg_input, room_input
+
+
+def segmentation_model_version() -> str:
+    """
+    Identifies the models behind a segmentation result (cache key component).
+    Pinned artifacts contribute their checksums, so swapping weights invalidates cached results.
+    """
+    version = settings.SEGMENTATION_MODEL_VERSION
+    if artifacts_enabled():
+        manifest = get_manifest()
+        checksums = [manifest[name]["sha256"][:12] for name in (DEEPLABV3, ROOM_CLASSIFIER) if name in manifest]
+        if checksums:
+            version = f"{version}@{'.'.join(checksums)}"
+    return version
+
+
+def hash_image_array(image: np.ndarray) -> str:
+    """
+    Content hash of the decoded pixels plus the model version.
+    Re-encoded or renamed copies of the same photo map to the same cached segmentation.
+    """
+    digest = hashlib.sha256()
+    digest.update(segmentation_model_version().encode())
+    digest.update(str(image.shape).encode())
+    digest.update(np.ascontiguousarray(image).data)
+    return digest.hexdigest()
+
+
+def load_and_hash_image(image_path: str):
+    """ Decodes the image once and returns `(rgb_image, image_hash)`. """
+    rgb_image = load_rgb_image(image_path)
+    return rgb_image, hash_image_array(rgb_image)
+
+
+def _segment_batch(input_tensors: list) -> list:
+    """
+    Runs one DeepLabV3+ forward pass for a batch of normalized (3, H, W) tensors.
+    Inputs of different sizes are zero-padded to a common size; each mask is cropped back.
     """
-    Runs DeepLabV3+ segmentation to detect wall and floor sections.
+    max_h = max(t.shape[1] for t in input_tensors)
+    max_w = max(t.shape[2] for t in input_tensors)
+    batch = torch.zeros((len(input_tensors), 3, max_h, max_w), dtype=input_tensors[0].dtype)
+    for i, t in enumerate(input_tensors):
+        batch[i, :, :t.shape[1], :t.shape[2]] = t
+
+    model = get_model(DEEPLABV3)
+    with torch.no_grad():
+        predictions = model(batch)['out'].argmax(1).byte().cpu().numpy()
+
+    return [predictions[i, :t.shape[1], :t.shape[2]] for i, t in enumerate(input_tensors)]
+
+
+# ✅ Concurrent segmentation requests share forward passes
+segmentation_batcher = MicroBatcher(
+    "segmentation",
+    _segment_batch,
+    max_batch_size=settings.SEGMENTATION_MAX_BATCH_SIZE,
+    max_wait_ms=settings.SEGMENTATION_MAX_WAIT_MS,
+)
+
+
+def predict_segmentation(input_tensor) -> np.ndarray:
+    """ Returns the per-pixel class map for one normalized (3, H, W) tensor via the shared batcher. """
+    with inference_timer(DEEPLABV3):
+        return segmentation_batcher.infer(input_tensor)
+
+
+def segment_array(rgb_image: np.ndarray, output_dir: str) -> dict:
+    """
+    Runs room-type detection and DeepLabV3+ segmentation on an already decoded RGB image.
     If the detected room type is "Living Room", "Bedroom", or "Dining Room", wall detection is disabled.
     """
-    room_type = detect_room_type(image_path)
+    seg_input, room_input = prepare_inputs(rgb_image)
+    room_type = detect_room_type_from_tensor(room_input)
 
     # ✅ Disable Wall Detection for Living Room, Bedroom, and Dining Room
     disable_wall_detection = room_type in ["Living Room", "Bedroom", "Dining Room"]
 
-    # ✅ Run DeepLabV3+ segmentation
-    input_image = Image.open(image_path).convert("RGB")
-    input_tensor = transform(input_image).unsqueeze(0)
-
-    with torch.no_grad():
-        output = model(input_tensor)['out'][0]
-    output_predictions = output.argmax(0).byte().cpu().numpy()
+    # ✅ Run DeepLabV3+ segmentation (batched with concurrent requests)
+    output_predictions = predict_segmentation(seg_input)
 
     h, w = output_predictions.shape
     wall_mask = np.zeros((h, w), dtype=np.uint8) if disable_wall_detection else output_predictions
@@ -48,11 +144,18 @@ def segment_image(image_path: str, output_dir: str) -> dict:
     # ✅ Save Masked Images
     wall_mask_path = os.path.join(output_dir, f"wall_mask_{uuid.uuid4().hex}.png")
     floor_mask_path = os.path.join(output_dir, f"floor_mask_{uuid.uuid4().hex}.png")
-    cv2.imwrite(wall_mask_path, wall_mask)
-    cv2.imwrite(floor_mask_path, floor_mask)
+    with image_io_timer("encode"):
+        cv2.imwrite(wall_mask_path, wall_mask)
+        cv2.imwrite(floor_mask_path, floor_mask)
 
     return {"wall_mask": wall_mask_path, "floor_mask": floor_mask_path, "room_type": room_type}
 
+def segment_image(image_path: str, output_dir: str) -> dict:
+    """
+    Runs DeepLabV3+ segmentation to detect wall and floor sections (see `segment_array`).
+    """
+    return segment_array(load_rgb_image(image_path), output_dir)
+
 def save_segmentation_to_db(user_id: str, original_image_url: str, wall_mask_url: str, floor_mask_url: str):
     """
     Save the segmentation result into the database.
@@ -8,16 +8,19 @@ import numpy as np
 import os
 import uuid
 
-# Load MiDaS model from Torch Hub (choose the large or small model)
+from app.ai.model_registry import MIDAS, MIDAS_TRANSFORMS, get_model
+from app.core.metrics import inference_timer
+
+# MiDaS is loaded through the shared model registry on first use
 model_type = "DPT_Large"  # Change to "MiDaS_small" if desired
-midas = torch.hub.load("intel-isl/MiDaS", model_type)
-midas.eval()
-midas_transforms = torch.hub.load("intel-isl/MiDaS", "transforms")
 
-if model_type == "DPT_Large":
-    transform = midas_transforms.dpt_transform
-else:
-    transform = midas_transforms.small_transform
+
+def get_midas_transform():
+    """ Returns the MiDaS input transform matching `model_type`. """
+    midas_transforms = get_model(MIDAS_TRANSFORMS)
+    if model_type == "DPT_Large":
+        return midas_transforms.dpt_transform
+    return midas_transforms.small_transform
 
 def generate_depth_map(image_path: str, output_dir: str) -> str:
     """
@@ -25,9 +28,10 @@ def generate_depth_map(image_path: str, output_dir: str) -> str:
     Returns the file path of the depth map image.
     """
     input_image = Image.open(image_path).convert("RGB")
-    input_tensor = transform(input_image).unsqueeze(0)
+    input_tensor = get_midas_transform()(input_image).unsqueeze(0)
 
-    with torch.no_grad():
+    midas = get_model(MIDAS)
+    with torch.no_grad(), inference_timer(MIDAS):
         prediction = midas(input_tensor)
         prediction = torch.nn.functional.interpolate(
             prediction.unsqueeze(1),
@@ -2,14 +2,14 @@ import torch
 import torchvision.transforms as T
 from PIL import Image
 import os
+from app.ai.model_registry import ROOM_CLASSIFIER, get_model
+from app.core.metrics import inference_timer
 
-# ✅ Load Pre-Trained ResNet Model for Room Classification
-model = torch.hub.load("pytorch/vision:v0.10.0", "resnet18", pretrained=True)
-model.eval()
+ROOM_INPUT_SIZE = (224, 224)
 
 # ✅ Define Image Preprocessing
 transform = T.Compose([
-    T.Resize((224, 224)),
+    T.Resize(ROOM_INPUT_SIZE),
     T.ToTensor(),
     T.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225])
 ])
@@ -22,10 +22,16 @@ def detect_room_type(image_path: str) -> str:
     Predict the type of room based on the uploaded image.
     """
     input_image = Image.open(image_path).convert("RGB")
-    input_tensor = transform(input_image).unsqueeze(0)
+    return detect_room_type_from_tensor(transform(input_image))
 
-    with torch.no_grad():
-        output = model(input_tensor)
+def detect_room_type_from_tensor(input_tensor: torch.Tensor) -> str:
+    """
+    Predict the room type from an already normalized (3, 224, 224) tensor,
+    so callers that preprocess the image for segmentation don't decode it again.
+    """
+    model = get_model(ROOM_CLASSIFIER)
+    with torch.no_grad(), inference_timer(ROOM_CLASSIFIER):
+        output = model(input_tensor.unsqueeze(0))
         predicted_class = output.argmax(1).item()
 
     return ROOM_LABELS[predicted_class]
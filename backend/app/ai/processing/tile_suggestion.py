@@ -1,7 +1,11 @@
 # backend/app/ai/processing/tile_suggestion.py
 
+import threading
+import time
 import numpy as np
+from sqlalchemy import event
 from app.core.database import SessionLocal
+from app.core.settings import settings
 from app.models.tile_designs_model import TileDesign
 from app.models.attribute_models import TileColor
 import uuid
@@ -13,35 +17,97 @@ def hex_to_rgb(hex_code: str) -> np.ndarray:
     hex_code = hex_code.lstrip('#')
     return np.array([int(hex_code[i:i+2], 16) for i in (0, 2, 4)])
 
-def suggest_matching_tiles(selected_tile_design_id, top_n=5):
+
+class TileColorIndex:
+    """
+    In-memory matrix of every tile design's color, answering nearest-color queries
+    with one vectorized distance computation instead of a query per design.
+    The index is rebuilt lazily after a design or color changes in this process,
+    or after `TILE_SUGGESTION_INDEX_TTL_SECONDS` (to pick up writes from other workers).
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._dirty = True
+        self._loaded_at = 0.0
+        self._design_ids = np.empty(0, dtype=object)
+        self._colors = np.empty((0, 3), dtype=np.float32)
+        self._rows = {}
+
+    def invalidate(self, *args):
+        """ Marks the index stale; usable directly as a SQLAlchemy event listener. """
+        self._dirty = True
+
+    def _is_stale(self) -> bool:
+        return self._dirty or time.monotonic() - self._loaded_at > self.ttl_seconds
+
+    def _refresh(self, db):
+        # ✅ One round trip for every design's color
+        rows = db.query(TileDesign.id, TileColor.hex_code).join(TileColor, TileDesign.color_id == TileColor.id).all()
+
+        design_ids, colors = [], []
+        for design_id, hex_code in rows:
+            try:
+                colors.append(hex_to_rgb(hex_code))
+            except (TypeError, ValueError):
+                continue  # Skip malformed hex codes instead of failing every suggestion
+            design_ids.append(design_id)
+
+        self._design_ids = np.array(design_ids, dtype=object)
+        self._colors = np.array(colors, dtype=np.float32).reshape(-1, 3)
+        self._rows = {design_id: row for row, design_id in enumerate(design_ids)}
+        self._loaded_at = time.monotonic()
+
+    def snapshot(self, db):
+        """ Returns `(design_ids, colors, rows)`, rebuilding the index first when stale. """
+        if self._is_stale():
+            with self._lock:
+                if self._is_stale():
+                    self._dirty = False  # Cleared before loading so writes during the load mark it again
+                    self._refresh(db)
+        return self._design_ids, self._colors, self._rows
+
+    def nearest(self, db, design_id, top_n: int = 5):
+        """
+        Returns up to `top_n` `(tile_design_id, distance)` tuples closest in RGB to `design_id`,
+        sorted by distance (lower is better). Returns [] if the design has no indexed color.
+        """
+        design_ids, colors, rows = self.snapshot(db)
+        row = rows.get(design_id)
+        if row is None or top_n <= 0 or len(design_ids) < 2:
+            return []
+
+        distances = np.sqrt(((colors - colors[row]) ** 2).sum(axis=1))
+        distances[row] = np.inf  # Never suggest the selected design itself
+
+        k = min(top_n, len(design_ids) - 1)
+        candidates = np.argpartition(distances, k - 1)[:k]
+        candidates = candidates[np.argsort(distances[candidates])]
+        return [(design_ids[i], float(distances[i])) for i in candidates]
+
+
+tile_color_index = TileColorIndex(settings.TILE_SUGGESTION_INDEX_TTL_SECONDS)
+
+# ✅ Rebuild the index after any ORM change to designs or colors in this process
+for _model in (TileDesign, TileColor):
+    for _event in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event, tile_color_index.invalidate)
+
+
+def suggest_matching_tiles(selected_tile_design_id, top_n=5, db=None):
     """
     Suggest matching tiles based on color similarity.
     Returns a list of tuples (tile_design_id, match_score) where a lower score indicates a closer match.
     """
-    db = SessionLocal()
-    selected_tile = db.query(TileDesign).filter(TileDesign.id == selected_tile_design_id).first()
-    if not selected_tile:
-        db.close()
-        return []
+    if isinstance(selected_tile_design_id, str):
+        selected_tile_design_id = uuid.UUID(selected_tile_design_id)
 
-    selected_color = db.query(TileColor).filter(TileColor.id == selected_tile.color_id).first()
-    if not selected_color:
+    if db is not None:
+        return tile_color_index.nearest(db, selected_tile_design_id, top_n)
+
+    db = SessionLocal()
+    try:
+        return tile_color_index.nearest(db, selected_tile_design_id, top_n)
+    finally:
         db.close()
-        return []
-
-    selected_rgb = hex_to_rgb(selected_color.hex_code)
-    suggestions = []
-
-    # Fetch all other tile designs
-    other_tiles = db.query(TileDesign).filter(TileDesign.id != selected_tile_design_id).all()
-    for tile in other_tiles:
-        color = db.query(TileColor).filter(TileColor.id == tile.color_id).first()
-        if not color:
-            continue
-        rgb = hex_to_rgb(color.hex_code)
-        score = np.linalg.norm(selected_rgb - rgb)
-        suggestions.append((tile.id, score))
-    # Sort suggestions by match score (lower is better)
-    suggestions.sort(key=lambda x: x[1])
-    db.close()
-    return suggestions[:top_n]
@@ -0,0 +1,226 @@
+import asyncio
+import contextvars
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+from fastapi import HTTPException
+
+from app.core.settings import settings
+from app.utils.logger import setup_worker_logging
+
+
+class BoundedExecutor:
+    """
+    Runs blocking work in a pool and awaits the result without blocking the event loop.
+    At most `max_pending` jobs (running + queued) are accepted; beyond that callers get
+    HTTP 503 with a Retry-After header instead of piling up behind a long queue.
+    """
+
+    def __init__(self, name: str, pool_factory, max_pending: int):
+        self.name = name
+        self.max_pending = max(1, max_pending)
+        self._pool_factory = pool_factory
+        self._pool = None
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._waiters = deque()  # (loop, future) of `run_when_free` callers, first come first served
+
+    @property
+    def pool(self):
+        # ✅ Pools are created on first use so importing the app never forks or spawns workers
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = self._pool_factory()
+        return self._pool
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _acquire(self, count: int = 1):
+        with self._lock:
+            if self._pending + count > self.max_pending:
+                raise HTTPException(
+                    status_code=503,
+                    detail=f"Server is busy ({self.name} queue is full), please retry shortly",
+                    headers={"Retry-After": str(settings.BUSY_RETRY_AFTER_SECONDS)},
+                )
+            self._pending += count
+
+    def _release(self):
+        """ Frees a slot, or hands it straight to the longest-waiting `run_when_free` caller. """
+        with self._lock:
+            if not self._waiters:
+                self._pending -= 1
+                return
+            loop, future = self._waiters.popleft()  # ✅ The slot changes hands; `_pending` stays the same
+        try:
+            loop.call_soon_threadsafe(self._hand_over, future)  # ✅ Jobs finish on pool threads
+        except RuntimeError:
+            self._release()  # Waiter's loop is closed
+
+    def _hand_over(self, future):
+        if future.done():
+            self._release()  # ✅ The waiter was cancelled meanwhile; pass the slot on
+        else:
+            future.set_result(None)
+
+    async def _acquire_when_free(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._pending < self.max_pending:
+                self._pending += 1
+                return
+            future = loop.create_future()
+            self._waiters.append((loop, future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                try:
+                    self._waiters.remove((loop, future))
+                    queued = True
+                except ValueError:
+                    queued = False
+            if not queued and future.done() and not future.cancelled():
+                self._release()  # ✅ The slot arrived just as we were cancelled
+            raise
+
+    async def run(self, func, *args, **kwargs):
+        """ Runs `func(*args, **kwargs)` in the pool, raising 503 when the queue is full. """
+        self._acquire()
+        return await self._run_acquired(func, *args, **kwargs)
+
+    async def run_when_free(self, func, *args, **kwargs):
+        """
+        Like `run`, but waits for a free slot instead of raising 503 (for jobs that are already accepted).
+        Waiters are woken in arrival order as soon as a slot frees up.
+        """
+        await self._acquire_when_free()
+        return await self._run_acquired(func, *args, **kwargs)
+
+    async def run_all(self, calls):
+        """
+        Runs every `(func, *args)` of `calls` concurrently and returns their results in order.
+        All or nothing: the slots for every call are taken up front (or 503 is raised before any
+        starts), so a fan-out never has part of its jobs rejected while the rest keep running.
+        """
+        calls = list(calls)
+        self._acquire(len(calls))
+        loop = asyncio.get_running_loop()
+        futures = []
+        try:
+            for func, *args in calls:
+                future = loop.run_in_executor(self.pool, self._bind(func, *args))
+                future.add_done_callback(lambda _: self._release())
+                futures.append(future)
+        except BaseException:
+            for _ in range(len(calls) - len(futures)):
+                self._release()
+            raise
+        return await asyncio.gather(*futures)
+
+    def submit_nowait(self, func, *args, **kwargs):
+        """ Fire-and-forget submission for optional background work; returns None (skipped) when the queue is full. """
+        try:
+            self._acquire()
+        except HTTPException:
+            return None
+        try:
+            future = self.pool.submit(func, *args, **kwargs)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def _bind(self, func, *args, **kwargs):
+        call = partial(func, *args, **kwargs)
+        if isinstance(self.pool, ThreadPoolExecutor):
+            # ✅ Like `asyncio.to_thread`: request id and Server-Timing timings follow the job into the thread
+            call = partial(contextvars.copy_context().run, call)
+        return call
+
+    async def _run_acquired(self, func, *args, **kwargs):
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.pool, self._bind(func, *args, **kwargs))
+        finally:
+            self._release()
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# ✅ Torch and OpenCV release the GIL, so AI jobs run in threads and share the process-wide models
+ai_executor = BoundedExecutor(
+    "ai",
+    lambda: ThreadPoolExecutor(max_workers=settings.AI_THREAD_WORKERS, thread_name_prefix="ai-worker"),
+    settings.AI_MAX_PENDING,
+)
+
+# ✅ Pure-Python / GIL-bound work goes to separate processes (spawned, so no torch state is forked)
+cpu_executor = BoundedExecutor(
+    "cpu",
+    lambda: ProcessPoolExecutor(
+        max_workers=settings.CPU_PROCESS_WORKERS or os.cpu_count(),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=setup_worker_logging,  # ✅ Spawned workers don't run main.py; they log to stderr only
+    ),
+    settings.CPU_MAX_PENDING,
+)
+
+
+async def run_ai_job(func, *args, **kwargs):
+    """ Runs a blocking torch/OpenCV call in the AI thread pool. """
+    return await ai_executor.run(func, *args, **kwargs)
+
+
+async def run_ai_jobs(calls):
+    """ Runs several `(func, *args)` calls in the AI thread pool at once, all or nothing (see `BoundedExecutor.run_all`). """
+    return await ai_executor.run_all(calls)
+
+
+async def run_cpu_job(func, *args, **kwargs):
+    """ Runs a picklable, module-level function in the CPU process pool. """
+    return await cpu_executor.run(func, *args, **kwargs)
+
+
+async def iter_bounded(executor: BoundedExecutor, func, items, max_in_flight: int):
+    """
+    Runs `func(item)` for every item in `executor` and yields `(index, result)` as each one finishes.
+    At most `max_in_flight` items are submitted at once, which bounds memory for large batches.
+    """
+    items = list(items)
+    max_in_flight = max(1, max_in_flight)
+    pending = set()
+    next_index = 0
+
+    async def _run(index, item):
+        return index, await executor.run_when_free(func, item)
+
+    try:
+        while next_index < len(items) or pending:
+            while next_index < len(items) and len(pending) < max_in_flight:
+                pending.add(asyncio.ensure_future(_run(next_index, items[next_index])))
+                next_index += 1
+
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        # ✅ Consumer stopped early (client gone, job cancelled): drop what hasn't started
+        for task in pending:
+            task.cancel()
+
+
+def shutdown_executors():
+    ai_executor.shutdown()
+    cpu_executor.shutdown()
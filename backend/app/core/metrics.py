@@ -0,0 +1,156 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+DB_STATEMENT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200, 500)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Histogram:
+    """ Prometheus histogram (cumulative buckets, `_sum`, `_count`) keyed by label values; thread-safe. """
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._series = {}  # label values -> [bucket counts..., +Inf count], sum
+
+        REGISTRY.append(self)
+
+    def observe(self, value: float, *labelvalues):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: (list(counts), total) for labels, (counts, total) in self._series.items()}
+
+        for labelvalues, (counts, total) in sorted(series.items()):
+            labels = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, labelvalues)]
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                bucket_labels = ",".join(labels + [f'le="{le}"'])
+                lines.append(f"{self.name}_bucket{{{bucket_labels}}} {cumulative}")
+            suffix = f'{{{",".join(labels)}}}' if labels else ""
+            lines.append(f"{self.name}_sum{suffix} {total}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+REGISTRY = []
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route", "status")
+)
+REQUEST_DB_STATEMENTS = Histogram(
+    "http_request_db_statements", "SQL statements executed per HTTP request.", ("route",), COUNT_BUCKETS
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds", "Time spent in SQL per HTTP request.", ("route",)
+)
+DB_STATEMENT_SECONDS = Histogram(
+    "db_statement_duration_seconds", "Latency of individual SQL statements.", (), DB_STATEMENT_BUCKETS
+)
+INFERENCE_SECONDS = Histogram(
+    "model_inference_duration_seconds", "Model inference latency (including batching wait).", ("model",)
+)
+IMAGE_IO_SECONDS = Histogram(
+    "image_io_duration_seconds", "Image decode/encode and file I/O latency.", ("operation",)
+)
+
+
+def render_metrics() -> str:
+    """ Every metric of this process in the Prometheus text exposition format (0.0.4). """
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ✅ Per-request totals for Server-Timing: {"db": [count, seconds], "inference": [...], "image-io": [...]}
+_request_timings = ContextVar("request_timings", default=None)
+
+
+def start_request_timings() -> dict:
+    """ Starts collecting timings for the current request (sync endpoints share it through the copied context). """
+    timings = {}
+    _request_timings.set(timings)
+    return timings
+
+
+def _add_request_timing(name: str, seconds: float):
+    timings = _request_timings.get()
+    if timings is not None:
+        entry = timings.setdefault(name, [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+
+
+@contextmanager
+def inference_timer(model: str):
+    """ Times a model forward pass (histogram + the request's Server-Timing `inference` entry). """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        INFERENCE_SECONDS.observe(elapsed, model)
+        _add_request_timing("inference", elapsed)
+
+
+@contextmanager
+def image_io_timer(operation: str):
+    """ Times image decoding/encoding or file I/O (histogram + the request's Server-Timing `image-io` entry). """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        IMAGE_IO_SECONDS.observe(elapsed, operation)
+        _add_request_timing("image-io", elapsed)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("statement_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _stop_statement_timer(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("statement_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    DB_STATEMENT_SECONDS.observe(elapsed)
+    _add_request_timing("db", elapsed)
+
+
+@event.listens_for(Engine, "handle_error")
+def _discard_statement_timer(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("statement_started"):
+        conn.info["statement_started"].pop()
@@ -0,0 +1,50 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_current = ContextVar("query_stats", default=None)
+
+
+class QueryStats:
+    """ SQL statements executed while a `track_queries()` block was active. """
+
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is not None:
+        stats.statements.append(statement)
+
+
+@contextmanager
+def track_queries():
+    """
+    Counts the statements sent to any engine inside the block (this context only, so concurrent
+    requests don't mix). Sync endpoints run in a thread pool with a copy of the context,
+    so statements they execute are counted too.
+    """
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int):
+    """ Fails with the list of executed statements when the block runs more than `limit` of them. """
+    with track_queries() as stats:
+        yield stats
+    if stats.count > limit:
+        executed = "\n".join(f"  {i + 1}. {statement}" for i, statement in enumerate(stats.statements))
+        raise AssertionError(f"Expected at most {limit} SQL statements, got {stats.count}:\n{executed}")
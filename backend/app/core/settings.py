@@ -10,4 +10,74 @@ class Settings:
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 12  # 12 hours
 
+    # ✅ AI models warmed in the background after startup (comma separated registry names, empty to disable)
+    AI_WARM_MODELS: str = os.getenv("AI_WARM_MODELS", "deeplabv3_resnet101,resnet18")
+
+    # ✅ Pinned model weights on local disk (directory with manifest.json); offline mode never uses torch.hub
+    MODEL_ARTIFACT_DIR: str = os.getenv("MODEL_ARTIFACT_DIR", "")
+    MODEL_OFFLINE: bool = os.getenv("MODEL_OFFLINE", "false").lower() in ("1", "true", "yes")
+
+    # ✅ Segmentation micro-batching (requests arriving within the wait window share one forward pass)
+    SEGMENTATION_MAX_BATCH_SIZE: int = int(os.getenv("SEGMENTATION_MAX_BATCH_SIZE", "8"))
+    SEGMENTATION_MAX_WAIT_MS: int = int(os.getenv("SEGMENTATION_MAX_WAIT_MS", "25"))
+
+    # ✅ Bump when segmentation logic changes so cached results keyed by image hash are not reused
+    SEGMENTATION_MODEL_VERSION: str = os.getenv("SEGMENTATION_MODEL_VERSION", "deeplabv3_resnet101+resnet18/v2")
+
+    # ✅ Execution pools for blocking work (pending = running + queued; beyond it requests get HTTP 503)
+    AI_THREAD_WORKERS: int = int(os.getenv("AI_THREAD_WORKERS", "4"))
+    AI_MAX_PENDING: int = int(os.getenv("AI_MAX_PENDING", "16"))
+    CPU_PROCESS_WORKERS: int = int(os.getenv("CPU_PROCESS_WORKERS", "0"))  # 0 = one per CPU core
+    CPU_MAX_PENDING: int = int(os.getenv("CPU_MAX_PENDING", "64"))
+    BUSY_RETRY_AFTER_SECONDS: int = int(os.getenv("BUSY_RETRY_AFTER_SECONDS", "5"))
+
+    # ✅ Max age of the in-memory tile color index (local writes refresh it immediately)
+    TILE_SUGGESTION_INDEX_TTL_SECONDS: int = int(os.getenv("TILE_SUGGESTION_INDEX_TTL_SECONDS", "300"))
+
+    # ✅ Images are downsampled to this longest side before color extraction
+    COLOR_SAMPLE_MAX_SIDE: int = int(os.getenv("COLOR_SAMPLE_MAX_SIDE", "256"))
+
+    # ✅ Optional memory-mapped RGB -> color name table, built with `python -m app.utils.color_detection`; empty uses the ΔE2000 lookup
+    COLOR_NAME_LUT_PATH: str = os.getenv("COLOR_NAME_LUT_PATH", "")
+
+    # ✅ Upload size limits, enforced while the body is streamed to disk
+    MAX_IMAGE_UPLOAD_BYTES: int = int(os.getenv("MAX_IMAGE_UPLOAD_BYTES", str(25 * 1024 * 1024)))
+    MAX_PDF_UPLOAD_BYTES: int = int(os.getenv("MAX_PDF_UPLOAD_BYTES", str(300 * 1024 * 1024)))
+
+    # ✅ Bulk upload: images analyzed concurrently per request (bounds decoded images held in memory)
+    BULK_INGEST_MAX_IN_FLIGHT: int = int(os.getenv("BULK_INGEST_MAX_IN_FLIGHT", "8"))
+    BULK_PREVIEW_MAX_SIDE: int = int(os.getenv("BULK_PREVIEW_MAX_SIDE", "320"))
+
+    # ✅ PDF extraction jobs: concurrent jobs per worker, pages processed in parallel per job,
+    # and how long a "running" job may go without a heartbeat before another worker resumes it
+    PDF_MAX_CONCURRENT_JOBS: int = int(os.getenv("PDF_MAX_CONCURRENT_JOBS", "2"))
+    PDF_PAGES_IN_FLIGHT: int = int(os.getenv("PDF_PAGES_IN_FLIGHT", "4"))
+    PDF_JOB_STALE_SECONDS: int = int(os.getenv("PDF_JOB_STALE_SECONDS", "300"))
+
+    # ✅ When set (e.g. "/protected-tiles"), static files are handed to nginx via X-Accel-Redirect
+    STATIC_ACCEL_REDIRECT_PREFIX: str = os.getenv("STATIC_ACCEL_REDIRECT_PREFIX", "")
+
+    # ✅ Per-job progress store shared by all uvicorn workers on this host (SQLite, WAL mode)
+    PROGRESS_DB_PATH: str = os.getenv("PROGRESS_DB_PATH", "tiles_storage/progress.sqlite3")
+    PROGRESS_POLL_INTERVAL_MS: int = int(os.getenv("PROGRESS_POLL_INTERVAL_MS", "250"))
+    PROGRESS_TTL_SECONDS: int = int(os.getenv("PROGRESS_TTL_SECONDS", "86400"))
+
+    # ✅ Sidebar facet cache: max age (local writes clear it immediately) and entries kept; 0 disables it
+    FACET_CACHE_TTL_SECONDS: int = int(os.getenv("FACET_CACHE_TTL_SECONDS", "60"))
+    FACET_CACHE_SIZE: int = int(os.getenv("FACET_CACHE_SIZE", "512"))
+
+    # ✅ Request metrics on `/metrics` (Prometheus text format, per worker) and `Server-Timing` response headers
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+    SERVER_TIMING_ENABLED: bool = os.getenv("SERVER_TIMING_ENABLED", "true").lower() in ("1", "true", "yes")
+
+    # ✅ FastAPI debug mode (tracebacks in error responses); keep off in production
+    DEBUG: bool = os.getenv("DEBUG", "false").lower() in ("1", "true", "yes")
+
+    # ✅ Logging: JSON lines written by a background listener; per-module levels as `logger=LEVEL,...`
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_LEVELS: str = os.getenv("LOG_LEVELS", "sqlalchemy.engine=WARNING,sqlalchemy.pool=WARNING,multipart=WARNING")
+    LOG_FILE: str = os.getenv("LOG_FILE", "app.log")  # Empty = stderr only
+    LOG_DEBUG_SAMPLE_RATE: float = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "0.1"))  # Share of DEBUG records kept
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))  # Records beyond this are dropped, never blocking
+
 settings = Settings()
@@ -1,10 +1,17 @@
-import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 import uvicorn
 
 from app.core.database import engine, Base
+from app.core.settings import settings
+from app.ai.model_registry import warm_models
+from app.ai.model_artifacts import verify_artifacts
+from app.core.executor import shutdown_executors
+from app.utils.static_files import CachedStaticFiles
+from app.utils.metrics_middleware import MetricsMiddleware
+from app.utils.request_id_middleware import RequestIdMiddleware
+from app.utils.logger import setup_logging
+from app.services.pdf_job_service import start_job_sweeper, stop_extraction_jobs
 
 # ✅ Import Routes
 from app.routes import (
@@ -16,14 +23,16 @@ from app.routes import ai_routes  # ✅ Import AI Processing Routes
 from app.routes import paint_routes
 from app.routes import lighting_routes
 from app.routes import room_template_routes
+from app.routes import image_routes
+from app.routes import metrics_routes
 
 
-logging.basicConfig(level=logging.DEBUG)  # ✅ Enable detailed logs
+setup_logging()  # ✅ Queued JSON logging; levels come from LOG_LEVEL / LOG_LEVELS
 
-app = FastAPI(title="AI-Powered Tile Visualization API", version="1.0.0", debug=True)
+app = FastAPI(title="AI-Powered Tile Visualization API", version="1.0.0", debug=settings.DEBUG)
 
-# ✅ Serve images from the `tiles_storage` folder
-app.mount("/tiles_storage", StaticFiles(directory="tiles_storage"), name="tiles")
+# ✅ Serve images from the `tiles_storage` folder (content-hash ETags, immutable caching for content-addressed files)
+app.mount("/tiles_storage", CachedStaticFiles(directory="tiles_storage"), name="tiles")
 
 # ✅ Enable CORS (Allow frontend requests)
 app.add_middleware(
@@ -32,8 +41,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Job-Id", "X-Request-ID"],  # ✅ Readable by the browser (pagination / upload job / log correlation)
 )
 
+# ✅ Per-route latency / SQL metrics and Server-Timing headers (added last, so it wraps everything)
+app.add_middleware(MetricsMiddleware)
+
+# ✅ Request id for log correlation (outermost, so every other middleware logs with it)
+app.add_middleware(RequestIdMiddleware)
+
 # ✅ Register Routes
 app.include_router(auth_routes.router)
 app.include_router(user_routes.router)
@@ -51,7 +67,28 @@ app.include_router(ai_routes.router)  # 🚀 AI Processing Routes (Segmentation,
 app.include_router(paint_routes.router)  # ✅ Added Paint API
 app.include_router(lighting_routes.router)  # ✅ Added Lighting API
 app.include_router(room_template_routes.router)  # ✅ Added Room Template API
+app.include_router(image_routes.router)  # ✅ Thumbnails / responsive-image derivatives
+app.include_router(metrics_routes.router)  # ✅ Prometheus metrics
+
+
+# ✅ Load AI models in the background so the worker accepts requests immediately
+@app.on_event("startup")
+def warm_ai_models():
+    names = [name.strip() for name in settings.AI_WARM_MODELS.split(",") if name.strip()]
+    verify_artifacts(names)  # ✅ Fail fast in offline mode when a pinned artifact is missing or corrupt
+    if names:
+        warm_models(names)
+
+
+@app.on_event("startup")
+async def resume_extraction_jobs():
+    start_job_sweeper()  # ✅ Picks up PDF jobs interrupted by a restart or a crashed worker
+
 
+@app.on_event("shutdown")
+def stop_executors():
+    stop_extraction_jobs()
+    shutdown_executors()
 
 
 @app.get("/", tags=["Health Check"])
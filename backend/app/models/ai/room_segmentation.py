@@ -12,4 +12,7 @@ class RoomSegmentation(Base):
     original_image_url = Column(String(500), nullable=False)
     wall_mask_url = Column(String(500), nullable=False)
     floor_mask_url = Column(String(500), nullable=False)
+    room_type = Column(String(50), nullable=True)
+    image_hash = Column(String(64), nullable=True, index=True)  # SHA-256 of decoded pixels + model version
+    model_version = Column(String(100), nullable=True)
     created_at = Column(TIMESTAMP, default=datetime.utcnow)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, Text, Enum, TIMESTAMP
+from sqlalchemy import Column, String, ForeignKey, Text, Enum, TIMESTAMP, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -41,6 +41,12 @@ class TileCollection(Base):
     # ✅ Define the relationship using a STRING reference
     tiles = relationship("Tile", back_populates="collection", cascade="all, delete")
 
+    # ✅ Seller's live collections (every tile listing joins through this)
+    __table_args__ = (
+        Index("ix_tile_collections_live_seller_id", "seller_id", "id", postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_tile_collections_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
+
 # ✅ Import at the END to prevent circular dependency
 from app.models.tile_designs_model import TileDesign
 
@@ -72,3 +78,7 @@ class FavoriteCollection(Base):
     collection_id = Column(UUID(as_uuid=True), ForeignKey("tile_collections.id", ondelete="CASCADE"), nullable=False)
 
     created_at = Column(TIMESTAMP, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_favorite_collections_seller_collection", "seller_id", "collection_id"),
+    )
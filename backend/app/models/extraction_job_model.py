@@ -0,0 +1,35 @@
+from sqlalchemy import Column, String, Float, Integer, Text, JSON, ForeignKey, TIMESTAMP
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from datetime import datetime
+import uuid
+from app.core.database import Base
+
+class ExtractionJob(Base):
+    """ A PDF catalog extraction running in the background (one row per uploaded PDF). """
+    __tablename__ = "extraction_jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    collection_id = Column(UUID(as_uuid=True), ForeignKey("tile_collections.id", ondelete="SET NULL"), nullable=True)
+    status = Column(String(20), nullable=False, default="queued", index=True)  # queued / running / completed / failed / cancelled
+    original_filename = Column(String(255), nullable=True)
+    pdf_path = Column(String(500), nullable=False)
+    thickness = Column(Float, nullable=True)
+    total_pages = Column(Integer, nullable=True)
+    processed_pages = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    created_at = Column(TIMESTAMP, default=datetime.utcnow)
+    updated_at = Column(TIMESTAMP, default=datetime.utcnow)  # Heartbeat while running
+    finished_at = Column(TIMESTAMP, nullable=True)
+
+    # ✅ Extracted tiles so far (partial results), one row per page
+    pages = relationship("ExtractionJobPage", order_by="ExtractionJobPage.page", cascade="all, delete-orphan", passive_deletes=True)
+
+
+class ExtractionJobPage(Base):
+    """ Tiles extracted from one page of a job; the pages with a row are skipped when the job resumes. """
+    __tablename__ = "extraction_job_pages"
+
+    job_id = Column(UUID(as_uuid=True), ForeignKey("extraction_jobs.id", ondelete="CASCADE"), primary_key=True)
+    page = Column(Integer, primary_key=True)
+    tiles = Column(JSON, nullable=False, default=list)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, TIMESTAMP
+from sqlalchemy import Column, ForeignKey, TIMESTAMP, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -14,3 +14,8 @@ class FavoriteTile(Base):
     created_at = Column(TIMESTAMP, default=datetime.utcnow)
 
     tile = relationship("Tile", lazy="joined")
+
+    # ✅ "Is this tile a favorite of this seller" / favorites listing
+    __table_args__ = (
+        Index("ix_favorite_tiles_seller_tile", "seller_id", "tile_id"),
+    )
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, BigInteger, Integer, TIMESTAMP
+from datetime import datetime
+from app.core.database import Base
+
+class ImageBlob(Base):
+    """ One stored image file, addressed by the SHA-256 of its content. """
+    __tablename__ = "image_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    path = Column(String(500), unique=True, nullable=False)  # tiles_storage/blobs/ab/cd/<sha256><ext>
+    size = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)  # Live (not deleted) tiles using this image
+    created_at = Column(TIMESTAMP, default=datetime.utcnow)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, TIMESTAMP
+from sqlalchemy import Column, String, ForeignKey, TIMESTAMP, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -11,10 +11,17 @@ class TileDesign(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     tile_name = Column(String(255), nullable=False)
     tile_code = Column(String(20), nullable=True)
-    color_id = Column(UUID(as_uuid=True), ForeignKey("tile_colors.id", ondelete="SET NULL"), nullable=True)
-    image_url = Column(String(500), unique=True, nullable=False)
+    color_id = Column(UUID(as_uuid=True), ForeignKey("tile_colors.id", ondelete="SET NULL"), nullable=True, index=True)
+    image_url = Column(String(500), nullable=False, index=True)  # ✅ Designs with different names may share one stored image
     created_at = Column(TIMESTAMP, default=datetime.utcnow)
 
 # ✅ Add relationship to Tile (One-To-Many)
     tiles = relationship("Tile", back_populates="design")  # ✅ This fixes the error
     color = relationship("TileColor", backref="tile_designs")
+
+    # ✅ Unique tile codes (see tile_code_service); pg_trgm indexes for substring / fuzzy search (see search_service)
+    __table_args__ = (
+        Index("uq_tile_designs_tile_code", "tile_code", unique=True),
+        Index("ix_tile_designs_tile_name_trgm", "tile_name", postgresql_using="gin", postgresql_ops={"tile_name": "gin_trgm_ops"}),
+        Index("ix_tile_designs_tile_code_trgm", "tile_code", postgresql_using="gin", postgresql_ops={"tile_code": "gin_trgm_ops"}),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, Numeric, Integer, Text, Enum, TIMESTAMP
+from sqlalchemy import Column, String, ForeignKey, Numeric, Integer, Text, Enum, TIMESTAMP, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -17,15 +17,26 @@ class Tile(Base):
     batch_number = Column(String(50), nullable=True)
     thickness = Column(Numeric(5,2), nullable=True)
 
-    priority = Column(Integer, default=5, nullable=True)
-    usage_count = Column(Integer, default=0, nullable=True)
+    priority = Column(Integer, default=5, nullable=False)
+    usage_count = Column(Integer, default=0, nullable=False)
     last_used = Column(TIMESTAMP, default=None, nullable=True)
     description = Column(Text, nullable=True)
 
     status = Column(Enum("active", "inactive", name="tile_status"), default="active", nullable=False)
     deleted_at = Column(TIMESTAMP, default=None, nullable=True)
-    created_at = Column(TIMESTAMP, default=datetime.utcnow)
+    created_at = Column(TIMESTAMP, default=datetime.utcnow, nullable=False)
     updated_at = Column(TIMESTAMP, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     collection = relationship("TileCollection", back_populates="tiles")
     design = relationship("TileDesign", back_populates="tiles")
+
+    # ✅ Listing indexes: partial on live rows (`deleted_at IS NULL`), one `(…, sort column, id)` per sort option
+    __table_args__ = (
+        Index("ix_tiles_live_collection_created_at_id", "collection_id", "created_at", "id", postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_tiles_live_collection_usage_count_id", "collection_id", "usage_count", "id", postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_tiles_live_collection_priority_id", "collection_id", "priority", "id", postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_tiles_live_collection_status_created_at_id", "collection_id", "status", text("created_at DESC"), text("id DESC"), postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_tiles_live_created_at_id", "created_at", "id", postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_tiles_live_usage_count_id", "usage_count", "id", postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_tiles_live_priority_id", "priority", "id", postgresql_where=text("deleted_at IS NULL")),
+    )
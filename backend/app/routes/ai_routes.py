@@ -5,16 +5,19 @@ from sqlalchemy.orm import Session
 import uuid
 import os
 from app.core.database import get_db
+from app.core.executor import run_ai_job, run_ai_jobs
+from app.core.settings import settings
+from app.utils.file_storage import stream_upload_to_disk
 from app.schemas.ai_schemas import (
     ImageUploadSchema, SegmentedImageResponse, TileReplacementRequest, TileReplacementResponse,
     TileComparisonRequest, TileComparisonResponse, TileSuggestionRequest, TileSuggestionResponse
 )
-from app.services.ai_service import (
-    segment_image, replace_tiles, suggest_matching_tiles
-)
+from app.services.ai_service import find_cached_segmentation, replace_tiles, suggest_matching_tiles
+from app.ai.processing.deeplabv3_model import load_and_hash_image, segment_array, segmentation_model_version
 from app.models.ai.room_segmentation import RoomSegmentation
 from app.models.ai.processed_image import ProcessedImage
 from app.models.ai.tile_comparison import TileComparison
+from app.ai.model_registry import get_model_stats
 
 router = APIRouter(prefix="/ai", tags=["AI Processing"])
 
@@ -26,26 +29,36 @@ async def upload_and_segment_image(file: UploadFile = File(...), db: Session = D
     """
     Accepts an image, runs DeepLabV3+ segmentation, and stores wall & floor masks.
     Detects the room type before enabling wall segmentation.
+    Identical images (same decoded pixels) return the stored segmentation without re-running the models.
     """
-    file_ext = file.filename.split(".")[-1]
-    file_path = os.path.join(UPLOAD_DIR, f"{uuid.uuid4().hex}.{file_ext}")
-
-    with open(file_path, "wb") as f:
-        f.write(await file.read())
-
-    segmentation_result = segment_image(file_path, UPLOAD_DIR)
-
-    segmentation = RoomSegmentation(
-        id=uuid.uuid4(),
-        user_id=uuid.uuid4(),  # Replace with actual user ID
-        original_image_url=file_path,
-        wall_mask_url=segmentation_result["wall_mask"],
-        floor_mask_url=segmentation_result["floor_mask"],
-        room_type=segmentation_result["room_type"]
-    )
-    db.add(segmentation)
-    db.commit()
-    db.refresh(segmentation)
+    saved = await stream_upload_to_disk(file, UPLOAD_DIR, settings.MAX_IMAGE_UPLOAD_BYTES)
+    file_path = saved["path"]
+
+    # ✅ Decode once: the pixels are hashed for the cache and reused for segmentation
+    rgb_image, image_hash = await run_ai_job(load_and_hash_image, file_path)
+
+    # ✅ Return the cached result for repeat uploads of the same photo
+    segmentation = find_cached_segmentation(db, image_hash)
+    if segmentation:
+        if os.path.normpath(segmentation.original_image_url) != os.path.normpath(file_path):
+            os.remove(file_path)  # The cached segmentation already references an identical original
+    else:
+        # ✅ Wait off the event loop so concurrent uploads can share a segmentation batch
+        segmentation_result = await run_ai_job(segment_array, rgb_image, UPLOAD_DIR)
+
+        segmentation = RoomSegmentation(
+            id=uuid.uuid4(),
+            user_id=uuid.uuid4(),  # Replace with actual user ID
+            original_image_url=file_path,
+            wall_mask_url=segmentation_result["wall_mask"],
+            floor_mask_url=segmentation_result["floor_mask"],
+            room_type=segmentation_result["room_type"],
+            image_hash=image_hash,
+            model_version=segmentation_model_version()
+        )
+        db.add(segmentation)
+        db.commit()
+        db.refresh(segmentation)
 
     return {
         "segmentation_id": segmentation.id,
@@ -67,7 +80,9 @@ async def apply_tiles(request: TileReplacementRequest, db: Session = Depends(get
     if not segmentation:
         raise HTTPException(status_code=404, detail="Segmentation data not found")
 
-    processed_image_url = replace_tiles(request.segmentation_id, "wall_texture.png", "floor_texture.png", UPLOAD_DIR)
+    processed_image_url = await run_ai_job(
+        replace_tiles, request.segmentation_id, "wall_texture.png", "floor_texture.png", UPLOAD_DIR
+    )
 
     if not processed_image_url:
         raise HTTPException(status_code=500, detail="Tile replacement failed")
@@ -83,16 +98,18 @@ async def compare_tile_layouts(request: TileComparisonRequest, db: Session = Dep
     """
     Generates multiple tile layouts for comparison (up to 4 variations).
     """
+    if not 1 <= len(request.layout_options) <= 4:
+        raise HTTPException(status_code=400, detail="Provide between 1 and 4 layout options")
+
     segmentation = db.query(RoomSegmentation).filter(RoomSegmentation.id == request.segmentation_id).first()
     if not segmentation:
         raise HTTPException(status_code=404, detail="Segmentation data not found")
 
-    layout_images = []
-    for layout in request.layout_options:
-        processed_image_url = replace_tiles(
-            request.segmentation_id, "wall_texture.png", "floor_texture.png", UPLOAD_DIR
-        )
-        layout_images.append(processed_image_url)
+    # ✅ Render all layouts concurrently in the AI pool (every slot reserved up front, or 503 before any starts)
+    layout_images = await run_ai_jobs([
+        (replace_tiles, request.segmentation_id, "wall_texture.png", "floor_texture.png", UPLOAD_DIR)
+        for layout in request.layout_options
+    ])
 
     comparison = TileComparison(
         id=uuid.uuid4(),
@@ -127,3 +144,11 @@ async def get_tile_suggestions(request: TileSuggestionRequest, db: Session = Dep
         raise HTTPException(status_code=404, detail="No matching tiles found")
 
     return TileSuggestionResponse(recommended_tiles=suggestions)
+
+# ✅ 5️⃣ Model Load Status (load time & memory per model)
+@router.get("/models/status")
+def get_models_status():
+    """
+    Returns load status, load time and resident memory for each registered AI model.
+    """
+    return get_model_stats()
@@ -1,9 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from app.schemas.attribute_schemas import *
 from app.services.attribute_service import *
 from app.core.database import get_db
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 from app.services.attribute_service import get_sizes, get_series, get_materials, get_finishes, get_categories
 from app.schemas.attribute_schemas import AllAttributesResponse
@@ -11,9 +11,31 @@ from app.schemas.attribute_schemas import AllAttributesResponse
 router = APIRouter(prefix="/attributes", tags=["Attributes"])
 
 @router.get("/filters", response_model=dict)
-def get_sidebar_filters(seller_id: UUID, db: Session = Depends(get_db)):
-    """Fetch unique filtering options for the current seller's tiles, including colors with hex codes"""
-    return get_unique_sidebar_filters(db, seller_id)
+def get_sidebar_filters(
+    seller_id: UUID,
+    collection_id: Optional[List[str]] = Query(None),
+    category_id: Optional[List[str]] = Query(None),
+    series_id: Optional[List[str]] = Query(None),
+    finish_id: Optional[List[str]] = Query(None),
+    size_id: Optional[List[str]] = Query(None),
+    material_id: Optional[List[str]] = Query(None),
+    color_id: Optional[List[str]] = Query(None),
+    priority: Optional[int] = None,
+    status: Optional[str] = None,
+    favorite: Optional[bool] = None,
+    search: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Fetch unique filtering options for the current seller's tiles, including colors with hex codes.
+    Each value carries the number of tiles matching the same filters as `/tiles/all` (ignoring its own facet).
+    """
+    return get_unique_sidebar_filters(
+        db, seller_id,
+        collection_id=collection_id, category_id=category_id, series_id=series_id, finish_id=finish_id,
+        size_id=size_id, material_id=material_id, color_id=color_id,
+        priority=priority, status=status, favorite=favorite, search=search
+    )
 
 # ✅ GET: Fetch all attributes
 @router.get("/sizes", response_model=List[AttributeResponse])
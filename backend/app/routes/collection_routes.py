@@ -33,6 +33,11 @@ def fetch_collections_by_seller(seller_id: UUID, db: Session = Depends(get_db)):
 def duplicate_existing_collection(collection_id: UUID, db: Session = Depends(get_db)):
     return duplicate_collection(db, collection_id)
 
+# ✅ Search Collections (declared before `/{collection_id}` so "search" is not parsed as an ID)
+@router.get("/search", response_model=List[TileCollectionResponse])
+def search_collections_route(query: str, seller_id: Optional[UUID] = None, db: Session = Depends(get_db)):
+    return search_collections(db, query, seller_id)
+
 # ✅ Get Collection by ID
 @router.get("/{collection_id}", response_model=TileCollectionResponse)
 def retrieve_collection(collection_id: UUID, db: Session = Depends(get_db)):
@@ -61,11 +66,6 @@ def remove_collection(collection_id: UUID, db: Session = Depends(get_db)):
 def toggle_status(collection_id: UUID, db: Session = Depends(get_db)):
     return toggle_collection_status(db, collection_id)
 
-# ✅ Search Collections
-@router.get("/search", response_model=List[TileCollectionResponse])
-def search_collections_route(query: str, db: Session = Depends(get_db)):
-    return search_collections(db, query)
-
 # ✅ Filter Collections
 @router.get("/filter", response_model=List[TileCollectionResponse])
 def filter_collections_route(
@@ -0,0 +1,46 @@
+import os
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from app.core.executor import run_cpu_job
+from app.core.metrics import image_io_timer
+from app.utils.static_files import cached_file_response
+from app.utils.image_processing import (
+    BASE_STORAGE_PATH, THUMBNAIL_WIDTHS, avif_supported, derivative_path, generate_thumbnails, is_derivative_fresh
+)
+
+router = APIRouter(prefix="/images", tags=["Images"])
+
+STORAGE_ROOT = os.path.realpath(BASE_STORAGE_PATH)
+
+
+def _resolve_source(path: str) -> str:
+    """ Maps a URL path to a stored image, refusing anything outside `tiles_storage`. """
+    source = os.path.realpath(path)
+    if not source.startswith(STORAGE_ROOT + os.sep) or not os.path.isfile(source):
+        raise HTTPException(status_code=404, detail="Image not found")
+    return os.path.relpath(source)
+
+
+# ✅ Fixed-Width Thumbnails, generated on first request and cached on disk
+@router.get("/thumb/{width}/{path:path}")
+async def get_thumbnail(width: int, path: str, request: Request):
+    """
+    Serves the `width`-pixel derivative of a stored image (WebP, or AVIF when the client accepts it).
+    Example: `/images/thumb/320/tiles_storage/blobs/ab/cd/<sha>.jpg`
+    """
+    if width not in THUMBNAIL_WIDTHS:
+        raise HTTPException(status_code=400, detail=f"Width must be one of {list(THUMBNAIL_WIDTHS)}")
+
+    fmt = "avif" if "image/avif" in request.headers.get("accept", "") and avif_supported() else "webp"
+    source = _resolve_source(path)
+    thumbnail = derivative_path(source, width, fmt)
+
+    if not is_derivative_fresh(source, thumbnail):  # ✅ Missing, or older than a source that was overwritten
+        try:
+            with image_io_timer("thumbnail"):  # ✅ Timed here: the job itself runs in a worker process
+                await run_cpu_job(generate_thumbnails, source, (width,), (fmt,))
+        except ValueError:
+            raise HTTPException(status_code=415, detail="Image could not be decoded")
+
+    # ✅ The ETag of a file that is not content-addressed may need hashing: done off the event loop
+    return await run_in_threadpool(cached_file_response, request, thumbnail, media_type=f"image/{fmt}", headers={"Vary": "Accept"})
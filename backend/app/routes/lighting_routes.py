@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.core.executor import run_ai_job
 from app.schemas.lighting_schemas import LightingRequestSchema, LightingResponseSchema
 from app.ai.processing.apply_lighting import apply_lighting
 
@@ -11,7 +12,9 @@ async def adjust_lighting(request: LightingRequestSchema, db: Session = Depends(
     """
     Adjusts lighting for the tile preview based on the selected mode.
     """
-    lighting_image_url = apply_lighting(request.image_path, request.mode, request.brightness, request.contrast, "tiles_storage")
+    lighting_image_url = await run_ai_job(
+        apply_lighting, request.image_path, request.mode, request.brightness, request.contrast, "tiles_storage"
+    )
     if not lighting_image_url:
         raise HTTPException(status_code=500, detail="Lighting adjustment failed")
 
@@ -0,0 +1,14 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from app.core.metrics import render_metrics
+from app.core.settings import settings
+
+router = APIRouter(tags=["Metrics"])
+
+# ✅ Prometheus scrape endpoint (metrics of the worker that answers; scrape each worker or run one)
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
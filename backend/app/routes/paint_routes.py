@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.core.executor import run_ai_job
 from app.schemas.paint_schemas import PaintRequestSchema, PaintResponseSchema
 from app.ai.processing.apply_paint import apply_wall_paint
 
@@ -11,7 +12,7 @@ async def paint_wall(request: PaintRequestSchema, db: Session = Depends(get_db))
     """
     Apply selected wall paint color to the detected wall sections.
     """
-    painted_image_url = apply_wall_paint(request.segmentation_id, request.paint_color, "tiles_storage")
+    painted_image_url = await run_ai_job(apply_wall_paint, request.segmentation_id, request.paint_color, "tiles_storage")
     if not painted_image_url:
         raise HTTPException(status_code=500, detail="Wall painting failed")
 
@@ -1,18 +1,42 @@
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from typing import Optional
+from uuid import UUID
 import os
-from app.services.pdf_service import process_pdf
-from app.services.progress_service import reset_progress
+from app.services.pdf_job_service import (
+    create_extraction_job, get_extraction_job, cancel_extraction_job, serialize_job
+)
 from app.utils.file_storage import delete_temp_file
+from app.services.bulk_ingest_service import remove_preview
 from app.core.database import get_db
 
 router = APIRouter(prefix="/pdf", tags=["PDF Processing"])
 
 
-@router.post("/upload")
-async def upload_pdf(file: UploadFile = File(...), thickness: float = 0.0, db: Session = Depends(get_db)):
-    """ Upload PDF & Extract Tile Images with Real-Time Progress """
-    return await process_pdf(db, file, thickness)  # ✅ FIXED: Pass thickness correctly
+@router.post("/upload", status_code=202)
+async def upload_pdf(
+    file: UploadFile = File(...),
+    thickness: float = Form(0.0),
+    collection_id: Optional[UUID] = Form(None),
+    db: Session = Depends(get_db),
+):
+    """ Upload PDF & start tile extraction in the background; poll `/pdf/jobs/{job_id}` for progress and tiles """
+    job = await create_extraction_job(db, file, thickness, collection_id)
+    return await run_in_threadpool(serialize_job, job)
+
+
+@router.get("/jobs/{job_id}")
+def get_pdf_job(job_id: UUID, db: Session = Depends(get_db)):
+    """ Job status, page progress and the tiles extracted so far """
+    return serialize_job(get_extraction_job(db, job_id))
+
+
+@router.delete("/jobs/{job_id}")
+async def cancel_pdf_job(job_id: UUID, db: Session = Depends(get_db)):
+    """ Cancel a queued or running extraction (already extracted tiles are kept) """
+    job = await cancel_extraction_job(db, job_id)
+    return await run_in_threadpool(serialize_job, job)
 
 
 @router.delete("/temp-delete/{image_path}")
@@ -22,12 +46,12 @@ def delete_temp_image(image_path: str):
     file_path = os.path.join(temp_folder, image_path)
     
     if delete_temp_file(file_path):
+        remove_preview(file_path)
         return {"message": "Tile image deleted successfully."}
     else:
         raise HTTPException(status_code=404, detail="Tile image not found or could not be deleted.")
 
 @router.delete("/cancel-extraction")
 def cancel_extraction():
-    """ Cancel ongoing extraction process and clear progress """
-    reset_progress()
-    return {"message": "Extraction process canceled and progress reset."}
+    """ Replaced by `DELETE /pdf/jobs/{job_id}`: extractions are jobs now, and this call cannot tell which one to cancel """
+    raise HTTPException(status_code=410, detail="Cancel the extraction job with DELETE /pdf/jobs/{job_id}")
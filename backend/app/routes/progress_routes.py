@@ -1,9 +1,31 @@
-import asyncio
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from app.services.progress_service import get_progress as get_legacy_progress, read_progress, stream_progress
 
 router = APIRouter()
 
 @router.get("/progress")
 async def get_progress():
-    """ Returns a fixed 100% progress since WebSocket tracking is removed. """
-    return {"progress": 100}
+    """ Progress reported without a job ID (kept for older clients; use `/progress/{job_id}`). """
+    return {"progress": await get_legacy_progress()}
+
+
+@router.get("/progress/{job_id}")
+def get_job_progress(job_id: str):
+    """ Latest progress of one upload / extraction job (shared across all workers). """
+    entry = read_progress(job_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return entry
+
+
+@router.get("/progress/{job_id}/events")
+def stream_job_progress(job_id: str):
+    """ Server-Sent Events: one `progress` event per change until the job finishes. """
+    if read_progress(job_id) is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return StreamingResponse(
+        stream_progress(job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},  # ✅ Don't let nginx buffer events
+    )
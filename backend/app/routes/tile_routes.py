@@ -1,5 +1,5 @@
 import datetime
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, UploadFile, File
 from pydantic import UUID4
 from sqlalchemy.orm import Session
 from app.schemas.tile_schema import StoreExistingTilesRequest, TileCreate, TileDesignResponse, TileUpdate, TileResponse
@@ -11,6 +11,7 @@ from app.core.database import get_db
 from typing import Collection, List, Optional
 from uuid import UUID, uuid4
 from app.services.tile_service import store_final_tiles
+from app.services.search_service import search_tiles
 from app.schemas.tile_schema import FinalTileSubmission
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
@@ -30,6 +31,7 @@ from uuid import UUID
 @router.get("/all", response_model=List[TileResponse])
 def get_all_tiles(
     seller_id: UUID,
+    response: Response,
     collection_id: Optional[List[str]] = Query(None),
     category_id: Optional[List[str]] = Query(None),
     series_id: Optional[List[str]] = Query(None),
@@ -45,14 +47,36 @@ def get_all_tiles(
     search: Optional[str] = None,
     page: int = 1,
     limit: int = 20,
+    cursor: Optional[str] = None,
+    last_id: Optional[UUID] = None,
     db: Session = Depends(get_db)
 ):
-    """Fetch all tiles for the current seller with filtering, sorting, and pagination"""
+    """
+    Fetch all tiles for the current seller with filtering, sorting, and pagination.
+    Pass the `X-Next-Cursor` response header back as `cursor` (or the last tile's id as `last_id`) for the next page.
+    """
     
-    return get_filtered_tiles(
+    tiles, next_cursor = get_filtered_tiles(
         db, seller_id, collection_id, category_id, series_id, finish_id, size_id,
-        material_id, color_id, priority, status, favorite, sort_by, order, search, page, limit
+        material_id, color_id, priority, status, favorite, sort_by, order, search, page, limit,
+        cursor, last_id
     )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return tiles
+
+
+# ✅ Search-as-you-type: ranked matches on tile name, code, collection and color
+@router.get("/search", response_model=List[TileResponse])
+def search_tiles_route(
+    query: str = Query(..., min_length=1, max_length=100),
+    seller_id: Optional[UUID] = None,
+    collection_id: Optional[UUID] = None,
+    status: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    return search_tiles(db, query, seller_id, collection_id, status, limit)
 
 
 # ✅ Fetch Tiles by Collection (For Collection View)
@@ -68,14 +92,19 @@ def list_tiles_by_collection(
     favorite: Optional[bool] = None,
     sort_by: Optional[str] = None,
     order: Optional[str] = "desc",
+    cursor: Optional[str] = None,
+    last_id: Optional[UUID] = None,
     db: Session = Depends(get_db)
 ):
     """
     Fetch tiles from a collection with infinite scrolling, filtering, and sorting.
     Filters: Status, Priority, Favorite.
-    Sorting: Price, Usage, Created Date, Priority.
+    Sorting: Usage, Created Date, Priority.
+    Pagination: pass the returned `next_cursor` as `cursor` (or the last tile's id as `last_id`).
     """
-    return get_tiles_by_collection(db, collection_id, seller_id, offset, limit, status, priority, favorite, sort_by, order)
+    return get_tiles_by_collection(
+        db, collection_id, seller_id, last_id, limit, status, priority, favorite, sort_by, order, cursor, offset
+    )
 
 # ✅ Fetc Existing Tile Designs (Filtered by Collection & Seller)
 @router.get("/designs", response_model=List[TileDesignResponse])
@@ -1,17 +1,34 @@
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
-from app.services.tile_service import process_multiple_tiles
+from typing import List, Optional
+from app.services.tile_service import process_multiple_tiles, stream_multiple_tiles
 from app.core.database import get_db
 from app.utils.file_storage import save_temp_files
+from app.services.progress_service import BULK_UPLOAD_KIND, create_progress_job
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/tiles", tags=["Tile Upload"])
 
 @router.post("/upload-multiple")
-async def upload_tiles(files: List[UploadFile] = File(...), db: Session = Depends(get_db)):
-    """ Upload multiple tile images, save them, detect colors, and return preview data with real-time updates. """
+async def upload_tiles(
+    files: List[UploadFile] = File(...),
+    stream: bool = False,
+    job_id: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Upload multiple tile images, save them, detect colors, and return preview data with real-time updates.
+    With `?stream=true` the previews are streamed as NDJSON (one line per file, in completion order).
+    Pass your own `?job_id=` to follow `/progress/{job_id}/events` while the upload is running.
+    """
     try:
+        job_id = await run_in_threadpool(create_progress_job, BULK_UPLOAD_KIND, job_id)  # ✅ SQLite write off the event loop
+
         saved_paths = await save_temp_files(files)  # ✅ Save files before processing
         if not saved_paths:
             raise HTTPException(status_code=400, detail="No valid files were saved!")
@@ -21,8 +38,17 @@ async def upload_tiles(files: List[UploadFile] = File(...), db: Session = Depend
             if not os.path.exists(path):
                 raise HTTPException(status_code=500, detail=f"File not found after saving: {path}")
 
-        return await process_multiple_tiles(db, saved_paths)
+        if stream:
+            return StreamingResponse(
+                stream_multiple_tiles(saved_paths, job_id),
+                media_type="application/x-ndjson",
+                headers={"X-Job-Id": job_id},
+            )
+
+        return await process_multiple_tiles(db, saved_paths, job_id)
 
+    except HTTPException:
+        raise
     except Exception as e:
-        print("Error in upload:", str(e))  # ✅ Debugging
+        logger.exception("Error in upload")
         return {"error": str(e)}
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, UUID4
 from datetime import datetime
+from typing import Dict, Optional
 
 class FavoriteTileCreate(BaseModel):
     seller_id: UUID4
@@ -10,6 +11,14 @@ class FavoriteTileResponse(BaseModel):
     seller_id: UUID4
     tile_id: UUID4
     created_at: datetime
+    collection_id: Optional[UUID4] = None
+    name: Optional[str] = None
+    tile_code: Optional[str] = None
+    image_url: Optional[str] = None
+    thumbnails: Dict[str, str] = {}  # ✅ Width -> thumbnail URL
+    color_name: Optional[str] = None
+    hex_code: Optional[str] = None
+    status: Optional[str] = None
 
     class Config:
         from_attributes = True
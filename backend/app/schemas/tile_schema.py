@@ -3,7 +3,7 @@ from datetime import datetime
 from typing import Optional
 from typing import List
 from pydantic import BaseModel, UUID4, Field
-from typing import Optional, List
+from typing import Dict, Optional, List
 
 from sqlalchemy import UUID
 
@@ -82,6 +82,7 @@ class TileDesignResponse(BaseModel):
     name: str
     color_name: str  # ✅ Fetch color name, NOT color_id
     image_url: str
+    thumbnails: Dict[str, str] = {}  # ✅ Width -> thumbnail URL
     thickness: Optional[str] = None  # ✅ Default thickness (Editable before saving)
 
 # ✅ Schema for Selecting Existing Tiles for Collection
@@ -120,6 +121,7 @@ class TileResponse(BaseModel):
     id: UUID4
     name: Optional[str] = None
     image_url: str
+    thumbnails: Dict[str, str] = {}  # ✅ Width -> thumbnail URL (WebP/AVIF)
     color_name: Optional[str] = None
     hex_code: Optional[str] = None
     price: Optional[float] = None
@@ -10,16 +10,13 @@ from PIL import Image
 from datetime import datetime
 from sqlalchemy.orm import Session
 from app.core.database import SessionLocal
+from app.core.metrics import image_io_timer
 from app.models.ai.room_segmentation import RoomSegmentation
 from app.models.ai.processed_image import ProcessedImage
 from app.models.ai.tile_comparison import TileComparison
-from app.models.tile_designs_model import TileDesign
-from app.models.attribute_models import TileColor
 from app.schemas.ai_schemas import TileSuggestionRequest
-
-# Load DeepLabV3+ Model
-model = torch.hub.load('pytorch/vision:v0.10.0', 'deeplabv3_resnet101', pretrained=True)
-model.eval()
+from app.ai.processing.tile_suggestion import tile_color_index
+from app.ai.processing.deeplabv3_model import predict_segmentation, segmentation_model_version
 
 # Define image transformation pipeline
 transform = T.Compose([
@@ -35,11 +32,7 @@ def segment_image(image_path: str, output_dir: str) -> dict:
     Returns file paths of wall and floor masks.
     """
     input_image = Image.open(image_path).convert("RGB")
-    input_tensor = transform(input_image).unsqueeze(0)
-
-    with torch.no_grad():
-        output = model(input_tensor)['out'][0]
-    output_predictions = output.argmax(0).byte().cpu().numpy()
+    output_predictions = predict_segmentation(transform(input_image))
 
     # Simulate segmentation by splitting the image horizontally
     h, w = output_predictions.shape
@@ -55,6 +48,23 @@ def segment_image(image_path: str, output_dir: str) -> dict:
 
     return {"wall_mask": wall_mask_path, "floor_mask": floor_mask_path}
 
+# ✅ Segmentation Cache Lookup
+def find_cached_segmentation(db: Session, image_hash: str):
+    """
+    Returns the latest segmentation of an identical image (same pixels & model version)
+    whose mask files still exist, or None.
+    """
+    cached = db.query(RoomSegmentation).filter(
+        RoomSegmentation.image_hash == image_hash,
+        RoomSegmentation.model_version == segmentation_model_version()
+    ).order_by(RoomSegmentation.created_at.desc()).first()
+
+    if not cached or not all(os.path.exists(path) for path in (
+        cached.original_image_url, cached.wall_mask_url, cached.floor_mask_url
+    )):
+        return None
+    return cached
+
 # ✅ Tile Replacement
 def replace_tiles(segmentation_id: str, wall_tile_texture: str, floor_tile_texture: str, output_dir: str) -> str:
     """
@@ -66,11 +76,12 @@ def replace_tiles(segmentation_id: str, wall_tile_texture: str, floor_tile_textu
         db.close()
         return None
 
-    original = cv2.imread(segmentation.original_image_url)
-    wall_mask = cv2.imread(segmentation.wall_mask_url, cv2.IMREAD_GRAYSCALE)
-    floor_mask = cv2.imread(segmentation.floor_mask_url, cv2.IMREAD_GRAYSCALE)
-    wall_texture = cv2.imread(wall_tile_texture)
-    floor_texture = cv2.imread(floor_tile_texture)
+    with image_io_timer("decode"):
+        original = cv2.imread(segmentation.original_image_url)
+        wall_mask = cv2.imread(segmentation.wall_mask_url, cv2.IMREAD_GRAYSCALE)
+        floor_mask = cv2.imread(segmentation.floor_mask_url, cv2.IMREAD_GRAYSCALE)
+        wall_texture = cv2.imread(wall_tile_texture)
+        floor_texture = cv2.imread(floor_tile_texture)
 
     processed = original.copy()
     for mask, texture in [(wall_mask, wall_texture), (floor_mask, floor_texture)]:
@@ -81,7 +92,8 @@ def replace_tiles(segmentation_id: str, wall_tile_texture: str, floor_tile_textu
             processed[y:y+h, x:x+w] = tile_pattern
 
     processed_image_path = os.path.join(output_dir, f"processed_{uuid.uuid4().hex}.png")
-    cv2.imwrite(processed_image_path, processed)
+    with image_io_timer("encode"):
+        cv2.imwrite(processed_image_path, processed)
 
     # Save to DB
     processed_image = ProcessedImage(id=uuid.uuid4(), segmentation_id=segmentation_id,
@@ -94,27 +106,8 @@ def replace_tiles(segmentation_id: str, wall_tile_texture: str, floor_tile_textu
 # ✅ AI-Based Tile Suggestions
 def suggest_matching_tiles(request: TileSuggestionRequest, db: Session):
     """
-    Suggest matching tiles based on color similarity.
+    Suggest matching tiles based on color similarity (vectorized over the in-memory color index).
     """
-    selected_tile = db.query(TileDesign).filter(TileDesign.id == request.selected_tile_id).first()
-    if not selected_tile:
-        return []
-
-    selected_color = db.query(TileColor).filter(TileColor.id == selected_tile.color_id).first()
-    if not selected_color:
-        return []
-
-    selected_rgb = np.array([int(selected_color.hex_code[i:i+2], 16) for i in (0, 2, 4)])
-    suggestions = []
-    other_tiles = db.query(TileDesign).filter(TileDesign.id != request.selected_tile_id).all()
-
-    for tile in other_tiles:
-        color = db.query(TileColor).filter(TileColor.id == tile.color_id).first()
-        if not color:
-            continue
-        rgb = np.array([int(color.hex_code[i:i+2], 16) for i in (0, 2, 4)])
-        score = np.linalg.norm(selected_rgb - rgb)
-        suggestions.append({"tile_id": str(tile.id), "match_score": round(score, 2)})
-
-    suggestions.sort(key=lambda x: x["match_score"])
-    return suggestions[:request.top_n]
+    top_n = request.top_n if request.top_n is not None else 5  # ✅ `"top_n": null` means the default
+    matches = tile_color_index.nearest(db, request.selected_tile_id, top_n)
+    return [{"tile_id": str(design_id), "match_score": round(score, 2)} for design_id, score in matches]
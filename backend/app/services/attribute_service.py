@@ -5,34 +5,12 @@ from app.schemas.attribute_schemas import *
 from uuid import UUID
 from fastapi import HTTPException
 
-from app.models.collection_model import TileCollection
-from app.models.tile_designs_model import TileDesign
-from app.models.tiles_model import Tile
-
-
-def get_unique_sidebar_filters(db: Session, seller_id: UUID):
-    """Fetch unique filtering values for the seller's tiles, including colors with hex codes"""
-
-    # Fetch unique values from TileCollections related to the seller
-    collections = db.query(TileCollection.id, TileCollection.name).filter(TileCollection.seller_id == seller_id).distinct().all()
-    categories = db.query(TileCategory.id, TileCategory.name).join(TileCollection).filter(TileCollection.seller_id == seller_id).distinct().all()
-    series = db.query(TileSeries.id, TileSeries.name).join(TileCollection).filter(TileCollection.seller_id == seller_id).distinct().all()
-    finishes = db.query(TileFinish.id, TileFinish.name).join(TileCollection).filter(TileCollection.seller_id == seller_id).distinct().all()
-    sizes = db.query(TileSize.id, TileSize.name).join(TileCollection).filter(TileCollection.seller_id == seller_id).distinct().all()
-    materials = db.query(TileMaterial.id, TileMaterial.name).join(TileCollection).filter(TileCollection.seller_id == seller_id).distinct().all()
-
-    # Fetch unique colors with hex codes
-    colors = db.query(TileColor.id, TileColor.name, TileColor.hex_code).join(TileDesign).join(Tile).join(TileCollection).filter(TileCollection.seller_id == seller_id).distinct().all()
-
-    return {
-        "collections": [{"id": col.id, "name": col.name} for col in collections],
-        "categories": [{"id": cat.id, "name": cat.name} for cat in categories],
-        "series": [{"id": ser.id, "name": ser.name} for ser in series],
-        "finishes": [{"id": fin.id, "name": fin.name} for fin in finishes],
-        "sizes": [{"id": size.id, "name": size.name} for size in sizes],
-        "materials": [{"id": mat.id, "name": mat.name} for mat in materials],
-        "colors": [{"id": col.id, "name": col.name, "hex_code": col.hex_code} for col in colors]  # ✅ Includes hex codes
-    }
+from app.services.facet_service import get_sidebar_facets
+
+
+def get_unique_sidebar_filters(db: Session, seller_id: UUID, **filters):
+    """Fetch unique filtering values for the seller's tiles, including colors with hex codes and per-value counts"""
+    return get_sidebar_facets(db, seller_id, **filters)
 
 # ✅ Generic CRUD Functions for Reusability
 def create_item(db: Session, model, data, name_field="name"):
@@ -0,0 +1,65 @@
+import os
+
+import cv2
+
+from app.core.executor import cpu_executor, iter_bounded
+from app.core.settings import settings
+from app.utils.color_detection import extract_color_palette, extract_dominant_color, get_closest_color_name
+from app.utils.file_storage import delete_temp_file
+
+
+def preview_path_for(file_path: str) -> str:
+    """ Returns where the bulk-upload preview of `file_path` is written. """
+    base, _ = os.path.splitext(file_path)
+    return f"{base}_preview.webp"
+
+
+def analyze_tile_file(file_path: str) -> dict:
+    """
+    Decodes one uploaded tile image once, detects its color and palette and writes a small WebP preview.
+    Runs inside the CPU process pool, so it must stay a picklable module-level function.
+    Failures are returned as `{"error": ...}` so one bad file never aborts the whole batch.
+    The preview is removed together with its upload (`remove_preview`), or here if the analysis fails.
+    """
+    preview_path = None
+    try:
+        image = cv2.imread(file_path, cv2.IMREAD_COLOR)
+        if image is None:
+            raise ValueError(f"Could not decode image: {os.path.basename(file_path)}")
+
+        hex_color = extract_dominant_color(image)
+        palette = extract_color_palette(image)
+
+        # ✅ Preview is downsampled from the already decoded pixels
+        h, w = image.shape[:2]
+        max_side = settings.BULK_PREVIEW_MAX_SIDE
+        if max(h, w) > max_side:
+            scale = max_side / max(h, w)
+            image = cv2.resize(image, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+        preview_path = preview_path_for(file_path)
+        cv2.imwrite(preview_path, image, [cv2.IMWRITE_WEBP_QUALITY, 80])
+
+        return {
+            "temp_image_path": file_path,
+            "preview_image_path": preview_path,
+            "detected_color_name": get_closest_color_name(hex_color),
+            "detected_color_hex": hex_color,
+            "color_palette": palette,
+        }
+    except Exception as e:
+        if preview_path:
+            remove_preview(file_path)
+        return {"temp_image_path": file_path, "error": str(e)}
+
+
+def remove_preview(file_path: str):
+    """ Deletes the bulk-upload preview of `file_path` (once the upload is stored or discarded). """
+    delete_temp_file(preview_path_for(file_path))
+
+
+def iter_tile_analyses(file_paths: list, max_in_flight: int = None):
+    """
+    Analyzes files in the CPU process pool and yields `(index, result)` as each one finishes.
+    At most `max_in_flight` files are being decoded at once, which caps memory for large batches.
+    """
+    return iter_bounded(cpu_executor, analyze_tile_file, file_paths, max_in_flight or settings.BULK_INGEST_MAX_IN_FLIGHT)
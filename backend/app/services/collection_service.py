@@ -8,6 +8,7 @@ from sqlalchemy import asc, desc
 from fastapi import HTTPException
 from datetime import datetime
 from sqlalchemy.orm import joinedload
+from app.services import search_service
 from sqlalchemy.sql import exists
 from sqlalchemy import desc
 from app.models.collection_model import TileCollection, FavoriteCollection
@@ -17,6 +18,9 @@ from app.models.attribute_models import TileCategory, TileFinish, TileMaterial,
 from app.schemas.collection_schema import TileCollectionResponse, Attribute
 from uuid import UUID
 from sqlalchemy.orm import joinedload
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 # ✅ Create a new Collection
@@ -95,9 +99,9 @@ def get_collections_by_seller(db: Session, seller_id: UUID) -> List[dict]:
 
     return [{"id": col.id, "name": col.name, "status": col.status} for col in collections]
 
-def get_collections(db: Session, seller_id: UUID):
-    """ Fetch all collections for a seller, including suitable places """
-    collections_query = (
+def collection_projection(db: Session):
+    """ Columns of `TileCollectionResponse` (attribute names joined in), without loading ORM objects """
+    return (
         db.query(
             TileCollection.id,
             TileCollection.seller_id,
@@ -123,28 +127,27 @@ def get_collections(db: Session, seller_id: UUID):
         .join(TileMaterial, TileCollection.material_id == TileMaterial.id, isouter=True)
         .join(TileFinish, TileCollection.finish_id == TileFinish.id, isouter=True)
         .join(TileCategory, TileCollection.category_id == TileCategory.id, isouter=True)
-        .filter(
-            TileCollection.seller_id == seller_id,
-            TileCollection.deleted_at.is_(None)
-        )
-        .order_by(TileCollection.created_at.desc())
-        .all()
     )
 
-    # ✅ Fetch Suitable Places for Each Collection
+def suitable_places_by_collection(db: Session, collection_ids) -> dict:
+    """ `{collection_id: [{"id", "name"}]}` for the given collections, in one query """
     suitable_places_mapping = {}
+    if not collection_ids:
+        return suitable_places_mapping
     suitable_places_data = (
         db.query(CollectionSuitablePlace.collection_id, SuitablePlace.id, SuitablePlace.name)
         .join(SuitablePlace, CollectionSuitablePlace.place_id == SuitablePlace.id)
+        .filter(CollectionSuitablePlace.collection_id.in_(collection_ids))
         .all()
     )
     for collection_id, place_id, place_name in suitable_places_data:
-        if collection_id not in suitable_places_mapping:
-            suitable_places_mapping[collection_id] = []
-        suitable_places_mapping[collection_id].append({"id": place_id, "name": place_name})
+        suitable_places_mapping.setdefault(collection_id, []).append({"id": place_id, "name": place_name})
+    return suitable_places_mapping
 
-    # ✅ Convert Results to Pydantic Models
-    result = [
+def collection_rows_to_responses(db: Session, rows, is_favorite: bool = False) -> List[TileCollectionResponse]:
+    """ Builds responses from `collection_projection` rows (suitable places fetched in one extra query) """
+    suitable_places_mapping = suitable_places_by_collection(db, [row.id for row in rows])
+    return [
         TileCollectionResponse(
             id=row.id,
             seller_id=row.seller_id,
@@ -160,12 +163,23 @@ def get_collections(db: Session, seller_id: UUID):
             created_at=row.created_at,
             updated_at=row.updated_at,
             deleted_at=row.deleted_at,
-            is_favorite=False,
+            is_favorite=is_favorite,
         )
-        for row in collections_query
+        for row in rows
     ]
 
-    return result
+def get_collections(db: Session, seller_id: UUID):
+    """ Fetch all collections for a seller, including suitable places """
+    rows = (
+        collection_projection(db)
+        .filter(
+            TileCollection.seller_id == seller_id,
+            TileCollection.deleted_at.is_(None)
+        )
+        .order_by(TileCollection.created_at.desc())
+        .all()
+    )
+    return collection_rows_to_responses(db, rows)
 
 
 # ✅ Get Collection by ID (Include Related Attributes)
@@ -226,8 +240,7 @@ def update_collection(db: Session, collection_id: UUID, collection_data: TileCol
     if not collection:
         raise HTTPException(status_code=404, detail="Collection not found")
 
-    print(f"Received collection_id: {collection_id}")  # ✅ Debugging
-    print(f"Received suitable_places: {collection_data.suitable_places}")  # ✅ Debugging
+    logger.debug("Updating collection %s (suitable_places=%s)", collection_id, collection_data.suitable_places)
 
     # ✅ Update Basic Fields
     for key, value in collection_data.dict(exclude_unset=True).items():
@@ -315,9 +328,9 @@ def toggle_collection_status(db: Session, collection_id: UUID):
     db.commit()
     return {"message": f"Collection status updated to {collection.status}"}
 
-# ✅ Search Collections by Name
-def search_collections(db: Session, query: str):
-    return db.query(TileCollection).filter(TileCollection.name.ilike(f"%{query}%")).all()
+# ✅ Search Collections by Name (ranked, trigram-indexed on Postgres)
+def search_collections(db: Session, query: str, seller_id: UUID = None):
+    return search_service.search_collections(db, query, seller_id)
 
 # ✅ Filter Collections by Size, Material, Finish, Category
 def filter_collections(db: Session, size_id: UUID = None, material_id: UUID = None, finish_id: UUID = None, category_id: UUID = None):
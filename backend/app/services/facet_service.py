@@ -0,0 +1,195 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import String, and_, case, cast, event, exists, func, literal, null, select, union_all
+from sqlalchemy.orm import Session
+
+from app.core.settings import settings
+from app.models.attribute_models import TileCategory, TileColor, TileFinish, TileMaterial, TileSeries, TileSize
+from app.models.collection_model import TileCollection
+from app.models.favorite_tiles_model import FavoriteTile
+from app.models.tile_designs_model import TileDesign
+from app.models.tiles_model import Tile
+from app.services.search_service import normalize_term, tile_match_condition
+
+# ✅ (response key, model holding id/name, column of the facet base CTE)
+FACETS = (
+    ("collections", TileCollection, "collection_id"),
+    ("categories", TileCategory, "category_id"),
+    ("series", TileSeries, "series_id"),
+    ("finishes", TileFinish, "finish_id"),
+    ("sizes", TileSize, "size_id"),
+    ("materials", TileMaterial, "material_id"),
+    ("colors", TileColor, "color_id"),
+)
+
+
+class FacetCache:
+    """
+    Small LRU of computed facets keyed by seller + filters. Any ORM write to the models behind
+    the facets clears it in this process; entries also expire after `FACET_CACHE_TTL_SECONDS`
+    (to pick up writes from other workers).
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._entries = OrderedDict()  # key -> (generation, stored_at, facets)
+
+    def invalidate(self, *args):
+        """ Drops every entry; usable directly as a SQLAlchemy event listener. """
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, self._generation
+            generation, stored_at, facets = entry
+            if generation != self._generation or time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None, self._generation
+            self._entries.move_to_end(key)
+            return facets, self._generation
+
+    def put(self, key, generation, facets):
+        if self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return  # ✅ A write landed while this was computed; don't cache the stale result
+            self._entries[key] = (generation, time.monotonic(), facets)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+facet_cache = FacetCache(settings.FACET_CACHE_TTL_SECONDS, settings.FACET_CACHE_SIZE)
+
+for _model in (Tile, TileCollection, TileDesign, FavoriteTile) + tuple(model for _, model, _ in FACETS):
+    for _event in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event, facet_cache.invalidate)
+
+
+def _uuid_list(values) -> tuple:
+    if not values:
+        return ()
+    values = values if isinstance(values, (list, tuple)) else [values]
+    try:
+        return tuple(sorted({UUID(str(value)) for value in values}))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid filter id")
+
+
+def _facet_base(db: Session, seller_id: UUID, priority, status, favorite, search):
+    """
+    One row per (live collection, matching live tile); collections without matching tiles keep a row
+    with a NULL tile so their attributes are still listed (with a zero count).
+    """
+    tiles = select(Tile.id.label("tile_id"), Tile.collection_id, TileDesign.color_id) \
+        .select_from(Tile) \
+        .join(TileCollection, Tile.collection_id == TileCollection.id) \
+        .outerjoin(TileDesign, Tile.tile_design_id == TileDesign.id) \
+        .outerjoin(TileColor, TileDesign.color_id == TileColor.id) \
+        .where(TileCollection.seller_id == seller_id, Tile.deleted_at.is_(None))
+
+    if priority:
+        tiles = tiles.where(Tile.priority == priority)
+    if status:
+        tiles = tiles.where(Tile.status == status)
+    if favorite:
+        tiles = tiles.where(exists().where(FavoriteTile.tile_id == Tile.id, FavoriteTile.seller_id == seller_id))
+    if search:
+        tiles = tiles.where(tile_match_condition(db, search))
+    tiles = tiles.subquery("matching_tiles")
+
+    return select(
+        TileCollection.id.label("collection_id"),
+        TileCollection.category_id,
+        TileCollection.series_id,
+        TileCollection.finish_id,
+        TileCollection.size_id,
+        TileCollection.material_id,
+        tiles.c.color_id,
+        tiles.c.tile_id
+    ).select_from(TileCollection) \
+     .outerjoin(tiles, tiles.c.collection_id == TileCollection.id) \
+     .where(TileCollection.seller_id == seller_id, TileCollection.deleted_at.is_(None)) \
+     .cte("facet_base")
+
+
+def _facet_query(base, selected: dict):
+    """
+    Every facet in one statement (UNION ALL over the shared CTE). Each facet's counts apply all the
+    *other* selected facets, so values of a facet the user already picked from stay selectable.
+    """
+    arms = []
+    for name, model, column in FACETS:
+        others = [base.c[other_column].in_(selected[other]) for other, _, other_column in FACETS
+                  if other != name and selected[other]]
+        counted = case((and_(*others), base.c.tile_id)) if others else base.c.tile_id
+        hex_code = model.hex_code if model is TileColor else cast(null(), String)
+
+        arms.append(
+            select(
+                literal(name).label("facet"),
+                model.id,
+                model.name,
+                hex_code.label("hex_code"),
+                func.count(counted).label("count")
+            ).select_from(base.join(model, model.id == base.c[column]))
+             .group_by(model.id, model.name, *([model.hex_code] if model is TileColor else []))
+        )
+    return union_all(*arms)
+
+
+def get_sidebar_facets(
+    db: Session,
+    seller_id: UUID,
+    collection_id=None,
+    category_id=None,
+    series_id=None,
+    finish_id=None,
+    size_id=None,
+    material_id=None,
+    color_id=None,
+    priority: Optional[int] = None,
+    status: Optional[str] = None,
+    favorite: Optional[bool] = None,
+    search: Optional[str] = None
+) -> dict:
+    """
+    Sidebar filter values for the seller with per-value tile counts that respect the applied filters,
+    computed in a single round trip (and cached until the next write).
+    """
+    selected = dict(zip(
+        [name for name, _, _ in FACETS],
+        map(_uuid_list, (collection_id, category_id, series_id, finish_id, size_id, material_id, color_id))
+    ))
+    search = normalize_term(search)
+    key = (seller_id, tuple(selected.items()), priority, status, bool(favorite), search)
+
+    facets, generation = facet_cache.get(key)
+    if facets is not None:
+        return facets
+
+    base = _facet_base(db, seller_id, priority, status, favorite, search)
+    rows = db.execute(_facet_query(base, selected)).all()
+
+    facets = {name: [] for name, _, _ in FACETS}
+    for row in sorted(rows, key=lambda row: (row.name or "").lower()):
+        value = {"id": row.id, "name": row.name, "count": row.count}
+        if row.facet == "colors":
+            value["hex_code"] = row.hex_code  # ✅ Includes hex codes
+        facets[row.facet].append(value)
+
+    facet_cache.put(key, generation, facets)
+    return facets
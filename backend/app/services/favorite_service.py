@@ -1,7 +1,9 @@
 from sqlalchemy.orm import Session, joinedload
 from app.models.collection_model import FavoriteCollection, TileCollection
+from sqlalchemy import exists
 from uuid import UUID
 from fastapi import HTTPException
+from app.services.collection_service import collection_projection, collection_rows_to_responses
 
 def favorite_collection(db: Session, seller_id: UUID, collection_id: UUID):
     """ Adds a collection to a seller's favorite list """
@@ -41,13 +43,22 @@ def unfavorite_collection(db: Session, seller_id: UUID, collection_id: UUID):
     return {"message": "Collection removed from favorites"}
 
 def get_favorites(db: Session, seller_id: UUID):
-    """ Fetches all favorite collections for a seller """
-
-    favorites = db.query(FavoriteCollection).options(joinedload(FavoriteCollection.collection)).filter(
-        FavoriteCollection.seller_id == seller_id
-    ).all()
-
-    return favorites  # ✅ Returns list directly
+    """ Fetches all favorite collections for a seller (two queries, however many favorites) """
+
+    rows = (
+        collection_projection(db)
+        .filter(
+            exists().where(
+                FavoriteCollection.collection_id == TileCollection.id,
+                FavoriteCollection.seller_id == seller_id
+            ),
+            TileCollection.deleted_at.is_(None)
+        )
+        .order_by(TileCollection.created_at.desc())
+        .all()
+    )
+
+    return collection_rows_to_responses(db, rows, is_favorite=True)  # ✅ Returns list directly
 
 def toggle_favorite_collection(db: Session, seller_id: UUID, collection_id: UUID):
     """ Toggles favorite status for a collection """
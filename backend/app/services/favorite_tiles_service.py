@@ -2,6 +2,9 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from app.models.favorite_tiles_model import FavoriteTile
 from app.models.tiles_model import Tile
+from app.models.tile_designs_model import TileDesign
+from app.models.attribute_models import TileColor
+from app.utils.image_processing import thumbnail_urls
 from app.schemas.favorite_tiles_schema import FavoriteTileCreate
 from fastapi import HTTPException
 from uuid import UUID
@@ -27,6 +30,27 @@ def toggle_favorite_tile(db: Session, seller_id: UUID, tile_id: UUID):
     return {"message": "Tile added to favorites", "status": "added"}
 
 def get_favorite_tiles(db: Session, seller_id: UUID):
-    """ Get all favorite tiles for a seller """
-    favorites = db.query(FavoriteTile).filter(FavoriteTile.seller_id == seller_id).all()
-    return favorites
+    """ Get all favorite tiles for a seller, with the tile fields the favorites page shows, in one query """
+    favorites = db.query(
+        FavoriteTile.id,
+        FavoriteTile.seller_id,
+        FavoriteTile.tile_id,
+        FavoriteTile.created_at,
+        Tile.collection_id,
+        Tile.status,
+        TileDesign.tile_name.label("name"),
+        TileDesign.tile_code,
+        TileDesign.image_url,
+        TileColor.name.label("color_name"),
+        TileColor.hex_code
+    ).join(Tile, FavoriteTile.tile_id == Tile.id) \
+     .join(TileDesign, Tile.tile_design_id == TileDesign.id, isouter=True) \
+     .join(TileColor, TileDesign.color_id == TileColor.id, isouter=True) \
+     .filter(FavoriteTile.seller_id == seller_id, Tile.deleted_at.is_(None)) \
+     .order_by(FavoriteTile.created_at.desc()) \
+     .all()
+
+    return [
+        {**favorite._mapping, "thumbnails": thumbnail_urls(favorite.image_url) if favorite.image_url else {}}
+        for favorite in favorites
+    ]
@@ -0,0 +1,286 @@
+import asyncio
+import logging
+import os
+from contextlib import aclosing
+from datetime import datetime, timedelta
+from functools import partial
+from uuid import UUID, uuid4
+
+from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.core.executor import cpu_executor, iter_bounded
+from app.core.settings import settings
+from app.models.extraction_job_model import ExtractionJob, ExtractionJobPage
+from app.services.pdf_service import TEMP_STORAGE_PATH, count_pdf_pages, extract_pdf_page
+from app.utils.file_storage import stream_upload_to_disk
+from app.services.progress_service import create_progress_job, read_progress, set_progress
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("queued", "running")
+
+_job_slots = None  # ✅ Created lazily so it binds to the running event loop
+_local_tasks = {}  # job_id -> asyncio.Task for jobs running in this process
+_sweeper = None
+
+
+def _slots() -> asyncio.Semaphore:
+    global _job_slots
+    if _job_slots is None:
+        _job_slots = asyncio.Semaphore(max(1, settings.PDF_MAX_CONCURRENT_JOBS))
+    return _job_slots
+
+
+def serialize_job(job: ExtractionJob) -> dict:
+    """ Job status with partial results, as returned by the API. """
+    progress = int(job.processed_pages / job.total_pages * 100) if job.total_pages else 0
+    return {
+        "job_id": str(job.id),
+        "status": job.status,
+        "original_filename": job.original_filename,
+        "total_pages": job.total_pages,
+        "processed_pages": job.processed_pages,
+        "progress": 100 if job.status == "completed" else progress,
+        "tiles": [tile for page in job.pages for tile in page.tiles],
+        "error": job.error,
+        "created_at": job.created_at,
+        "finished_at": job.finished_at,
+    }
+
+
+# ✅ Create a Job (returns immediately; extraction runs in the background)
+async def create_extraction_job(db: Session, file: UploadFile, thickness: float, collection_id: UUID = None) -> ExtractionJob:
+    """ Streams the uploaded PDF to disk, records a queued job and starts it. """
+    # ✅ Named after the job (not the content) so two jobs on the same catalog never share a file
+    job_id = uuid4()
+    saved = await stream_upload_to_disk(file, TEMP_STORAGE_PATH, settings.MAX_PDF_UPLOAD_BYTES, name=str(job_id))
+    pdf_path = saved["path"]
+
+    job = ExtractionJob(
+        id=job_id,
+        status="queued",
+        original_filename=file.filename,
+        pdf_path=pdf_path,
+        thickness=thickness,
+        collection_id=collection_id,
+        processed_pages=0,
+    )
+    await run_in_threadpool(_record_new_job, db, job)
+    start_job(job.id)
+    return job
+
+
+def _record_new_job(db: Session, job: ExtractionJob):
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    create_progress_job("pdf_extraction", job.id)
+
+
+def get_extraction_job(db: Session, job_id: UUID) -> ExtractionJob:
+    job = db.query(ExtractionJob).filter(ExtractionJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Extraction job not found")
+    return job
+
+
+async def cancel_extraction_job(db: Session, job_id: UUID) -> ExtractionJob:
+    """ Cancels a queued/running job; pages already extracted stay available as partial results. """
+    job = await run_in_threadpool(_mark_cancelled, db, job_id)
+    task = _local_tasks.get(job_id)
+    if task is not None:
+        task.cancel()
+    return job
+
+
+def _mark_cancelled(db: Session, job_id: UUID) -> ExtractionJob:
+    job = get_extraction_job(db, job_id)
+    if job.status not in ACTIVE_STATUSES:
+        raise HTTPException(status_code=409, detail=f"Job is already {job.status}")
+
+    # ✅ Conditional update: the worker running this job (in any process) stops at its next page
+    db.query(ExtractionJob).filter(
+        ExtractionJob.id == job_id, ExtractionJob.status.in_(ACTIVE_STATUSES)
+    ).update({"status": "cancelled", "finished_at": datetime.utcnow()}, synchronize_session=False)
+    db.commit()
+
+    _remove_pdf(job.pdf_path)
+    set_progress(job_id, job.processed_pages / job.total_pages * 100 if job.total_pages else 0, "cancelled")
+
+    db.refresh(job)
+    return job
+
+
+def start_job(job_id: UUID):
+    """ Schedules a job on this process's event loop (no-op if it is already running here). """
+    if job_id in _local_tasks:
+        return
+    task = asyncio.create_task(_run_job(job_id))
+    _local_tasks[job_id] = task
+    task.add_done_callback(lambda _: _local_tasks.pop(job_id, None))
+
+
+def _claim_job(db: Session, job_id: UUID) -> ExtractionJob:
+    """ Atomically takes a queued job, or a running one whose worker stopped sending heartbeats (None if not claimed). """
+    stale_before = datetime.utcnow() - timedelta(seconds=settings.PDF_JOB_STALE_SECONDS)
+    claimed = db.query(ExtractionJob).filter(
+        ExtractionJob.id == job_id,
+        or_(
+            ExtractionJob.status == "queued",
+            and_(ExtractionJob.status == "running", ExtractionJob.updated_at < stale_before),
+        ),
+    ).update({"status": "running", "updated_at": datetime.utcnow()}, synchronize_session=False)
+    db.commit()
+    if claimed != 1:
+        return None
+    return db.query(ExtractionJob).filter(ExtractionJob.id == job_id).first()
+
+
+def _set_total_pages(db: Session, job: ExtractionJob, total_pages: int) -> list:
+    """ Records the page count (first run only) and returns the pages already extracted. """
+    if job.total_pages is None:
+        job.total_pages = total_pages
+        db.commit()
+    return [page for (page,) in db.query(ExtractionJobPage.page).filter(ExtractionJobPage.job_id == job.id)]
+
+
+def _record_page(db: Session, job: ExtractionJob, page: int, tiles: list) -> bool:
+    """ Stores one page's tiles with a heartbeat in one commit; False when the job was stopped meanwhile. """
+    db.refresh(job)
+    if job.status != "running":
+        return False
+
+    db.add(ExtractionJobPage(job_id=job.id, page=page, tiles=tiles))  # ✅ One small row per page, nothing rewritten
+    job.processed_pages = ExtractionJob.processed_pages + 1
+    job.updated_at = datetime.utcnow()
+    db.commit()
+    set_progress(job.id, job.processed_pages / job.total_pages * 100)
+    return True
+
+
+def _finish_job(db: Session, job_id: UUID, status: str, error: str = None):
+    values = {"status": status, "finished_at": datetime.utcnow(), "updated_at": datetime.utcnow()}
+    if error is not None:
+        values["error"] = error
+    finished = db.query(ExtractionJob).filter(
+        ExtractionJob.id == job_id, ExtractionJob.status == "running"
+    ).update(values, synchronize_session=False)
+    db.commit()
+    if finished:
+        last = read_progress(job_id) or {}
+        set_progress(job_id, 100 if status == "completed" else last.get("progress", 0), status, error)
+
+
+async def _run_job(job_id: UUID):
+    # ✅ Every database and progress call runs in the threadpool; the loop only awaits
+    async with _slots():
+        db = SessionLocal()
+        try:
+            job = await run_in_threadpool(_claim_job, db, job_id)
+            if job is None:
+                return  # ✅ Cancelled, finished, or picked up by another worker
+            pdf_path, thickness = job.pdf_path, job.thickness  # ✅ Read once: commits expire the instance, and reloading it would block the loop
+
+            total_pages = job.total_pages
+            if total_pages is None:
+                total_pages = await cpu_executor.run_when_free(count_pdf_pages, pdf_path)
+            done_pages = set(await run_in_threadpool(_set_total_pages, db, job, total_pages))
+
+            # ✅ Resumed jobs skip the pages they already extracted
+            pages = [page for page in range(total_pages) if page not in done_pages]
+            logger.info("PDF extraction job %s started: %d of %d pages left", job_id, len(pages), total_pages)
+            extract = partial(extract_pdf_page, pdf_path, output_prefix=str(job_id), thickness=thickness)
+
+            async with aclosing(iter_bounded(cpu_executor, extract, pages, settings.PDF_PAGES_IN_FLIGHT)) as results:
+                async for index, tiles in results:
+                    if not await run_in_threadpool(_record_page, db, job, pages[index], tiles):
+                        _remove_pdf(pdf_path)
+                        logger.info("PDF extraction job %s stopped: %s", job_id, job.status)
+                        return  # ✅ Cancelled from another request or worker
+
+            await run_in_threadpool(_finish_job, db, job_id, "completed")
+            _remove_pdf(pdf_path)
+            logger.info("PDF extraction job %s completed: %d pages", job_id, total_pages)
+
+        except asyncio.CancelledError:
+            db.rollback()
+            raise
+        except Exception as e:
+            logger.exception("PDF extraction job %s failed", job_id)
+            await run_in_threadpool(_fail_job, db, job_id, str(e))
+        finally:
+            db.close()
+
+
+def _fail_job(db: Session, job_id: UUID, error: str):
+    db.rollback()
+    _finish_job(db, job_id, "failed", error)
+
+
+def _remove_pdf(pdf_path: str):
+    if pdf_path and os.path.exists(pdf_path):
+        os.remove(pdf_path)
+
+
+def resume_pending_jobs():
+    """ Starts every queued job and every running job whose worker went away (e.g. after a restart). """
+    stale_before = datetime.utcnow() - timedelta(seconds=settings.PDF_JOB_STALE_SECONDS)
+    db = SessionLocal()
+    try:
+        job_ids = [row.id for row in db.query(ExtractionJob.id).filter(
+            or_(
+                ExtractionJob.status == "queued",
+                and_(ExtractionJob.status == "running", ExtractionJob.updated_at < stale_before),
+            )
+        ).all()]
+    finally:
+        db.close()
+
+    if job_ids:
+        logger.info("Resuming %d PDF extraction jobs", len(job_ids))
+    for job_id in job_ids:
+        start_job(job_id)
+
+
+async def _sweep_jobs():
+    while True:
+        try:
+            resume_pending_jobs()
+        except Exception:
+            logger.exception("Error resuming extraction jobs")
+        await asyncio.sleep(settings.PDF_JOB_STALE_SECONDS)
+
+
+def start_job_sweeper():
+    """ Resumes interrupted jobs now and periodically picks up jobs orphaned by other workers. """
+    global _sweeper
+    if _sweeper is None:
+        _sweeper = asyncio.create_task(_sweep_jobs())
+
+
+def stop_extraction_jobs():
+    """ Hands jobs running in this process back to the queue so the next worker resumes them at once. """
+    global _sweeper
+    if _sweeper is not None:
+        _sweeper.cancel()
+        _sweeper = None
+
+    job_ids = list(_local_tasks)
+    for task in list(_local_tasks.values()):
+        task.cancel()
+    if not job_ids:
+        return
+
+    db = SessionLocal()
+    try:
+        db.query(ExtractionJob).filter(
+            ExtractionJob.id.in_(job_ids), ExtractionJob.status == "running"
+        ).update({"status": "queued"}, synchronize_session=False)
+        db.commit()
+        logger.info("Handed %d PDF extraction jobs back to the queue", len(job_ids))
+    finally:
+        db.close()
@@ -1,54 +1,67 @@
 import fitz
+import logging
 import os
-from app.utils.image_processing import enhance_tile_image, crop_tile_image
-from app.utils.color_detection import extract_dominant_color, get_closest_color_name
-from app.utils.image_filter import is_tile_image
+import cv2
+import numpy as np
+from app.utils.image_processing import enhance_tile_array, crop_tile_array, to_gray
+from app.utils.color_detection import extract_color_palette, extract_dominant_color, get_closest_color_names
+from app.utils.image_filter import is_tile_gray
 
-TEMP_STORAGE_PATH = "tiles_storage/temp/"
+logger = logging.getLogger(__name__)
 
-async def process_pdf(db, file, thickness: float):
-    """ Extracts images from PDF and processes them into tile images. """
+TEMP_STORAGE_PATH = "tiles_storage/temp/"
 
-    # ✅ Ensure the temp folder exists before saving the file
-    if not os.path.exists(TEMP_STORAGE_PATH):
-        os.makedirs(TEMP_STORAGE_PATH)
 
-    pdf_path = os.path.join(TEMP_STORAGE_PATH, file.filename)
+def count_pdf_pages(pdf_path: str) -> int:
+    """ Number of pages in a PDF (reads only the document structure). """
+    with fitz.open(pdf_path) as doc:
+        return doc.page_count
 
-    with open(pdf_path, "wb") as f:
-        f.write(file.file.read())
 
-    doc = fitz.open(pdf_path)
+def extract_pdf_page(pdf_path: str, page_number: int, output_prefix: str, thickness: float) -> list:
+    """
+    Extracts, filters, crops, sharpens and color-analyzes the tile images on one PDF page.
+    Runs in the CPU process pool (one page per call), so each call opens its own document.
+    Every embedded image is decoded once and only the final tile image is written to disk.
+    """
     extracted_tiles = []
 
-    for page in doc:
+    with fitz.open(pdf_path) as doc:
+        page = doc[page_number]
         for img_index, img in enumerate(page.get_images(full=True)):
             xref = img[0]
-            base_image = doc.extract_image(xref)
-            image_bytes = base_image["image"]
-            image_path = os.path.join(TEMP_STORAGE_PATH, f"page_{page.number}_img_{img_index}.png")
+            image_bytes = doc.extract_image(xref)["image"]
+            label = f"page {page_number} image {img_index}"
 
-            with open(image_path, "wb") as img_file:
-                img_file.write(image_bytes)
+            image = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+            if image is None:
+                logger.debug("Skipping %s: could not decode", label)
+                continue
 
             # ✅ Filter & Process Tile Images
-            if not is_tile_image(image_path):
-                os.remove(image_path)
+            gray = to_gray(image)
+            if not is_tile_gray(gray, label):
                 continue
 
-            cropped_img = crop_tile_image(image_path)
-            enhanced_img = enhance_tile_image(cropped_img)
+            enhanced = enhance_tile_array(crop_tile_array(image, gray))
+            image_path = os.path.join(TEMP_STORAGE_PATH, f"{output_prefix}_page_{page_number}_img_{img_index}.png")
+            cv2.imwrite(image_path, enhanced)
 
             # ✅ Detect Color
-            hex_color = extract_dominant_color(enhanced_img)
-            color_name = get_closest_color_name(hex_color)
+            hex_color = extract_dominant_color(enhanced)
 
             # ✅ Store Extracted Tile Data
             extracted_tiles.append({
-                "temp_image_path": enhanced_img,
-                "detected_color_name": color_name,
+                "temp_image_path": image_path,
                 "detected_color_hex": hex_color,
-                "thickness": thickness
+                "color_palette": extract_color_palette(enhanced),
+                "thickness": thickness,
+                "page": page_number,
             })
 
-    return {"tiles": extracted_tiles}
+    # ✅ Name every color on the page in one batched ΔE2000 lookup
+    names = get_closest_color_names([tile["detected_color_hex"] for tile in extracted_tiles])
+    for tile, name in zip(extracted_tiles, names):
+        tile["detected_color_name"] = name
+
+    return extracted_tiles
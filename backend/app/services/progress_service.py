@@ -1,18 +1,204 @@
 import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from uuid import uuid4
 
-progress_status = {}
+from fastapi.concurrency import run_in_threadpool
 
-def reset_progress():
-    """ Reset progress tracking """
-    global progress_status
-    progress_status = {}
-    print("Progress reset.")
+from app.core.settings import settings
 
-async def update_progress(progress: int):
-    """ Updates the progress for tile upload processing in real-time. """
-    progress_status["progress"] = progress
-    print(f"Progress updated: {progress}%")
+logger = logging.getLogger(__name__)
 
-async def get_progress():
+# ✅ Progress reported without a job ID (legacy `/progress` clients): mirrors the latest bulk upload
+LEGACY_JOB_ID = "global"
+BULK_UPLOAD_KIND = "bulk_upload"
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+HEARTBEAT_SECONDS = 15
+
+_local = threading.local()
+_schema_ready = False
+_schema_lock = threading.Lock()
+_last_written = {}  # job_id -> (progress, status, message), skips redundant writes; oldest first
+_LAST_WRITTEN_SIZE = 1024  # ✅ Jobs that never finish (worker crash) must not pin entries forever
+_waiters = {}  # job_id -> {(loop, asyncio.Event)}, wakes SSE streams in this process immediately
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS progress (
+    job_id TEXT PRIMARY KEY,
+    kind TEXT,
+    progress INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'queued',
+    message TEXT,
+    version INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL
+)
+"""
+
+
+def _connection() -> sqlite3.Connection:
+    """ One SQLite connection per thread; every uvicorn worker on the host shares the same file. """
+    global _schema_ready
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        directory = os.path.dirname(settings.PROGRESS_DB_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(settings.PROGRESS_DB_PATH, timeout=5, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")  # ✅ Readers never block the writer
+        conn.execute("PRAGMA synchronous=NORMAL")
+        _local.conn = conn
+
+    if not _schema_ready:
+        with _schema_lock:
+            if not _schema_ready:
+                conn.execute(_SCHEMA)
+                _schema_ready = True
+    return conn
+
+
+def _row_to_dict(row) -> dict:
+    return {
+        "job_id": row["job_id"],
+        "kind": row["kind"],
+        "progress": row["progress"],
+        "status": row["status"],
+        "message": row["message"],
+        "version": row["version"],
+        "updated_at": row["updated_at"],
+    }
+
+
+def create_progress_job(kind: str, job_id: str = None) -> str:
+    """ Registers a new job (at 0%) and returns its ID; also purges entries older than the TTL. """
+    job_id = str(job_id or uuid4())
+    now = time.time()
+    conn = _connection()
+    conn.execute("DELETE FROM progress WHERE updated_at < ?", (now - settings.PROGRESS_TTL_SECONDS,))
+    conn.execute(
+        "INSERT OR REPLACE INTO progress (job_id, kind, progress, status, version, updated_at) VALUES (?, ?, 0, 'queued', 1, ?)",
+        (job_id, kind, now),
+    )
+    _last_written.pop(job_id, None)
+    _notify(job_id)
+    return job_id
+
+
+def set_progress(job_id: str, progress: int, status: str = "running", message: str = None):
+    """ Records the latest progress of a job (synchronous; safe to call from worker threads). """
+    job_id = str(job_id)
+    progress = max(0, min(100, int(progress)))
+    state = (progress, status, message)
+    if _last_written.get(job_id) == state:
+        return  # ✅ Nothing changed; don't wake every subscriber for the same value
+
+    _connection().execute(
+        """
+        INSERT INTO progress (job_id, progress, status, message, version, updated_at) VALUES (?, ?, ?, ?, 1, ?)
+        ON CONFLICT(job_id) DO UPDATE SET
+            progress = excluded.progress, status = excluded.status, message = excluded.message,
+            version = progress.version + 1, updated_at = excluded.updated_at
+        """,
+        (job_id, progress, status, message, time.time()),
+    )
+    _last_written.pop(job_id, None)
+    if status not in TERMINAL_STATUSES:  # ✅ Finished jobs are forgotten
+        _last_written[job_id] = state
+        if len(_last_written) > _LAST_WRITTEN_SIZE:
+            _last_written.pop(next(iter(_last_written)), None)
+    _notify(job_id)
+
+
+def read_progress(job_id: str):
+    """ Latest progress entry for a job, or None when it is unknown (or expired). """
+    row = _connection().execute("SELECT * FROM progress WHERE job_id = ?", (str(job_id),)).fetchone()
+    return _row_to_dict(row) if row else None
+
+
+def _notify(job_id: str):
+    for loop, event in list(_waiters.get(job_id, ())):
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            pass  # Loop already closed
+
+
+async def stream_progress(job_id: str):
+    """
+    Server-Sent Events for one job: an event per change, a heartbeat comment every 15 s,
+    and the stream ends once the job completes, fails or is cancelled.
+    Updates written by this process are pushed immediately; updates from other
+    workers are picked up from SQLite within `PROGRESS_POLL_INTERVAL_MS`.
+    """
+    job_id = str(job_id)
+    waiter = (asyncio.get_running_loop(), asyncio.Event())
+    event = waiter[1]
+    _waiters.setdefault(job_id, set()).add(waiter)
+    interval = settings.PROGRESS_POLL_INTERVAL_MS / 1000
+    last_version = None
+    last_sent = time.monotonic()
+
+    try:
+        while True:
+            event.clear()
+            entry = await run_in_threadpool(read_progress, job_id)
+            if entry is None:
+                yield f"event: error\ndata: {json.dumps({'job_id': job_id, 'detail': 'Unknown job'})}\n\n"
+                return
+
+            if entry["version"] != last_version:
+                last_version = entry["version"]
+                last_sent = time.monotonic()
+                yield f"id: {entry['version']}\nevent: progress\ndata: {json.dumps(entry)}\n\n"
+                if entry["status"] in TERMINAL_STATUSES:
+                    return
+            elif time.monotonic() - last_sent >= HEARTBEAT_SECONDS:
+                last_sent = time.monotonic()
+                yield ": keep-alive\n\n"
+
+            try:
+                await asyncio.wait_for(event.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        subscribers = _waiters.get(job_id, set())
+        subscribers.discard(waiter)
+        if not subscribers:
+            _waiters.pop(job_id, None)
+
+
+def reset_progress(job_id: str = LEGACY_JOB_ID):
+    """ Reset progress tracking (for the legacy key: `/progress` reads 0 until the next bulk upload starts) """
+    job_id = str(job_id)
+    if job_id == LEGACY_JOB_ID:
+        create_progress_job("legacy_reset", LEGACY_JOB_ID)
+    else:
+        _connection().execute("DELETE FROM progress WHERE job_id = ?", (job_id,))
+        _last_written.pop(job_id, None)
+    logger.info("Progress reset for job %s", job_id)
+
+
+def read_legacy_progress() -> int:
+    """ Progress of the most recently updated bulk upload, unless `/progress` was reset after it. """
+    row = _connection().execute(
+        "SELECT progress FROM progress WHERE kind = ? OR job_id = ? ORDER BY updated_at DESC LIMIT 1",
+        (BULK_UPLOAD_KIND, LEGACY_JOB_ID),
+    ).fetchone()
+    return row["progress"] if row else 0
+
+
+async def update_progress(progress: int, job_id: str = LEGACY_JOB_ID, status: str = "running"):
+    """ Updates the progress for tile upload processing in real-time (the SQLite write runs off the event loop). """
+    await run_in_threadpool(set_progress, job_id, progress, "completed" if progress >= 100 and status == "running" else status)
+
+
+async def get_progress(job_id: str = LEGACY_JOB_ID):
     """ Returns the current progress. """
-    return progress_status.get("progress", 0)
+    if str(job_id) == LEGACY_JOB_ID:
+        return await run_in_threadpool(read_legacy_progress)
+    entry = await run_in_threadpool(read_progress, job_id)
+    return entry["progress"] if entry else 0
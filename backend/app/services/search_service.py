@@ -0,0 +1,160 @@
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import case, func, literal, or_, select, union
+from sqlalchemy.orm import Session
+
+from app.models.attribute_models import TileColor
+from app.models.collection_model import TileCollection
+from app.models.tile_designs_model import TileDesign
+from app.models.tiles_model import Tile
+from app.utils.image_processing import thumbnail_urls
+
+# ✅ Every column matched here has a `gin_trgm_ops` index on Postgres, so
+# `ILIKE '%term%'` and the fuzzy `<%` operator are index scans, not table scans.
+DESIGN_SEARCH_COLUMNS = (TileDesign.tile_name, TileDesign.tile_code)
+
+
+def normalize_term(term: Optional[str]) -> str:
+    return " ".join((term or "").split())
+
+
+def _like_escape(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _contains(column, term):
+    return column.ilike(f"%{_like_escape(term)}%", escape="\\")
+
+
+def _starts_with(column, term):
+    return column.ilike(f"{_like_escape(term)}%", escape="\\")
+
+
+def match_condition(db: Session, term: str, columns):
+    """
+    Substring match on any of `columns`, plus fuzzy (typo-tolerant) word matching on Postgres.
+    Keep `columns` to one table: an OR across joined tables can't use the per-table trigram indexes
+    (use `tile_match_condition` for tiles).
+    """
+    conditions = [_contains(column, term) for column in columns]
+    if _is_postgres(db):
+        # ✅ pg_trgm `<%`: word_similarity(term, column) >= pg_trgm.word_similarity_threshold
+        conditions += [literal(term).op("<%")(column) for column in columns]
+    return or_(*conditions)
+
+
+def matching_tile_ids(db: Session, term: str):
+    """
+    Ids of tiles whose design name/code, collection name or color name matches `term`.
+    Each table is matched on its own (one trigram bitmap scan each) and the results are joined
+    back to tiles through their foreign-key indexes, then combined with UNION.
+    """
+    matching_collections = select(TileCollection.id).where(match_condition(db, term, (TileCollection.name,)))
+    matching_colors = select(TileColor.id).where(match_condition(db, term, (TileColor.name,)))
+
+    # ✅ `correlate(None)`: the arms scan `tiles` themselves even inside a query over `tiles`
+    by_design = select(Tile.id).join(TileDesign, Tile.tile_design_id == TileDesign.id) \
+        .where(match_condition(db, term, DESIGN_SEARCH_COLUMNS)).correlate(None)
+    by_collection = select(Tile.id).where(Tile.collection_id.in_(matching_collections)).correlate(None)
+    by_color = select(Tile.id).join(TileDesign, Tile.tile_design_id == TileDesign.id) \
+        .where(TileDesign.color_id.in_(matching_colors)).correlate(None)
+    return union(by_design, by_collection, by_color)
+
+
+def tile_match_condition(db: Session, term: str):
+    """ Filter for any query over `Tile`: the tile matches `term` (see `matching_tile_ids`). """
+    return Tile.id.in_(matching_tile_ids(db, term))
+
+
+def rank_expression(db: Session, term: str, primary_columns, secondary_columns=()):
+    """
+    Higher is better: exact, then prefix matches on the primary columns come first; within those,
+    results are ordered by trigram similarity on Postgres.
+    """
+    exact = or_(*[func.lower(column) == term.lower() for column in primary_columns])
+    prefix = or_(*[_starts_with(column, term) for column in primary_columns])
+    bonus = case((exact, 2.0), (prefix, 1.0), else_=0.0)
+
+    if not _is_postgres(db):
+        return bonus  # ✅ SQLite & co: no trigram functions, match quality only
+
+    scores = [func.word_similarity(term, column) for column in primary_columns]
+    scores += [func.word_similarity(term, column) * 0.5 for column in secondary_columns]
+    return bonus + func.greatest(*scores)
+
+
+def search_tiles(
+    db: Session,
+    term: str,
+    seller_id: Optional[UUID] = None,
+    collection_id: Optional[UUID] = None,
+    status: Optional[str] = None,
+    limit: int = 20
+) -> list:
+    """ Ranked tile search on name, code, collection name and color name. """
+    term = normalize_term(term)
+    if not term:
+        return []
+
+    rank = rank_expression(
+        db, term,
+        primary_columns=(TileDesign.tile_name, TileDesign.tile_code),
+        secondary_columns=(TileCollection.name, TileColor.name)
+    ).label("rank")
+
+    query = db.query(
+        Tile.id,
+        TileDesign.tile_name.label("name"),
+        TileDesign.tile_code,
+        TileDesign.image_url,
+        TileColor.name.label("color_name"),
+        TileColor.hex_code,
+        Tile.price,
+        Tile.stock_quantity,
+        Tile.batch_number,
+        Tile.thickness,
+        Tile.usage_count,
+        Tile.priority,
+        Tile.status,
+        rank
+    ).join(TileDesign, Tile.tile_design_id == TileDesign.id) \
+     .join(TileCollection, Tile.collection_id == TileCollection.id) \
+     .join(TileColor, TileDesign.color_id == TileColor.id, isouter=True) \
+     .filter(
+        Tile.deleted_at.is_(None),
+        TileCollection.deleted_at.is_(None),
+        tile_match_condition(db, term)
+     )
+
+    if seller_id:
+        query = query.filter(TileCollection.seller_id == seller_id)
+    if collection_id:
+        query = query.filter(Tile.collection_id == collection_id)
+    if status:
+        query = query.filter(Tile.status == status)
+
+    rows = query.order_by(rank.desc(), Tile.usage_count.desc(), Tile.id).limit(limit).all()
+    return [{**row._mapping, "thumbnails": thumbnail_urls(row.image_url)} for row in rows]
+
+
+def search_collections(db: Session, term: str, seller_id: Optional[UUID] = None, limit: int = 50) -> list:
+    """ Ranked collection search on the collection name (live collections only). """
+    term = normalize_term(term)
+    if not term:
+        return []
+
+    columns = (TileCollection.name,)
+    query = db.query(TileCollection).filter(
+        TileCollection.deleted_at.is_(None),
+        match_condition(db, term, columns)
+    )
+    if seller_id:
+        query = query.filter(TileCollection.seller_id == seller_id)
+
+    rank = rank_expression(db, term, primary_columns=columns)
+    return query.order_by(rank.desc(), TileCollection.name).limit(limit).all()
@@ -0,0 +1,81 @@
+import random
+import string
+import threading
+
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+from app.models.tile_designs_model import TileDesign
+
+TILE_CODE_SEQUENCE = "tile_code_seq"
+# ✅ Each `nextval` reserves a block of this many codes (hi/lo). Never change it: ranges would overlap.
+TILE_CODE_BLOCK_SIZE = 1000
+# ✅ Sequence-based codes start at "10000000", so they are always 8 base36 characters
+TILE_CODE_OFFSET = 36 ** 7
+TILE_CODE_ALPHABET = string.digits + string.ascii_uppercase
+
+_pool_lock = threading.Lock()
+_pool = []  # Codes reserved by this process but not handed out yet (in ascending order)
+
+
+def encode_base36(value: int) -> str:
+    digits = []
+    while True:
+        value, remainder = divmod(value, 36)
+        digits.append(TILE_CODE_ALPHABET[remainder])
+        if not value:
+            return "".join(reversed(digits))
+
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _reserve_blocks(db: Session, count: int) -> list:
+    """ Reserves enough sequence blocks for `count` codes in one round trip. """
+    blocks = -(-count // TILE_CODE_BLOCK_SIZE)
+    block_numbers = db.execute(
+        text(f"SELECT nextval('{TILE_CODE_SEQUENCE}') FROM generate_series(1, :blocks)"),
+        {"blocks": blocks}
+    ).scalars().all()
+    return [
+        encode_base36(TILE_CODE_OFFSET + block * TILE_CODE_BLOCK_SIZE + offset)
+        for block in sorted(block_numbers) for offset in range(TILE_CODE_BLOCK_SIZE)
+    ]
+
+
+def _take_from_pool(db: Session, count: int) -> list:
+    with _pool_lock:
+        if len(_pool) < count:
+            _pool.extend(_reserve_blocks(db, count - len(_pool)))
+        codes = _pool[:count]
+        del _pool[:count]
+    return codes
+
+
+def _random_candidates(count: int) -> list:
+    return list({"".join(random.choices(TILE_CODE_ALPHABET, k=8)) for _ in range(count)})
+
+
+def _taken(db: Session, codes: list) -> set:
+    """ Codes already used by a design (e.g. entered by a seller), in a single query. """
+    if not codes:
+        return set()
+    return set(db.execute(select(TileDesign.tile_code).where(TileDesign.tile_code.in_(codes))).scalars())
+
+
+def reserve_tile_codes(db: Session, count: int) -> list:
+    """
+    Returns `count` unused tile codes with a constant number of round trips.
+    On Postgres, codes come from blocks of the `tile_code_seq` sequence (so concurrent workers never
+    get the same code) and are encoded to base36; other databases use random candidates.
+    Either way, candidates are checked against existing codes in one query, and the unique index
+    on `tile_designs.tile_code` is the final guard.
+    """
+    codes = []
+    while len(codes) < count:
+        needed = count - len(codes)
+        candidates = _take_from_pool(db, needed) if _is_postgres(db) else _random_candidates(needed * 2)
+        taken = _taken(db, candidates) | set(codes)
+        codes.extend([code for code in candidates if code not in taken][:needed])
+    return codes
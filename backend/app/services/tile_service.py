@@ -1,39 +1,51 @@
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import desc, asc, func
+from sqlalchemy import desc, asc, exists, func, or_
+from sqlalchemy.dialects.postgresql import insert
 from app.models.tiles_model import Tile
 from app.schemas.tile_schema import ExistingTileSelection, FinalTileSubmission, TileCreate, TileDesignResponse, TileUpdate
 from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
 from uuid import UUID
 from datetime import datetime, timedelta
-import random
-import string
+import json
+import logging
 from app.models.attribute_models import TileCategory, TileColor, TileFinish, TileMaterial, TileSeries, TileSize
 import cv2
 import numpy as np
 from app.utils.color_detection import extract_dominant_color, get_closest_color_name
 from app.models.tiles_model import Tile
 from app.models.attribute_models import TileColor
-from app.utils.file_storage import move_file_to_storage
+from app.utils.file_storage import (
+    BLOB_STORAGE, add_blob_references, blobs_for_paths, delete_unreferenced_blobs, ingest_blobs, release_blob_references,
+    uploaded_sha256
+)
+from app.utils.image_processing import generate_thumbnails, thumbnail_urls
+from app.utils.pagination import apply_keyset, decode_cursor, split_page
+from app.core.executor import cpu_executor
 from uuid import uuid4
 from datetime import datetime
 import os
-from app.services.progress_service import update_progress
+from app.services.progress_service import LEGACY_JOB_ID, set_progress, update_progress
+from app.services.bulk_ingest_service import iter_tile_analyses, remove_preview
+from app.services.search_service import normalize_term, tile_match_condition
+from app.services.facet_service import facet_cache
+from app.services.tile_code_service import reserve_tile_codes
+from app.ai.processing.tile_suggestion import tile_color_index
 from app.models.collection_model import TileCollection
 from app.models.favorite_tiles_model import FavoriteTile
 from sqlalchemy.orm import joinedload
 
 from app.models.tile_designs_model import TileDesign
 
+logger = logging.getLogger(__name__)
+
 
 # ✅ Generate Unique Tile Code
 def generate_tile_code(db: Session) -> str:
     """ Generates a unique tile code (auto-generated if not provided by seller) """
-    while True:
-        tile_code = ''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
-        if not db.query(Tile).filter(Tile.tile_code == tile_code).first():
-            return tile_code
+    return reserve_tile_codes(db, 1)[0]
 
 # ✅ Create a New Tile
 # ✅ Create Tile with AI Color Detection
@@ -67,14 +79,52 @@ def get_tiles_by_collection(
     priority: Optional[str] = None,
     favorite: Optional[bool] = None,
     sort_by: Optional[str] = None,
-    order: Optional[str] = "desc"
+    order: Optional[str] = "desc",
+    cursor: Optional[str] = None,
+    offset: int = 0
 ):
-    """ Fetch Tiles with Proper `tiles_design` and `tile_colors` Joining """
+    """ Fetch Tiles with Proper `tiles_design` and `tile_colors` Joining (two column projections, no ORM loads) """
+
+    # ✅ Fetch Collection Details (attribute names joined in)
+    collection = db.query(
+        TileCollection.id,
+        TileCollection.name,
+        TileSize.name.label("size"),
+        TileSeries.name.label("series"),
+        TileMaterial.name.label("material"),
+        TileFinish.name.label("finish"),
+        TileCategory.name.label("category")
+    ).join(TileSize, TileCollection.size_id == TileSize.id, isouter=True) \
+     .join(TileSeries, TileCollection.series_id == TileSeries.id, isouter=True) \
+     .join(TileMaterial, TileCollection.material_id == TileMaterial.id, isouter=True) \
+     .join(TileFinish, TileCollection.finish_id == TileFinish.id, isouter=True) \
+     .join(TileCategory, TileCollection.category_id == TileCategory.id, isouter=True) \
+     .filter(TileCollection.id == collection_id) \
+     .first()
+    if not collection:
+        raise HTTPException(status_code=404, detail="Collection not found")
 
-    query = db.query(Tile).options(
-        joinedload(Tile.design).joinedload(TileDesign.color),  # ✅ Fetch TileDesign & Color
-        joinedload(Tile.collection)  # ✅ Fetch Collection details
-    ).filter(Tile.collection_id == collection_id)
+    # ✅ Only the columns the response needs (design & color joined in)
+    query = db.query(
+        Tile.id,
+        Tile.tile_design_id,
+        TileDesign.tile_code,
+        TileDesign.tile_name,
+        TileDesign.image_url,
+        Tile.stock_quantity,
+        Tile.batch_number,
+        Tile.thickness,
+        Tile.usage_count,
+        Tile.priority,
+        Tile.status,
+        Tile.created_at,
+        TileColor.name.label("color_name")
+    ).join(TileDesign, Tile.tile_design_id == TileDesign.id, isouter=True) \
+     .join(TileColor, TileDesign.color_id == TileColor.id, isouter=True) \
+     .filter(
+        Tile.collection_id == collection_id,
+        Tile.deleted_at.is_(None)  # ✅ Live tiles only (matches the partial listing indexes)
+     )
 
     # ✅ Apply Filters
     if status:
@@ -87,59 +137,75 @@ def get_tiles_by_collection(
 
     # ✅ Filter by Favorite (If seller_id is provided)
     if favorite and seller_id:
-        query = query.join(FavoriteTile, Tile.id == FavoriteTile.tile_id) \
-                     .filter(FavoriteTile.seller_id == seller_id)
-
-    # ✅ Sorting Options
-    sort_options = {
-        "usage_count": Tile.usage_count,
-        "created_at": Tile.created_at,
-        "priority": Tile.priority
-    }
-    if sort_by in sort_options:
-        order_func = desc if order == "desc" else asc
-        query = query.order_by(order_func(sort_options[sort_by]))
-
-    # ✅ Infinite Scroll (Fetching tiles after last_id)
-    if last_id:
-        query = query.filter(Tile.id > last_id)
-
-    tiles = query.limit(limit).all()
-
-    # ✅ Fetch Collection Details
-    collection = db.query(TileCollection).filter(TileCollection.id == collection_id).first()
-    if not collection:
-        raise HTTPException(status_code=404, detail="Collection not found")
+        query = query.filter(exists().where(FavoriteTile.tile_id == Tile.id, FavoriteTile.seller_id == seller_id))
+
+    # ✅ Keyset Pagination (sort key + id), stable for every sort option
+    sort_by, order, sort_column = resolve_tile_sort(sort_by, order)
+    after = resolve_page_anchor(db, cursor, last_id, sort_by, order, sort_column)
+    query = apply_keyset(query, sort_column, Tile.id, order, after)
+    if after is None and offset:
+        query = query.offset(offset)  # Legacy offset paging
+
+    tiles, next_cursor = split_page(
+        query.limit(limit + 1).all(), limit, sort_by, order,
+        key=lambda tile: (getattr(tile, sort_by), tile.id)
+    )
 
     # ✅ Return Updated Tile Data with `tile_colors`
     return {
         "collection": {
             "id": collection.id,
             "name": collection.name,
-            "size": collection.size.name if collection.size else None,
-            "series": collection.series.name if collection.series else None,
-            "material": collection.material.name if collection.material else None,
-            "finish": collection.finish.name if collection.finish else None,
-            "category": collection.category.name if collection.category else None
+            "size": collection.size,
+            "series": collection.series,
+            "material": collection.material,
+            "finish": collection.finish,
+            "category": collection.category
         },
         "tiles": [
             {
                 "id": tile.id,
-                "tile_code": tile.design.tile_code if tile.design else "N/A",
-                "name": tile.design.tile_name if tile.design else "Unnamed Tile",
-                "image_url": tile.design.image_url if tile.design else "N/A",
+                "tile_code": tile.tile_code if tile.tile_design_id else "N/A",
+                "name": tile.tile_name if tile.tile_design_id else "Unnamed Tile",
+                "image_url": tile.image_url if tile.tile_design_id else "N/A",
+                "thumbnails": thumbnail_urls(tile.image_url) if tile.tile_design_id else {},
                 "stock_quantity": tile.stock_quantity,
                 "batch_number": tile.batch_number,
                 "thickness": tile.thickness,
                 "usage_count": tile.usage_count,
                 "priority": tile.priority,
                 "status": tile.status,
-                "color_name": tile.design.color.name if tile.design and tile.design.color else None,  # ✅ Fetch color name correctly
+                "color_name": tile.color_name,  # ✅ Fetch color name correctly
             }
             for tile in tiles
-        ]
+        ],
+        "next_cursor": next_cursor
     }
 
+# ✅ Sort options shared by the tile listings (each backed by a `(…, column, id)` index)
+TILE_SORT_COLUMNS = {
+    "created_at": Tile.created_at,
+    "usage_count": Tile.usage_count,
+    "priority": Tile.priority
+}
+
+def resolve_tile_sort(sort_by, order):
+    """ Normalizes `sort_by` / `order` and returns `(sort_by, order, column)`. """
+    sort_by = sort_by if sort_by in TILE_SORT_COLUMNS else "created_at"
+    order = "asc" if order == "asc" else "desc"
+    return sort_by, order, TILE_SORT_COLUMNS[sort_by]
+
+def resolve_page_anchor(db: Session, cursor, last_id, sort_by, order, sort_column):
+    """ `(sort_value, id)` to continue after: from an opaque cursor, or from the last tile the client saw. """
+    if cursor:
+        return decode_cursor(cursor, sort_by, order, sort_column)
+    if last_id:
+        row = db.query(sort_column, Tile.id).filter(Tile.id == last_id).first()
+        if not row:
+            raise HTTPException(status_code=400, detail="last_id does not refer to an existing tile")
+        return row[0], row[1]
+    return None
+
 # """Fetch filtered, sorted, and paginated tiles with required fields"""
 def get_filtered_tiles(
     db: Session,
@@ -158,7 +224,9 @@ def get_filtered_tiles(
     order="desc",
     search=None,
     page=1,
-    limit=20
+    limit=20,
+    cursor=None,
+    last_id=None
 ):
     """Fetch filtered, sorted, and paginated tiles with required fields"""
     query = db.query(
@@ -173,11 +241,16 @@ def get_filtered_tiles(
         Tile.thickness,
         Tile.usage_count,
         Tile.priority,
-        Tile.status
+        Tile.status,
+        Tile.created_at
     ).join(TileDesign, Tile.tile_design_id == TileDesign.id, isouter=True) \
      .join(TileColor, TileDesign.color_id == TileColor.id, isouter=True) \
      .join(TileCollection, Tile.collection_id == TileCollection.id) \
-     .filter(TileCollection.seller_id == seller_id)
+     .filter(
+        TileCollection.seller_id == seller_id,
+        TileCollection.deleted_at.is_(None),
+        Tile.deleted_at.is_(None)  # ✅ Live tiles only (matches the partial listing indexes)
+     )
 
     # ✅ Apply ALL selected filters correctly
     def apply_filter(query, column, values):
@@ -199,25 +272,23 @@ def get_filtered_tiles(
         query = query.filter(Tile.status == status)
     if favorite:
         query = query.join(FavoriteTile).filter(FavoriteTile.seller_id == seller_id)
-    if search:
-        query = query.filter(TileDesign.tile_name.ilike(f"%{search}%"))
-
-    # ✅ Debugging SQL Query
-    print("Generated SQL Query:", str(query))
-
-    # Sorting
-    sort_fields = {
-        "created_at": Tile.created_at,
-        "usage_count": Tile.usage_count,
-        "priority": Tile.priority
-    }
-    if sort_by in sort_fields:
-        query = query.order_by(desc(sort_fields[sort_by]) if order == "desc" else asc(sort_fields[sort_by]))
-
-    # Pagination
-    tiles = query.offset((page - 1) * limit).limit(limit).all()
+    if normalize_term(search):
+        # ✅ Name, code, collection and color; trigram-indexed on Postgres
+        query = query.filter(tile_match_condition(db, normalize_term(search)))
+
+    # ✅ Keyset Pagination: `cursor` (or the `last_id` of the previous page) seeks instead of OFFSET
+    sort_by, order, sort_column = resolve_tile_sort(sort_by, order)
+    after = resolve_page_anchor(db, cursor, last_id, sort_by, order, sort_column)
+    query = apply_keyset(query, sort_column, Tile.id, order, after)
+    if after is None and page > 1:
+        query = query.offset((page - 1) * limit)  # Legacy page numbers
+
+    tiles, next_cursor = split_page(
+        query.limit(limit + 1).all(), limit, sort_by, order,
+        key=lambda tile: (getattr(tile, sort_by), tile.id)
+    )
 
-    return tiles
+    return [{**tile._mapping, "thumbnails": thumbnail_urls(tile.image_url)} for tile in tiles], next_cursor
 
 
 
@@ -268,7 +339,16 @@ def delete_tile(db: Session, tile_id: UUID):
         raise HTTPException(status_code=404, detail="Tile not found or already deleted")
 
     tile.deleted_at = datetime.utcnow()  # ✅ Mark as soft deleted
+
+    # ✅ Drop the tile's reference on its image; the blob is removed once no live tile uses it
+    image_url = db.query(TileDesign.image_url).filter(TileDesign.id == tile.tile_design_id).scalar()
+    blob = blobs_for_paths(db, [image_url]).get(image_url) if image_url else None
+    if blob:
+        release_blob_references(db, [blob.sha256])
     db.commit()
+
+    if blob:
+        delete_unreferenced_blobs(db, [blob.sha256])
     return {"message": "Tile soft deleted successfully"}
 
 # Update Tile Priority: High (3), Medium (2), Low (1)
@@ -304,97 +384,189 @@ def get_or_create_color(db: Session, image_path: str):
     db.refresh(new_color)
     return new_color.id  # ✅ Return new color_id
 
+def resolve_color_ids(db: Session, colors: dict) -> dict:
+    """
+    Maps detected color names to `TileColor` ids with one lookup; missing colors are upserted in one
+    `INSERT ... ON CONFLICT DO NOTHING` (a concurrent import may have created them meanwhile).
+    `colors` is `{name: hex_code}`.
+    """
+    if not colors:
+        return {}
+    found = {row.name: row.id for row in db.query(TileColor.id, TileColor.name).filter(TileColor.name.in_(list(colors)))}
+    missing = {name: hex_code for name, hex_code in colors.items() if name not in found}
+    if not missing:
+        return found
+
+    if any(not hex_code for hex_code in missing.values()):
+        raise HTTPException(status_code=400, detail="detected_color_hex is required for new colors")
+    db.execute(
+        insert(TileColor)
+        .values([{"id": uuid4(), "name": name, "hex_code": hex_code} for name, hex_code in missing.items()])
+        .on_conflict_do_nothing()
+    )
+
+    # ✅ A color whose hex code already exists under another name resolves to that color
+    rows = db.query(TileColor.id, TileColor.name, TileColor.hex_code).filter(
+        or_(TileColor.name.in_(list(missing)), TileColor.hex_code.in_(list(missing.values())))
+    ).all()
+    by_name = {row.name: row.id for row in rows}
+    by_hex = {row.hex_code: row.id for row in rows}
+    for name, hex_code in missing.items():
+        found[name] = by_name.get(name) or by_hex[hex_code]
+    return found
+
+def selected_design_blobs(db: Session, design_ids) -> tuple:
+    """
+    `({design_id: image_url}, {image_url: ImageBlob})` for designs picked by the seller, with the blob rows
+    locked until the caller commits. Raises 400 for unknown designs or images that are no longer stored.
+    """
+    design_ids = set(design_ids)
+    images = dict(db.query(TileDesign.id, TileDesign.image_url).filter(TileDesign.id.in_(design_ids))) if design_ids else {}
+    if len(images) != len(design_ids):
+        raise HTTPException(status_code=400, detail="Tile design not found")
+    stored = blobs_for_paths(db, images.values())
+    if any(path.startswith(BLOB_STORAGE) and path not in stored for path in images.values()):
+        raise HTTPException(status_code=400, detail="The selected tile design's image is no longer stored")
+    return images, stored
+
 # //BULK UPLOADING...SAVING
 def store_final_tiles(db: Session, final_tiles: list[FinalTileSubmission]):
-    """ Stores finalized tiles in the database and moves images to permanent storage. """
-    
-    stored_tiles = []
-    
-    for tile in final_tiles:
-        tile_id = uuid4()  # Generate Unique Tile ID
-
-        # ✅ Step 1: Check if Color Exists, Otherwise Create It
-        color = db.query(TileColor).filter(TileColor.name == tile.detected_color_name).first()
-        if not color:
-            # ✅ Insert the new color and get its ID
-            color = TileColor(id=uuid4(), name=tile.detected_color_name, hex_code=tile.detected_color_hex)
-            db.add(color)
-            db.commit()
-            db.refresh(color)
-
-        # ✅ Step 2: Move Image to Permanent Folder
-        final_image_path = move_file_to_storage(tile.temp_image_path, tile.collection_id, tile_id, "tile.jpg")
-
-        # ✅ Step 3: Store Tile Design with the Correct `color_id`
-        new_design = TileDesign(
-            id=uuid4(),
-            tile_name=tile.name,
-            color_id=color.id,  # ✅ Storing the foreign key reference
-            image_url=final_image_path,
-            created_at=datetime.utcnow()
-        )
-        db.add(new_design)
+    """
+    Stores finalized tiles and their images in one transaction with a fixed number of statements:
+    colors, blobs, designs and tiles are each looked up / inserted in bulk. Temp images are removed
+    only after the commit, so a failed import leaves nothing half-stored and can simply be retried.
+    """
+    new_tiles = [tile for tile in final_tiles if not tile.tile_design_id]
+    if any(not tile.temp_image_path for tile in new_tiles):
+        raise HTTPException(status_code=400, detail="temp_image_path is required for new tiles")
+    try:
+        ids = [
+            {field: UUID(getattr(tile, field)) if getattr(tile, field) else None for field in ("collection_id", "tile_design_id", "color_id")}
+            for tile in final_tiles
+        ]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid collection, design or color id")
+
+    try:
+        # ✅ Step 1: Resolve Every Color at Once (submitted color_id wins over the detected name)
+        color_ids = resolve_color_ids(db, {
+            tile.detected_color_name: tile.detected_color_hex
+            for tile in new_tiles if not tile.color_id and tile.detected_color_name
+        })
+
+        # ✅ Step 2: Store Each Distinct Image Once (uploads reuse the digest computed while streaming)
+        temp_paths = [tile.temp_image_path for tile in new_tiles]
+        blobs = ingest_blobs(db, temp_paths, sha256s={path: uploaded_sha256(path) for path in temp_paths})
+
+        # ✅ Step 3: One New Design per New Tile (its own name and color; identical images share the blob)
+        design_rows = []
+        design_ids = []
+        for tile, tile_ids in zip(final_tiles, ids):
+            if tile_ids["tile_design_id"]:
+                design_ids.append(tile_ids["tile_design_id"])
+                continue
+            design_rows.append({
+                "id": uuid4(),
+                "tile_name": tile.name,
+                "color_id": tile_ids["color_id"] or color_ids.get(tile.detected_color_name),  # ✅ Storing the foreign key reference
+                "image_url": blobs[tile.temp_image_path].path,
+                "created_at": datetime.utcnow()
+            })
+            design_ids.append(design_rows[-1]["id"])
+
+        # ✅ Tile codes for every new design, reserved in bulk
+        for design_row, tile_code in zip(design_rows, reserve_tile_codes(db, len(design_rows))):
+            design_row["tile_code"] = tile_code
+
+        if design_rows:
+            # ✅ executemany: SQLAlchemy batches the rows into multi-row INSERTs ("insertmanyvalues")
+            db.execute(insert(TileDesign), design_rows)
+
+        # ✅ Step 4: Bulk-Insert Tiles (each live tile holds one reference on its image blob)
+        existing_images, stored = selected_design_blobs(db, {tile_ids["tile_design_id"] for tile_ids in ids if tile_ids["tile_design_id"]})
+        image_urls = {row["id"]: row["image_url"] for row in design_rows} | existing_images
+        stored.update({blob.path: blob for blob in blobs.values()})
+        add_blob_references(db, [stored[image_urls[design_id]].sha256 for design_id in design_ids if image_urls[design_id] in stored])
+
+        now = datetime.utcnow()
+        tile_rows = [
+            {
+                "id": uuid4(),
+                "collection_id": tile_ids["collection_id"],
+                "tile_design_id": design_id,
+                "thickness": tile.thickness,
+                "priority": 2,  # ✅ Default Priority
+                "usage_count": 0,
+                "status": "active",  # ✅ Default Status
+                "created_at": now
+            }
+            for tile, tile_ids, design_id in zip(final_tiles, ids, design_ids)
+        ]
+        if tile_rows:
+            db.execute(insert(Tile), tile_rows)
+
         db.commit()
-        db.refresh(new_design)
-        tile_design_id = new_design.id  # ✅ Use New Design ID
-        
-        # ✅ Step 4: Store Tile in Database
-        new_tile = Tile(
-            id=tile_id,
-            collection_id=tile.collection_id,
-            tile_design_id=tile_design_id,
-            thickness=tile.thickness,
-            priority=2,  # ✅ Default Priority
-            status="active",  # ✅ Default Status
-            created_at=datetime.utcnow()
-        )
-        db.add(new_tile)
-        stored_tiles.append(new_tile)
+    except Exception:
+        db.rollback()
+        raise
 
-    db.commit()
-    return {"message": "Tiles stored successfully", "stored_tiles": stored_tiles}
+    # ✅ Core inserts skip ORM events, so in-process caches are refreshed explicitly
+    tile_color_index.invalidate()
+    facet_cache.invalidate()
+
+    # ✅ Bulk-upload previews of the stored uploads are no longer needed
+    for tile in new_tiles:
+        remove_preview(tile.temp_image_path)
+
+    # ✅ Pre-render grid thumbnails in the background (the lazy thumbnail route covers anything skipped)
+    for image_path in {row["image_url"] for row in design_rows}:
+        cpu_executor.submit_nowait(generate_thumbnails, image_path)
+
+    return {"message": "Tiles stored successfully", "stored_tiles": tile_rows}
 
 
 TEMP_STORAGE = "tiles_storage/temp/"
 
-async def process_multiple_tiles(db: Session, file_paths: list):
-    """ Processes multiple uploaded tiles, detects colors, and sends progress updates. """
-    try:
-        if not file_paths:
-            raise HTTPException(status_code=400, detail="No files provided.")
-
-        extracted_tiles = []
-        total_files = len(file_paths)
-
-        for index, file_path in enumerate(file_paths):
-            # ✅ Debugging: Log file paths before processing
-            print("Processing file:", file_path)
-
-            # ✅ Check if file exists before processing
-            if not os.path.exists(file_path):
-                print(f"File not found: {file_path}")
-                raise HTTPException(status_code=400, detail=f"File not found: {file_path}")
-
-            # ✅ Extract Color
-            hex_color = extract_dominant_color(file_path)
-            color_name = get_closest_color_name(hex_color)
-
-            # ✅ Return Preview Data
-            extracted_tiles.append({
-                "temp_image_path": file_path,
-                "detected_color_name": color_name,
-                "detected_color_hex": hex_color
-            })
+async def process_multiple_tiles(db: Session, file_paths: list, job_id: str = LEGACY_JOB_ID):
+    """ Processes multiple uploaded tiles in parallel, detects colors, and sends progress updates. """
+    if not file_paths:
+        raise HTTPException(status_code=400, detail="No files provided.")
 
-            # ✅ Update Real-Time Progress
-            progress = int(((index + 1) / total_files) * 100)
-            await update_progress(progress)
+    try:
+        results = [None] * len(file_paths)
+        async for index, result in iter_bulk_tile_results(file_paths, job_id):
+            results[index] = result
 
-        return {"tiles": extracted_tiles}
+        # ✅ Previews keep upload order; files that could not be analyzed are reported separately
+        return {
+            "job_id": job_id,
+            "tiles": [r for r in results if "error" not in r],
+            "errors": [r for r in results if "error" in r],
+        }
 
     except Exception as e:
-        print("Error processing tiles:", str(e))  # ✅ Debugging
+        logger.exception("Error processing tiles for job %s", job_id)
+        await run_in_threadpool(set_progress, job_id, 0, "failed", str(e))
         raise HTTPException(status_code=500, detail=f"Error processing tiles: {str(e)}")
+
+
+async def iter_bulk_tile_results(file_paths: list, job_id: str = LEGACY_JOB_ID):
+    """ Yields `(index, preview)` for each file as soon as it is analyzed, updating the job's progress. """
+    total_files = len(file_paths)
+    completed = 0
+    async for index, result in iter_tile_analyses(file_paths):
+        completed += 1
+        await update_progress(int(completed / total_files * 100), job_id)  # ✅ Update Real-Time Progress
+        yield index, result
+
+
+async def stream_multiple_tiles(file_paths: list, job_id: str = LEGACY_JOB_ID):
+    """ NDJSON stream of per-file previews in completion order, ending with a summary line. """
+    failed = 0
+    async for index, result in iter_bulk_tile_results(file_paths, job_id):
+        failed += "error" in result
+        yield json.dumps({"index": index, **result}) + "\n"
+    yield json.dumps({"done": True, "job_id": job_id, "total": len(file_paths), "failed": failed}) + "\n"
     
 
 
@@ -409,7 +581,11 @@ def get_existing_tile_designs(db: Session, seller_id: UUID, collection_id: Optio
         .join(Tile, Tile.tile_design_id == TileDesign.id)
         .join(TileCollection, Tile.collection_id == TileCollection.id)
         .join(TileColor, TileDesign.color_id == TileColor.id)
-        .filter(TileCollection.seller_id == seller_id)
+        .filter(
+            TileCollection.seller_id == seller_id,
+            Tile.deleted_at.is_(None),  # ✅ Only designs live tiles still use (their image is still stored)
+            TileCollection.deleted_at.is_(None)
+        )
     )
 
     if collection_id:
@@ -423,6 +599,7 @@ def get_existing_tile_designs(db: Session, seller_id: UUID, collection_id: Optio
             name=design.tile_name,
             color_name=design.color_name,
             image_url=design.image_url,
+            thumbnails=thumbnail_urls(design.image_url),
             thickness="10mm"  # ✅ Default thickness, user can edit before saving
         )
         for design in tile_designs
@@ -432,6 +609,10 @@ def get_existing_tile_designs(db: Session, seller_id: UUID, collection_id: Optio
 def store_existing_tiles(db: Session, collection_id: UUID, tiles: List[ExistingTileSelection]):
     stored_tiles = []
 
+    # ✅ Every new tile holds a reference on its design's image blob (same transaction as the insert)
+    images, stored = selected_design_blobs(db, {tile.tile_design_id for tile in tiles})
+    add_blob_references(db, [stored[images[tile.tile_design_id]].sha256 for tile in tiles if images[tile.tile_design_id] in stored])
+
     for tile in tiles:
         new_tile = Tile(
             id=uuid4(),
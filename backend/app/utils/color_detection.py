@@ -1,52 +1,233 @@
+import json
+import os
+from functools import lru_cache
+
 import cv2
 import numpy as np
-from sklearn.cluster import KMeans
 import webcolors
 
-def extract_dominant_color(image_path):
-    """ Extracts the most dominant color from a tile image and returns its HEX code. """
-    
-    image = cv2.imread(image_path)
-    if image is None:
-        raise ValueError(f"Could not load image: {image_path}")
+from app.core.settings import settings
+
+def load_rgb_pixels(image, max_side: int = None) -> np.ndarray:
+    """
+    Returns a downsampled RGB copy of `image` for color statistics.
+    `image` is a file path or an already decoded OpenCV array (BGR, BGRA or grayscale),
+    so callers that already hold the pixels don't read the file again.
+    """
+    if isinstance(image, np.ndarray):
+        pixels = image
+    else:
+        pixels = cv2.imread(image, cv2.IMREAD_COLOR)
+        if pixels is None:
+            raise ValueError(f"Could not load image: {image}")
+
+    if pixels.ndim == 2:
+        pixels = cv2.cvtColor(pixels, cv2.COLOR_GRAY2RGB)
+    elif pixels.shape[2] == 4:
+        pixels = cv2.cvtColor(pixels, cv2.COLOR_BGRA2RGB)
+    else:
+        pixels = cv2.cvtColor(pixels, cv2.COLOR_BGR2RGB)
+
+    # ✅ Color statistics don't need full resolution; area interpolation preserves the average color
+    max_side = max_side or settings.COLOR_SAMPLE_MAX_SIDE
+    h, w = pixels.shape[:2]
+    if max(h, w) > max_side:
+        scale = max_side / max(h, w)
+        pixels = cv2.resize(pixels, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+    return pixels
+
+
+def _rgb_to_hex(rgb) -> str:
+    return "#{:02x}{:02x}{:02x}".format(int(rgb[0]), int(rgb[1]), int(rgb[2]))
+
+
+def extract_dominant_color(image):
+    """
+    Extracts the most dominant color from a tile image (path or decoded array) and returns its HEX code.
+    This is the mean color of the downsampled image (what single-cluster KMeans converges to).
+    """
+    pixels = load_rgb_pixels(image).reshape((-1, 3))
+    return _rgb_to_hex(pixels.mean(axis=0))
+
+
+def extract_color_palette(image, k: int = 5, bits_per_channel: int = 4) -> list:
+    """
+    Extracts the `k` most common colors of a tile image as `[{"hex_code": ..., "weight": ...}]`,
+    weights summing to at most 1. Pixels are binned into a coarse RGB histogram
+    (`bits_per_channel` bits each) and each bin reports the mean color of its pixels.
+    """
+    pixels = load_rgb_pixels(image).reshape((-1, 3)).astype(np.int64)
+    shift = 8 - bits_per_channel
+    bins = ((pixels[:, 0] >> shift) << (2 * bits_per_channel)) | ((pixels[:, 1] >> shift) << bits_per_channel) | (pixels[:, 2] >> shift)
+
+    size = 1 << (3 * bits_per_channel)
+    counts = np.bincount(bins, minlength=size)
+    sums = np.stack([np.bincount(bins, weights=pixels[:, c], minlength=size) for c in range(3)], axis=1)
+
+    k = min(k, int(np.count_nonzero(counts)))
+    if k <= 0:
+        return []
+    top = np.argpartition(counts, -k)[-k:]
+    top = top[np.argsort(counts[top])[::-1]]
+
+    total = counts.sum()
+    return [
+        {"hex_code": _rgb_to_hex(sums[b] / counts[b]), "weight": round(float(counts[b] / total), 4)}
+        for b in top
+    ]
+
+
+# ✅ sRGB (D65) -> CIELAB conversion, vectorized over (N, 3) arrays
+_RGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+])
+_D65_WHITE = np.array([0.95047, 1.0, 1.08883])
+
+
+def rgb_to_lab(rgb) -> np.ndarray:
+    """ Converts an (N, 3) array of 0-255 sRGB values to CIELAB. """
+    c = np.asarray(rgb, dtype=np.float64).reshape(-1, 3) / 255.0
+    linear = np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+    xyz = (linear @ _RGB_TO_XYZ.T) / _D65_WHITE
+
+    delta = 6 / 29
+    f = np.where(xyz > delta ** 3, np.cbrt(xyz), xyz / (3 * delta ** 2) + 4 / 29)
+    return np.stack([
+        116 * f[:, 1] - 16,
+        500 * (f[:, 0] - f[:, 1]),
+        200 * (f[:, 1] - f[:, 2]),
+    ], axis=1)
+
+
+def delta_e_2000(lab1, lab2) -> np.ndarray:
+    """ CIEDE2000 color difference between every row of `lab1` (N, 3) and `lab2` (M, 3); returns (N, M). """
+    L1, a1, b1 = [x[:, None] for x in np.asarray(lab1, dtype=np.float64).T]
+    L2, a2, b2 = [x[None, :] for x in np.asarray(lab2, dtype=np.float64).T]
 
-    image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-    image = image.reshape((-1, 3))  # Flatten image into a list of pixels
+    c_bar = (np.hypot(a1, b1) + np.hypot(a2, b2)) / 2
+    g = 0.5 * (1 - np.sqrt(c_bar ** 7 / (c_bar ** 7 + 25.0 ** 7)))
+    a1p, a2p = (1 + g) * a1, (1 + g) * a2
+    c1p, c2p = np.hypot(a1p, b1), np.hypot(a2p, b2)
+    h1p = np.degrees(np.arctan2(b1, a1p)) % 360
+    h2p = np.degrees(np.arctan2(b2, a2p)) % 360
 
-    kmeans = KMeans(n_clusters=1, n_init=10, max_iter=200)
-    kmeans.fit(image)
-    dominant_color = kmeans.cluster_centers_[0]
+    chroma_zero = (c1p * c2p) == 0
+    dh = h2p - h1p
+    dh = np.where(dh > 180, dh - 360, np.where(dh < -180, dh + 360, dh))
+    dh = np.where(chroma_zero, 0, dh)
 
-    hex_color = "#{:02x}{:02x}{:02x}".format(
-        int(dominant_color[0]), int(dominant_color[1]), int(dominant_color[2])
+    dL = L2 - L1
+    dC = c2p - c1p
+    dH = 2 * np.sqrt(c1p * c2p) * np.sin(np.radians(dh) / 2)
+
+    l_bar = (L1 + L2) / 2
+    cp_bar = (c1p + c2p) / 2
+    h_sum = h1p + h2p
+    h_bar = np.where(
+        np.abs(h1p - h2p) <= 180, h_sum / 2,
+        np.where(h_sum < 360, (h_sum + 360) / 2, (h_sum - 360) / 2)
     )
+    h_bar = np.where(chroma_zero, h_sum, h_bar)
 
-    return hex_color
+    t = (1 - 0.17 * np.cos(np.radians(h_bar - 30)) + 0.24 * np.cos(np.radians(2 * h_bar))
+         + 0.32 * np.cos(np.radians(3 * h_bar + 6)) - 0.20 * np.cos(np.radians(4 * h_bar - 63)))
+    d_theta = 30 * np.exp(-(((h_bar - 275) / 25) ** 2))
+    r_c = 2 * np.sqrt(cp_bar ** 7 / (cp_bar ** 7 + 25.0 ** 7))
+    s_l = 1 + (0.015 * (l_bar - 50) ** 2) / np.sqrt(20 + (l_bar - 50) ** 2)
+    s_c = 1 + 0.045 * cp_bar
+    s_h = 1 + 0.015 * cp_bar * t
+    r_t = -np.sin(np.radians(2 * d_theta)) * r_c
 
-import webcolors
+    return np.sqrt(
+        (dL / s_l) ** 2 + (dC / s_c) ** 2 + (dH / s_h) ** 2 + r_t * (dC / s_c) * (dH / s_h)
+    )
+
+
+@lru_cache(maxsize=1)
+def _color_name_index():
+    """ CSS3 color names (one canonical name per distinct color) and their CIELAB coordinates, built once. """
+    names_by_hex = {}
+    for name in webcolors.names("css3"):
+        hex_code = webcolors.name_to_hex(name)
+        if hex_code not in names_by_hex:
+            names_by_hex[hex_code] = webcolors.hex_to_name(hex_code)  # One canonical name for aliases such as gray/grey
+
+    hex_codes = sorted(names_by_hex)
+    names = [names_by_hex[h].capitalize() for h in hex_codes]
+    labs = rgb_to_lab([webcolors.hex_to_rgb(h) for h in hex_codes])
+    return names, labs
+
+
+@lru_cache(maxsize=1)
+def _load_color_name_lut():
+    """
+    Optional full RGB -> name lookup table (16,777,216 uint8 indexes, memory-mapped).
+    Returns `(names, lut)` or None when `COLOR_NAME_LUT_PATH` is not set or not built yet.
+    """
+    path = settings.COLOR_NAME_LUT_PATH
+    if not path or not os.path.exists(path) or not os.path.exists(path + ".json"):
+        return None
+    with open(path + ".json") as f:
+        names = json.load(f)
+    return names, np.memmap(path, dtype=np.uint8, mode="r", shape=(256 ** 3,))
+
+
+def build_color_name_lut(path: str, chunk_size: int = 1 << 16) -> str:
+    """
+    Precomputes the closest color name (ΔE2000) for every 24-bit RGB value into an mmap-able file.
+    Names are written to `<path>.json`. Takes roughly 15-20 minutes on one core; run once per deployment.
+    """
+    names, labs = _color_name_index()
+    lut = np.memmap(path, dtype=np.uint8, mode="w+", shape=(256 ** 3,))
+    for start in range(0, 256 ** 3, chunk_size):
+        codes = np.arange(start, min(start + chunk_size, 256 ** 3), dtype=np.uint32)
+        rgb = np.stack([(codes >> 16) & 255, (codes >> 8) & 255, codes & 255], axis=1)
+        lut[start:start + len(codes)] = delta_e_2000(rgb_to_lab(rgb), labs).argmin(axis=1)
+    lut.flush()
+    with open(path + ".json", "w") as f:
+        json.dump(names, f)
+    _load_color_name_lut.cache_clear()
+    return path
+
+
+def _hex_to_rgb_array(hex_codes) -> np.ndarray:
+    """ `#rrggbb` or `#rgb` codes (the `#` is optional) as an (N, 3) array; raises ValueError for anything else. """
+    values = [int(webcolors.normalize_hex("#" + code.strip().lstrip("#"))[1:], 16) for code in hex_codes]
+    codes = np.array(values, dtype=np.uint32)
+    return np.stack([(codes >> 16) & 255, (codes >> 8) & 255, codes & 255], axis=1)
+
+
+def get_closest_color_names(hex_codes) -> list:
+    """ Matches a batch of HEX color codes to the perceptually closest (CIEDE2000) CSS3 color names. """
+    hex_codes = list(hex_codes)
+    if not hex_codes:
+        return []
+
+    rgb = _hex_to_rgb_array(hex_codes)
+
+    lut = _load_color_name_lut()
+    if lut is not None:
+        names, table = lut
+        indexes = table[(rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2]]
+        return [names[i] for i in indexes]
+
+    names, labs = _color_name_index()
+    nearest = delta_e_2000(rgb_to_lab(rgb), labs).argmin(axis=1)
+    return [names[i] for i in nearest]
 
 
 def get_closest_color_name(hex_code):
     """ Matches HEX color code to the closest available color name. """
-    
-    def hex_to_rgb(value):
-        """ Converts HEX to RGB tuple. """
-        value = value.lstrip("#")
-        return tuple(int(value[i:i+2], 16) for i in (0, 2, 4))
-
-    requested_rgb = hex_to_rgb(hex_code)
-
-    try:
-        return webcolors.hex_to_name(hex_code).capitalize()
-    except ValueError:
-        min_colours = {}
-
-        # ✅ FIX: Use `webcolors.names("css3")` for latest color mapping
-        for name in webcolors.names("css3"):
-            r, g, b = webcolors.name_to_rgb(name)
-            rd = (r - requested_rgb[0]) ** 2
-            gd = (g - requested_rgb[1]) ** 2
-            bd = (b - requested_rgb[2]) ** 2
-            min_colours[(rd + gd + bd)] = name
-
-        return min_colours[min(min_colours.keys())].capitalize()
+    return get_closest_color_names([hex_code])[0]
+
+
+if __name__ == "__main__":
+    # ✅ `python -m app.utils.color_detection [path]` builds the table at `path` (default: COLOR_NAME_LUT_PATH)
+    import sys
+
+    target = sys.argv[1] if len(sys.argv) > 1 else settings.COLOR_NAME_LUT_PATH
+    if not target:
+        sys.exit("usage: python -m app.utils.color_detection <path>  (or set COLOR_NAME_LUT_PATH)")
+    print(f"Color name table written to {build_color_name_lut(target)}")
@@ -1,9 +1,24 @@
+import hashlib
 import os
+import re
 import shutil
-from fastapi import UploadFile
+from uuid import uuid4
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import case, event, exists
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+from app.core.settings import settings
+from app.models.image_blob_model import ImageBlob
+from app.models.tile_designs_model import TileDesign
+from app.models.tiles_model import Tile
+from app.utils.image_processing import THUMBNAIL_FORMATS, THUMBNAIL_WIDTHS, derivative_path
 
 BASE_STORAGE_PATH = "tiles_storage"
 TEMP_STORAGE = os.path.join(BASE_STORAGE_PATH, "temp")
+BLOB_STORAGE = os.path.join(BASE_STORAGE_PATH, "blobs")
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+_UPLOAD_NAME = re.compile(r"^([0-9a-f]{64})-[0-9a-f]{32}\.\w+$")  # `<sha256>-<uuid><ext>`, see `stream_upload_to_disk`
 
 def ensure_directory(path):
     """ Ensures that the given directory exists, creating it if necessary. """
@@ -21,22 +36,66 @@ def sanitize_filename(filename):
     """ Removes spaces and special characters to avoid file path issues. """
     return filename.replace(" ", "_").replace("(", "").replace(")", "")
 
+def file_extension(filename, default=".bin"):
+    """ Lower-case extension of an uploaded filename (with the dot), limited to safe characters. """
+    ext = os.path.splitext(filename or "")[1].lower()
+    return ext if ext[1:].isalnum() and len(ext) <= 10 else default
+
+async def stream_upload_to_disk(file: UploadFile, directory: str, max_bytes: int, name: str = None) -> dict:
+    """
+    Writes an upload to `directory` in fixed-size chunks, hashing it on the fly.
+    The file is stored as `<sha256>-<uuid><ext>` (or `<name><ext>`): every upload gets its own file, so one
+    seller finalizing or discarding an image never removes another seller's pending copy of it.
+    Identical content is deduplicated later, in the blob store. Raises 413 as soon as the body exceeds `max_bytes`; the request body is released before returning.
+    """
+    ensure_directory(directory)
+    if file.size is not None and file.size > max_bytes:
+        await file.close()
+        raise HTTPException(status_code=413, detail=f"{file.filename} exceeds the {max_bytes // (1024 * 1024)} MB upload limit")
+
+    ext = file_extension(file.filename)
+    part_path = os.path.join(directory, f".{uuid4().hex}.part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(part_path, "wb") as f:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(status_code=413, detail=f"{file.filename} exceeds the {max_bytes // (1024 * 1024)} MB upload limit")
+                digest.update(chunk)
+                f.write(chunk)
+
+        sha256 = digest.hexdigest()
+        path = os.path.join(directory, f"{name or f'{sha256}-{uuid4().hex}'}{ext}")
+        os.replace(part_path, path)
+    except BaseException:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+    finally:
+        await file.close()  # ✅ Drop the spooled request body now instead of at the end of the request
+
+    return {"path": path, "sha256": sha256, "size": size, "filename": file.filename}
+
 async def save_temp_files(files: list[UploadFile]) -> list:
-    """ Saves uploaded files to a temporary storage folder. """
+    """ Streams uploaded files to the temporary storage folder (one file, and one path, per upload). """
     ensure_directory(TEMP_STORAGE)  # ✅ Ensure temp folder exists
 
     saved_paths = []
     for file in files:
-        safe_filename = sanitize_filename(file.filename)
-        file_path = os.path.join(TEMP_STORAGE, safe_filename)
-
-        with open(file_path, "wb") as f:
-            f.write(await file.read())  # ✅ Ensure file is saved properly
-
-        saved_paths.append(file_path)
+        saved = await stream_upload_to_disk(file, TEMP_STORAGE, settings.MAX_IMAGE_UPLOAD_BYTES)
+        saved_paths.append(saved["path"])
 
     return saved_paths
 
+def uploaded_sha256(path):
+    """ SHA-256 recorded in the name of a temp upload written by `stream_upload_to_disk`, or None for any other file. """
+    if os.path.dirname(os.path.normpath(path)) != os.path.normpath(TEMP_STORAGE):
+        return None
+    match = _UPLOAD_NAME.match(os.path.basename(path))
+    return match.group(1) if match else None
+
 def get_tile_storage_path(collection_id, tile_id, filename):
     """ Returns the structured storage path for tile images. """
     collection_folder = os.path.join(BASE_STORAGE_PATH, str(collection_id))
@@ -49,3 +108,153 @@ def move_file_to_storage(temp_path, collection_id, tile_id, filename):
     new_path = get_tile_storage_path(collection_id, tile_id, filename)
     shutil.move(temp_path, new_path)
     return new_path
+
+
+# ✅ Content-Addressed Blob Store: every distinct image is stored once, at a path derived from its hash
+
+def hash_file(path) -> str:
+    """ SHA-256 of a file, read in chunks. """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(UPLOAD_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def blob_path_for(sha256, ext):
+    """ Sharded location of a blob: `tiles_storage/blobs/ab/cd/<sha256><ext>`. """
+    return os.path.join(BLOB_STORAGE, sha256[:2], sha256[2:4], f"{sha256}{ext}")
+
+def _publish_blob_file(source_path, blob_path):
+    """ Hard-links (or copies) a file into the blob store via a temporary name and an atomic rename. """
+    ensure_directory(os.path.dirname(blob_path))
+    staging_path = f"{blob_path}.{uuid4().hex}.tmp"
+    try:
+        try:
+            os.link(source_path, staging_path)  # ✅ Same filesystem: no bytes copied
+        except OSError:
+            shutil.copyfile(source_path, staging_path)
+        os.replace(staging_path, blob_path)  # ✅ Readers see either no file or the complete file
+    except BaseException:
+        if os.path.exists(staging_path):
+            os.remove(staging_path)
+        raise
+
+def ingest_blobs(db: Session, source_paths, move=True, sha256s=None) -> dict:
+    """
+    Stores every file of `source_paths` in the blob store and returns `{source_path: ImageBlob}`
+    (new rows are created with `ref_count=0`), using one lookup and one insert for the whole batch.
+    Content that is already stored is not written again. The rows are flushed, not committed:
+    they become durable with the caller's transaction. With `move`, the source files are removed
+    once that transaction commits and kept if it rolls back, so a failed import can be retried.
+    `sha256s` (`{source_path: sha256}`) supplies digests already computed while streaming; other files are hashed here.
+    """
+    sha256s = sha256s or {}
+    hashes = {path: sha256s.get(path) or hash_file(path) for path in dict.fromkeys(source_paths)}
+    # ✅ Row locks keep `delete_unreferenced_blobs` from collecting a blob this import is about to reference
+    existing = {
+        blob.sha256: blob
+        for blob in db.query(ImageBlob).filter(ImageBlob.sha256.in_(set(hashes.values()))).with_for_update()
+    }
+
+    rows = {}
+    for path, sha256 in hashes.items():
+        blob = existing.get(sha256)
+        if sha256 in rows or (blob and os.path.exists(blob.path)):
+            continue
+
+        # ✅ A row whose file went missing is repaired in place
+        blob_path = blob.path if blob else blob_path_for(sha256, file_extension(path, default=".jpg"))
+        if not os.path.exists(blob_path):
+            _publish_blob_file(path, blob_path)
+            db.info.setdefault("published_blobs", []).append((sha256, blob_path))
+        rows[sha256] = {"sha256": sha256, "path": blob_path, "size": os.path.getsize(blob_path), "ref_count": 0}
+
+    if rows:
+        # ✅ Concurrent uploads of the same image: the first insert wins, everyone else reuses its row
+        db.execute(
+            insert(ImageBlob)
+            .values(list(rows.values()))
+            .on_conflict_do_nothing(index_elements=[ImageBlob.sha256])
+        )
+        blobs = {blob.sha256: blob for blob in db.query(ImageBlob).filter(ImageBlob.sha256.in_(list(rows))).populate_existing()}
+        existing.update(blobs)
+
+    if move:
+        db.info.setdefault("remove_after_commit", []).extend(hashes)
+    return {path: existing[sha256] for path, sha256 in hashes.items()}
+
+def blobs_for_paths(db: Session, paths) -> dict:
+    """ `{path: ImageBlob}` for the given image paths that live in the blob store (row-locked, like `ingest_blobs`). """
+    paths = set(paths)
+    if not paths:
+        return {}
+    return {blob.path: blob for blob in db.query(ImageBlob).filter(ImageBlob.path.in_(paths)).with_for_update()}
+
+def add_blob_references(db: Session, sha256s):
+    """ Records one more live tile per listed blob (a hash listed twice counts twice), one statement per distinct increment. """
+    _change_blob_references(db, sha256s, 1)
+
+def _change_blob_references(db: Session, sha256s, sign):
+    increments = {}
+    for sha256 in sha256s:
+        increments[sha256] = increments.get(sha256, 0) + 1
+    by_amount = {}
+    for sha256, amount in increments.items():
+        by_amount.setdefault(amount, []).append(sha256)
+    for amount, hashes in by_amount.items():
+        new_count = ImageBlob.ref_count + amount if sign > 0 else \
+            case((ImageBlob.ref_count > amount, ImageBlob.ref_count - amount), else_=0)  # ✅ Never below zero
+        db.query(ImageBlob).filter(ImageBlob.sha256.in_(hashes)).update(
+            {ImageBlob.ref_count: new_count}, synchronize_session=False
+        )
+
+def release_blob_references(db: Session, sha256s):
+    """ Records one live tile fewer per listed blob (see `add_blob_references`); unreferenced blobs are removed by `delete_unreferenced_blobs`. """
+    _change_blob_references(db, sha256s, -1)
+
+def delete_unreferenced_blobs(db: Session, sha256s=None) -> int:
+    """
+    Deletes blob rows (and, after the commit, their files and thumbnails) that no live tile uses any more,
+    optionally limited to `sha256s`. The live-tile check guards against a drifted counter;
+    rows locked by an import in progress are skipped. Returns how many were removed.
+    """
+    live_tile = exists().where(
+        TileDesign.image_url == ImageBlob.path, Tile.tile_design_id == TileDesign.id, Tile.deleted_at.is_(None)
+    )
+    query = db.query(ImageBlob).filter(ImageBlob.ref_count <= 0, ~live_tile)
+    if sha256s is not None:
+        query = query.filter(ImageBlob.sha256.in_(list(sha256s)))
+
+    paths = []
+    for blob in query.with_for_update(skip_locked=True).all():
+        db.delete(blob)
+        paths.append(blob.path)
+    db.commit()
+
+    for path in paths:
+        delete_temp_file(path)  # ✅ Only once the rows are gone for good
+        for width in THUMBNAIL_WIDTHS:
+            for fmt in THUMBNAIL_FORMATS:
+                delete_temp_file(derivative_path(path, width, fmt))
+    return len(paths)
+
+@event.listens_for(Session, "after_commit")
+def _forget_published_blobs(session):
+    session.info.pop("published_blobs", None)
+    for path in session.info.pop("remove_after_commit", ()):
+        delete_temp_file(path)  # ✅ Sources of committed blobs are no longer needed
+
+@event.listens_for(Session, "after_rollback")
+def _remove_orphaned_blobs(session):
+    """ Files published by a rolled-back transaction are removed unless another transaction recorded them. """
+    session.info.pop("remove_after_commit", None)  # ✅ Keep the sources so the import can be retried
+    published = session.info.pop("published_blobs", None)
+    if not published:
+        return
+    check = SessionLocal()
+    try:
+        for sha256, blob_path in published:
+            if not check.query(ImageBlob.sha256).filter(ImageBlob.sha256 == sha256).first() and os.path.exists(blob_path):
+                os.remove(blob_path)
+    finally:
+        check.close()
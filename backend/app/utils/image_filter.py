@@ -1,6 +1,28 @@
 import cv2
+import logging
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
+def is_tile_gray(gray, label="image"):
+    """ Tile check on an already decoded grayscale image (no disk round trip). """
+
+    # ✅ Step 1: Check Image Size
+    height, width = gray.shape
+    if height < 200 or width < 200:  # Skip very small images
+        logger.debug("Skipping %s: Image too small", label)
+        return False
+
+    # ✅ Step 2: Check Edge Detection (Tiles have structured edges)
+    edges = cv2.Canny(gray, 50, 150)
+    edge_density = np.sum(edges) / (height * width)
+
+    if edge_density < 0.02:  # If too few edges, it's likely not a tile
+        logger.debug("Skipping %s: Low edge density (not a tile)", label)
+        return False
+
+    return True  # ✅ Image is a tile
+
 def is_tile_image(image_path):
     """Improves filtering logic to remove unwanted non-tile images"""
     
@@ -8,25 +30,11 @@ def is_tile_image(image_path):
         image = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
         
         if image is None:
-            print(f"Skipping {image_path}: Image not found")
-            return False
-
-        # ✅ Step 1: Check Image Size
-        height, width = image.shape
-        if height < 200 or width < 200:  # Skip very small images
-            print(f"Skipping {image_path}: Image too small")
-            return False
-
-        # ✅ Step 2: Check Edge Detection (Tiles have structured edges)
-        edges = cv2.Canny(image, 50, 150)
-        edge_density = np.sum(edges) / (height * width)
-        
-        if edge_density < 0.02:  # If too few edges, it's likely not a tile
-            print(f"Skipping {image_path}: Low edge density (not a tile)")
+            logger.warning("Skipping %s: Image not found", image_path)
             return False
 
-        return True  # ✅ Image is a tile
+        return is_tile_gray(image, image_path)
 
-    except Exception as e:
-        print(f"Error processing {image_path}: {e}")
+    except Exception:
+        logger.exception("Error processing %s", image_path)
         return False
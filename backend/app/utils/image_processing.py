@@ -1,11 +1,31 @@
+import os
+from functools import lru_cache
+from uuid import uuid4
 import cv2
 import numpy as np
 
-# ✅ Crop Image to Remove Background & Borders
-def crop_tile_image(image_path):
-    """ Crops tile images to remove background and borders. """
-    image = cv2.imread(image_path, cv2.IMREAD_UNCHANGED)
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+BASE_STORAGE_PATH = "tiles_storage"
+DERIVATIVE_STORAGE = os.path.join(BASE_STORAGE_PATH, "derived")
+THUMBNAIL_WIDTHS = (160, 320, 640)
+THUMBNAIL_FORMATS = ("webp", "avif")
+THUMBNAIL_ROUTE = "images/thumb"
+WEBP_QUALITY = 80
+AVIF_QUALITY = 60
+
+SHARPEN_KERNEL = np.array([[0, -1, 0], [-1, 5, -1], [0, -1, 0]])
+
+def to_gray(image):
+    """ Grayscale view of a decoded image (gray, BGR or BGRA). """
+    if image.ndim == 2:
+        return image
+    if image.shape[2] == 4:
+        return cv2.cvtColor(image, cv2.COLOR_BGRA2GRAY)
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+# ✅ Crop Image to Remove Background & Borders (in memory)
+def crop_tile_array(image, gray=None):
+    """ Returns the largest edge-bounded region of a decoded tile image. """
+    gray = to_gray(image) if gray is None else gray
 
     # ✅ Use Edge Detection to Identify Tile Region
     edges = cv2.Canny(gray, 50, 200)
@@ -14,7 +34,20 @@ def crop_tile_image(image_path):
     # ✅ Find the Largest Contour (Tile Region)
     if contours:
         x, y, w, h = cv2.boundingRect(max(contours, key=cv2.contourArea))
-        cropped = image[y:y+h, x:x+w]
+        return image[y:y+h, x:x+w]
+    return image
+
+# ✅ Enhance Image Quality (in memory)
+def enhance_tile_array(image):
+    """ Sharpens a decoded tile image. """
+    return cv2.filter2D(image, -1, SHARPEN_KERNEL)
+
+# ✅ Crop Image to Remove Background & Borders
+def crop_tile_image(image_path):
+    """ Crops tile images to remove background and borders. """
+    image = cv2.imread(image_path, cv2.IMREAD_UNCHANGED)
+    cropped = crop_tile_array(image)
+    if cropped is not image:
         cv2.imwrite(image_path, cropped)  # ✅ Overwrite the original image with the cropped version
 
     return image_path
@@ -23,12 +56,7 @@ def crop_tile_image(image_path):
 def enhance_tile_image(image_path):
     """ Enhances tile images by applying sharpening filters. """
     image = cv2.imread(image_path)
-    
-    # ✅ Apply Sharpening Kernel
-    kernel = np.array([[0, -1, 0], [-1, 5, -1], [0, -1, 0]])
-    sharpened = cv2.filter2D(image, -1, kernel)
-
-    cv2.imwrite(image_path, sharpened)  # ✅ Overwrite with enhanced image
+    cv2.imwrite(image_path, enhance_tile_array(image))  # ✅ Overwrite with enhanced image
     return image_path
 
 # ✅ Convert Image Format (JPEG, PNG)
@@ -50,5 +78,77 @@ def convert_image_to_webp(image_path):
     """ Converts image to WEBP format for web performance optimization. """
     image = cv2.imread(image_path)
     output_path = image_path.rsplit(".", 1)[0] + ".webp"
-    cv2.imwrite(output_path, image, [cv2.IMWRITE_WEBP_QUALITY, 80])  # 80% Quality for optimized size
-    return output_path
\ No newline at end of file
+    write_web_image(image, output_path, "webp")
+    return output_path
+
+# ✅ Responsive-Image Derivatives (fixed-width WebP / AVIF thumbnails)
+
+@lru_cache(maxsize=1)
+def avif_supported():
+    """ True when this OpenCV build can encode AVIF. """
+    try:
+        ok, _ = cv2.imencode(".avif", np.zeros((8, 8, 3), dtype=np.uint8), [cv2.IMWRITE_AVIF_QUALITY, AVIF_QUALITY])
+        return bool(ok)
+    except (cv2.error, AttributeError):
+        return False
+
+def write_web_image(image, output_path, fmt="webp"):
+    """ Encodes `image` as WebP (or AVIF) and publishes it with an atomic rename. """
+    params = [cv2.IMWRITE_AVIF_QUALITY, AVIF_QUALITY] if fmt == "avif" else [cv2.IMWRITE_WEBP_QUALITY, WEBP_QUALITY]
+    ok, encoded = cv2.imencode(f".{fmt}", image, params)
+    if not ok:
+        raise ValueError(f"Could not encode {output_path} as {fmt}")
+
+    staging_path = f"{output_path}.{uuid4().hex}.tmp"
+    with open(staging_path, "wb") as f:
+        f.write(encoded.tobytes())
+    os.replace(staging_path, output_path)  # ✅ Concurrent requests never see a half-written thumbnail
+    return output_path
+
+def derivative_path(image_path, width, fmt="webp"):
+    """
+    Where the `width`-pixel derivative of a stored image lives, mirroring the source tree:
+    `tiles_storage/blobs/ab/cd/<sha>.jpg` -> `tiles_storage/derived/320/blobs/ab/cd/<sha>.webp`.
+    """
+    relative = os.path.relpath(os.path.normpath(image_path), BASE_STORAGE_PATH)
+    return os.path.join(DERIVATIVE_STORAGE, str(width), os.path.splitext(relative)[0] + f".{fmt}")
+
+def is_derivative_fresh(image_path, derivative) -> bool:
+    """ True when `derivative` exists and is not older than its source (an overwritten source invalidates it). """
+    try:
+        return os.stat(derivative).st_mtime_ns >= os.stat(image_path).st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+def generate_thumbnails(image_path, widths=THUMBNAIL_WIDTHS, formats=("webp",)):
+    """
+    Creates the missing or stale derivatives of `image_path` (the source is decoded at most once) and
+    returns their paths as `{(width, fmt): path}`. Sources narrower than a width are never upscaled.
+    Runs in the CPU process pool, so it must stay a picklable module-level function.
+    """
+    formats = [fmt for fmt in formats if fmt != "avif" or avif_supported()]
+    targets = {(width, fmt): derivative_path(image_path, width, fmt) for width in widths for fmt in formats}
+    missing = {key: path for key, path in targets.items() if not is_derivative_fresh(image_path, path)}
+    if not missing:
+        return targets
+
+    image = cv2.imread(image_path, cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError(f"Could not load image: {image_path}")
+
+    h, w = image.shape[:2]
+    for (width, fmt), path in sorted(missing.items(), reverse=True):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if w > width:
+            resized = cv2.resize(image, (width, max(1, round(h * width / w))), interpolation=cv2.INTER_AREA)
+        else:
+            resized = image
+        write_web_image(resized, path, fmt)
+    return targets
+
+def thumbnail_urls(image_url):
+    """ Derivative URLs (served by the lazy thumbnail route) for a stored image, keyed by width. """
+    image_url = (image_url or "").replace("\\", "/")
+    if not image_url.startswith(BASE_STORAGE_PATH + "/"):
+        return {}
+    return {str(width): f"{THUMBNAIL_ROUTE}/{width}/{image_url}" for width in THUMBNAIL_WIDTHS}
\ No newline at end of file
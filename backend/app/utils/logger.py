@@ -1,16 +1,159 @@
+import atexit
+import copy
+import json
 import logging
+import queue
+import random
+import sys
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 
-# Configure logging
-logging.basicConfig(
-    filename="app.log",
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-)
+from app.core.settings import settings
+
+# ✅ Set per request by `RequestIdMiddleware`; sync endpoints see it through the copied context
+request_id_var = ContextVar("request_id", default=None)
+
+# ✅ Attributes every LogRecord has; anything else was passed via `extra=` and is logged as a field
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """ One JSON object per line: time, level, logger, message, request id, location and `extra` fields. """
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        entry["where"] = f"{record.module}:{record.lineno}"
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class DebugSampler(logging.Filter):
+    """ Keeps every INFO+ record but only a `rate` fraction of DEBUG ones (high-volume hot-path events). """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return record.levelno > logging.DEBUG or self.rate >= 1 or random.random() < self.rate
+
+
+class RequestIdFilter(logging.Filter):
+    """ Stamps the current request id on the record (runs in the emitting thread, before the queue hop). """
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Hands records to the listener thread; formatting and I/O never happen in the caller.
+    When the queue is full the record is dropped (and counted) instead of blocking the event loop.
+    """
+
+    dropped = 0
+
+    def prepare(self, record):
+        # ✅ Resolve the message and traceback now (args may be mutated later), keep the record structured
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            NonBlockingQueueHandler.dropped += 1
+
+
+def _parse_levels(spec: str) -> dict:
+    """ `"sqlalchemy.engine=WARNING,app.services=DEBUG"` -> `{"sqlalchemy.engine": "WARNING", ...}` """
+    levels = {}
+    for item in spec.split(","):
+        name, _, level = item.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def setup_logging(log_file: bool = True):
+    """
+    Routes every log record through a queue to a background listener that writes JSON lines
+    to stderr (and `LOG_FILE` unless `log_file` is False). Safe to call more than once.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    formatter = JsonFormatter()
+    handlers = [logging.StreamHandler(sys.stderr)]
+    if log_file and settings.LOG_FILE:
+        handlers.append(logging.FileHandler(settings.LOG_FILE, encoding="utf-8"))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    queue_handler = NonBlockingQueueHandler(queue.Queue(maxsize=settings.LOG_QUEUE_SIZE))
+    queue_handler.addFilter(DebugSampler(settings.LOG_DEBUG_SAMPLE_RATE))
+    queue_handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(settings.LOG_LEVEL.upper())
+
+    # ✅ Per-module levels (e.g. keep SQLAlchemy's statement echo off even when the app logs DEBUG)
+    for name, level in _parse_levels(settings.LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level)
+
+    _listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _listener
+
+
+def setup_worker_logging():
+    """ CPU worker initializer: stderr only, so `LOG_FILE` keeps a single writer (the main process). """
+    setup_logging(log_file=False)
+
+
+def stop_logging():
+    """ Flushes the queue and stops the listener thread. """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+logger = logging.getLogger("app")
 
 # ✅ Log events
 def log_event(event: str):
-    logging.info(event)
+    logger.info(event)
 
 # ✅ Log errors
 def log_error(error: str):
-    logging.error(error)
+    logger.error(error)
@@ -0,0 +1,61 @@
+import time
+
+from starlette.datastructures import MutableHeaders
+
+from app.core.metrics import REQUEST_DB_SECONDS, REQUEST_DB_STATEMENTS, REQUEST_SECONDS, start_request_timings
+from app.core.settings import settings
+
+
+def _route_label(scope) -> str:
+    """ Route template (e.g. `/tiles/collection/{collection_id}`) so label values stay bounded. """
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def server_timing_header(timings: dict, total_seconds: float) -> str:
+    entries = []
+    for name in ("db", "inference", "image-io"):
+        if name in timings:
+            count, seconds = timings[name]
+            unit = "queries" if name == "db" else "calls"
+            entries.append(f'{name};dur={seconds * 1000:.1f};desc="{count} {unit}"')
+    entries.append(f"app;dur={total_seconds * 1000:.1f}")
+    return ", ".join(entries)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording per-route latency, SQL statement counts and SQL time,
+    and adding a `Server-Timing` header (db / inference / image-io / app) to every HTTP response.
+    Streaming responses are timed until their last body chunk.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        timings = start_request_timings()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if settings.SERVER_TIMING_ENABLED:
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", server_timing_header(timings, time.perf_counter() - start))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            route = _route_label(scope)
+            statements, db_seconds = timings.get("db", (0, 0.0))
+            REQUEST_SECONDS.observe(time.perf_counter() - start, scope["method"], route, str(status))
+            REQUEST_DB_STATEMENTS.observe(statements, route)
+            REQUEST_DB_SECONDS.observe(db_seconds, route)
@@ -0,0 +1,72 @@
+import base64
+import json
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import asc, desc, tuple_
+
+
+def _to_json(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _from_json(value, column):
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if value is None or isinstance(value, python_type):
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(sort_by: str, order: str, value, row_id) -> str:
+    """ Opaque cursor pointing just after the row with sort key `value` and primary key `row_id`. """
+    payload = {"s": sort_by, "o": order, "v": _to_json(value), "id": str(row_id)}
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, order: str, sort_column):
+    """ Returns `(value, row_id)` from a cursor; 400 if it is malformed or was issued for another sort. """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value, row_id = _from_json(payload["v"], sort_column), UUID(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+    if payload.get("s") != sort_by or payload.get("o") != order:
+        raise HTTPException(status_code=400, detail="Cursor does not match the requested sort; restart from the first page")
+    return value, row_id
+
+
+def apply_keyset(query, sort_column, id_column, order: str, after=None):
+    """
+    Orders `query` by `(sort_column, id_column)` and, when `after=(value, id)` is given,
+    seeks past that row with one row-value comparison (served by a `(…, sort_column, id)` index).
+    Sort columns must be NOT NULL for the comparison to be exact.
+    """
+    direction = desc if order == "desc" else asc
+    if after is not None:
+        key = tuple_(sort_column, id_column)
+        query = query.filter(key < tuple_(*after) if order == "desc" else key > tuple_(*after))
+    return query.order_by(direction(sort_column), direction(id_column))
+
+
+def split_page(rows, limit: int, sort_by: str, order: str, key):
+    """
+    Given up to `limit + 1` rows, returns `(page, next_cursor)`; `next_cursor` is None on the last page.
+    `key(row)` returns `(sort_value, row_id)`.
+    """
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor(sort_by, order, *key(page[-1]))
@@ -0,0 +1,38 @@
+import re
+from uuid import uuid4
+
+from starlette.datastructures import MutableHeaders
+
+from app.utils.logger import request_id_var
+
+# ✅ Client-supplied ids are reused only when they look like an id (bounded, no log injection)
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+
+class RequestIdMiddleware:
+    """
+    Pure ASGI middleware giving every HTTP request an id (the incoming `X-Request-ID` or a new one).
+    It is stamped on every log record emitted while the request runs and echoed in the response.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = dict(scope["headers"]).get(b"x-request-id", b"").decode("latin-1")
+        request_id = incoming if _VALID_REQUEST_ID.match(incoming) else uuid4().hex
+        token = request_id_var.set(request_id)
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Request-ID"] = request_id
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            request_id_var.reset(token)
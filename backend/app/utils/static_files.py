@@ -0,0 +1,132 @@
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+from app.core.settings import settings
+
+STORAGE_ROOT = "tiles_storage"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, no-cache"  # ✅ Cache, but check the ETag before reuse
+
+_SHA256_NAME = re.compile(r"^([0-9a-f]{64})\.\w+$")
+_UUID_NAME = re.compile(r"(^|_)[0-9a-f]{32}\.\w+$")  # e.g. processed_<uuid4 hex>.png, written once
+
+_etag_cache = OrderedDict()  # (path, size, mtime_ns) -> etag
+_etag_lock = threading.Lock()
+_ETAG_CACHE_SIZE = 4096
+
+
+def _storage_parts(full_path):
+    relative = os.path.relpath(os.path.realpath(full_path), os.path.realpath(STORAGE_ROOT))
+    return relative.replace(os.sep, "/").split("/")
+
+
+def is_immutable_path(full_path) -> bool:
+    """ True for files whose content can never change under the same name. """
+    parts = _storage_parts(full_path)
+    if parts[0] == "blobs":
+        return True  # Content-addressed originals
+    if parts[0] == "derived" and len(parts) > 2 and parts[2] == "blobs":
+        return True  # Thumbnails of content-addressed originals
+    name = parts[-1]
+    return bool(_SHA256_NAME.match(name) or _UUID_NAME.search(name))
+
+
+def content_etag(full_path, stat_result=None) -> str:
+    """
+    Strong ETag derived from the file content. Content-addressed files reuse the hash in their name;
+    other files are hashed once per (size, mtime) and remembered.
+    """
+    parts = _storage_parts(full_path)
+    match = _SHA256_NAME.match(parts[-1])
+    if match and parts[0] in ("blobs", "derived"):
+        suffix = f"-{parts[1]}{os.path.splitext(parts[-1])[1]}" if parts[0] == "derived" else ""
+        return f'"{match.group(1)}{suffix}"'
+
+    stat_result = stat_result or os.stat(full_path)
+    key = (str(full_path), stat_result.st_size, stat_result.st_mtime_ns)
+    with _etag_lock:
+        if key in _etag_cache:
+            _etag_cache.move_to_end(key)
+            return _etag_cache[key]
+
+    with open(full_path, "rb") as f:
+        etag = f'"{hashlib.file_digest(f, "sha256").hexdigest()}"'
+
+    with _etag_lock:
+        _etag_cache[key] = etag
+        while len(_etag_cache) > _ETAG_CACHE_SIZE:
+            _etag_cache.popitem(last=False)
+    return etag
+
+
+def storage_cache_headers(full_path, stat_result=None) -> dict:
+    """ ETag and Cache-Control headers for a file under `tiles_storage`. """
+    return {
+        "etag": content_etag(full_path, stat_result),
+        "cache-control": IMMUTABLE_CACHE_CONTROL if is_immutable_path(full_path) else REVALIDATE_CACHE_CONTROL,
+    }
+
+
+def _accel_redirect_response(full_path, headers, status_code=200, media_type=None) -> Response:
+    """ Empty response telling nginx to send the file itself (`internal` location at `STATIC_ACCEL_REDIRECT_PREFIX`). """
+    relative = "/".join(_storage_parts(full_path))
+    response = Response(status_code=status_code, headers=headers, media_type=media_type)
+    response.headers["x-accel-redirect"] = settings.STATIC_ACCEL_REDIRECT_PREFIX.rstrip("/") + "/" + relative
+    del response.headers["content-length"]  # ✅ nginx sets the length of the file it sends
+    return response
+
+
+def _is_not_modified(etag, request_headers: Headers) -> bool:
+    if_none_match = request_headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+
+
+def cached_file_response(request: Request, full_path, media_type=None, headers=None) -> Response:
+    """
+    `FileResponse` with strong ETag, cache headers, 304 handling and range support,
+    or an X-Accel-Redirect hand-off when a front-end proxy serves the files.
+    """
+    stat_result = os.stat(full_path)
+    headers = {**(headers or {}), **storage_cache_headers(full_path, stat_result)}
+    if _is_not_modified(headers["etag"], request.headers):
+        return NotModifiedResponse(Headers(headers))
+    if settings.STATIC_ACCEL_REDIRECT_PREFIX:
+        return _accel_redirect_response(full_path, headers, media_type=media_type)
+    return FileResponse(full_path, media_type=media_type, headers=headers, stat_result=stat_result)
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    `StaticFiles` for `tiles_storage` with strong content-hash ETags, `immutable` caching for
+    content-addressed and uuid-named files, and optional X-Accel-Redirect hand-off.
+    Conditional (`If-None-Match` / `If-Modified-Since`) and range requests are handled by Starlette.
+    """
+
+    async def get_response(self, path, scope):
+        # ✅ Starlette resolves the path (and turns bad names into 404s); headers are added to its FileResponse
+        response = await super().get_response(path, scope)
+        if not isinstance(response, FileResponse):
+            return response
+
+        # ✅ Hash uncached files off the event loop
+        response.headers.update(await anyio.to_thread.run_sync(storage_cache_headers, response.path, response.stat_result))
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        if settings.STATIC_ACCEL_REDIRECT_PREFIX:
+            return _accel_redirect_response(response.path, response.headers, response.status_code, response.media_type)
+        return response
+
+    def file_response(self, full_path, stat_result, scope, status_code=200) -> Response:
+        # ✅ Conditional handling happens in `get_response`, once the content ETag is known
+        return FileResponse(full_path, status_code=status_code, stat_result=stat_result)
@@ -7,7 +7,8 @@ from alembic import context
 from app.core.database import Base
 from app.models import (
     user, seller, collection_model, attribute_models, tiles_model,
-    tile_designs_model, favorite_tiles_model, room_template
+    tile_designs_model, favorite_tiles_model, room_template, extraction_job_model,
+    image_blob_model
 )
 from app.models.ai import (
     room_segmentation, processed_image, tile_comparison, matching_tiles, painted_walls
@@ -0,0 +1,36 @@
+"""Trigram search indexes
+
+Revision ID: a7d3e5f1c290
+Revises: f2c6d9a1b8e3
+Create Date: 2026-10-18 16:08:44.219537
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3e5f1c290'
+down_revision: Union[str, None] = 'f2c6d9a1b8e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRGM_INDEXES = [
+    ('ix_tile_designs_tile_name_trgm', 'tile_designs', 'tile_name'),
+    ('ix_tile_designs_tile_code_trgm', 'tile_designs', 'tile_code'),
+    ('ix_tile_collections_name_trgm', 'tile_collections', 'name'),
+    ('ix_tile_colors_name_trgm', 'tile_colors', 'name'),
+]
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, column in TRGM_INDEXES:
+        op.create_index(name, table, [column], unique=False, postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    # ✅ The extension is left installed; other objects may depend on it
+    for name, table, _ in reversed(TRGM_INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,73 @@
+"""Tile code sequence and unique index
+
+Revision ID: b5e8f2a4c6d1
+Revises: a7d3e5f1c290
+Create Date: 2026-10-18 16:47:19.635820
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e8f2a4c6d1'
+down_revision: Union[str, None] = 'a7d3e5f1c290'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# ✅ Must match app/services/tile_code_service.py
+BLOCK_SIZE = 1000
+CODE_OFFSET = 36 ** 7
+ALPHABET = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
+def _base36(value: int) -> str:
+    digits = []
+    while True:
+        value, remainder = divmod(value, 36)
+        digits.append(ALPHABET[remainder])
+        if not value:
+            return ''.join(reversed(digits))
+
+
+def upgrade() -> None:
+    op.execute('CREATE SEQUENCE IF NOT EXISTS tile_code_seq START WITH 1')
+    conn = op.get_bind()
+
+    # ✅ Keep the oldest design per duplicated code; the others get a fresh code below
+    conn.execute(sa.text("""
+        UPDATE tile_designs SET tile_code = NULL
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (PARTITION BY tile_code ORDER BY created_at, id) AS rank
+                FROM tile_designs WHERE tile_code IS NOT NULL
+            ) ranked WHERE rank > 1
+        )
+    """))
+
+    # ✅ Backfill designs without a code from the same sequence the application uses
+    design_ids = conn.execute(sa.text('SELECT id FROM tile_designs WHERE tile_code IS NULL ORDER BY created_at, id')).scalars().all()
+    if design_ids:
+        blocks = -(-len(design_ids) // BLOCK_SIZE)
+        block_numbers = sorted(conn.execute(
+            sa.text('SELECT nextval(\'tile_code_seq\') FROM generate_series(1, :blocks)'), {'blocks': blocks}
+        ).scalars().all())
+        codes = [_base36(CODE_OFFSET + block * BLOCK_SIZE + offset) for block in block_numbers for offset in range(BLOCK_SIZE)]
+        taken = set(conn.execute(sa.text('SELECT tile_code FROM tile_designs WHERE tile_code IS NOT NULL')).scalars())
+        codes = [code for code in codes if code not in taken]
+        while len(codes) < len(design_ids):
+            block = conn.execute(sa.text("SELECT nextval('tile_code_seq')")).scalar()
+            codes += [code for code in (_base36(CODE_OFFSET + block * BLOCK_SIZE + offset) for offset in range(BLOCK_SIZE)) if code not in taken]
+        conn.execute(
+            sa.text('UPDATE tile_designs SET tile_code = :code WHERE id = :id'),
+            [{'id': design_id, 'code': code} for design_id, code in zip(design_ids, codes)]
+        )
+
+    op.create_index('uq_tile_designs_tile_code', 'tile_designs', ['tile_code'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_tile_designs_tile_code', table_name='tile_designs')
+    op.execute('DROP SEQUENCE IF EXISTS tile_code_seq')
@@ -0,0 +1,32 @@
+"""Segmentation cache columns (room type, image hash, model version)
+
+Revision ID: b7e2c4a91d35
+Revises: 4269d38efbf0
+Create Date: 2026-10-18 09:12:41.204417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2c4a91d35'
+down_revision: Union[str, None] = '4269d38efbf0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('room_segmentations', sa.Column('room_type', sa.String(length=50), nullable=True))
+    op.add_column('room_segmentations', sa.Column('image_hash', sa.String(length=64), nullable=True))
+    op.add_column('room_segmentations', sa.Column('model_version', sa.String(length=100), nullable=True))
+    op.create_index(op.f('ix_room_segmentations_image_hash'), 'room_segmentations', ['image_hash'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_room_segmentations_image_hash'), table_name='room_segmentations')
+    op.drop_column('room_segmentations', 'model_version')
+    op.drop_column('room_segmentations', 'image_hash')
+    op.drop_column('room_segmentations', 'room_type')
@@ -0,0 +1,48 @@
+"""Background PDF extraction jobs
+
+Revision ID: c3f1a8d2e6b4
+Revises: b7e2c4a91d35
+Create Date: 2026-10-18 11:03:27.518230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f1a8d2e6b4'
+down_revision: Union[str, None] = 'b7e2c4a91d35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('extraction_jobs',
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('collection_id', postgresql.UUID(as_uuid=True), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('original_filename', sa.String(length=255), nullable=True),
+    sa.Column('pdf_path', sa.String(length=500), nullable=False),
+    sa.Column('thickness', sa.Float(), nullable=True),
+    sa.Column('total_pages', sa.Integer(), nullable=True),
+    sa.Column('processed_pages', sa.Integer(), nullable=False),
+    sa.Column('completed_pages', sa.JSON(), nullable=False),
+    sa.Column('results', sa.JSON(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(), nullable=True),
+    sa.Column('updated_at', sa.TIMESTAMP(), nullable=True),
+    sa.Column('finished_at', sa.TIMESTAMP(), nullable=True),
+    sa.ForeignKeyConstraint(['collection_id'], ['tile_collections.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_extraction_jobs_id'), 'extraction_jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_extraction_jobs_status'), 'extraction_jobs', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_extraction_jobs_status'), table_name='extraction_jobs')
+    op.drop_index(op.f('ix_extraction_jobs_id'), table_name='extraction_jobs')
+    op.drop_table('extraction_jobs')
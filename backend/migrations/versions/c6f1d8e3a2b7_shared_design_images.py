@@ -0,0 +1,43 @@
+"""Designs share stored images; blob ref counts track live tiles
+
+Revision ID: c6f1d8e3a2b7
+Revises: b5e8f2a4c6d1
+Create Date: 2026-10-19 09:12:44.218305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6f1d8e3a2b7'
+down_revision: Union[str, None] = 'b5e8f2a4c6d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_constraint('tile_designs_image_url_key', 'tile_designs', type_='unique')
+    op.create_index(op.f('ix_tile_designs_image_url'), 'tile_designs', ['image_url'], unique=False)
+
+    # ✅ ref_count now counts live tiles (it used to count designs)
+    op.execute("""
+        UPDATE image_blobs SET ref_count = (
+            SELECT count(*) FROM tiles
+            JOIN tile_designs ON tiles.tile_design_id = tile_designs.id
+            WHERE tile_designs.image_url = image_blobs.path AND tiles.deleted_at IS NULL
+        )
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        UPDATE image_blobs SET ref_count = (
+            SELECT count(*) FROM tile_designs WHERE tile_designs.image_url = image_blobs.path
+        )
+    """)
+    op.drop_index(op.f('ix_tile_designs_image_url'), table_name='tile_designs')
+    # ✅ Fails if designs now share an image; merge them before downgrading
+    op.create_unique_constraint('tile_designs_image_url_key', 'tile_designs', ['image_url'])
@@ -0,0 +1,34 @@
+"""Content-addressed image blobs
+
+Revision ID: d8a4e2b7c915
+Revises: c3f1a8d2e6b4
+Create Date: 2026-10-18 13:41:09.772104
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8a4e2b7c915'
+down_revision: Union[str, None] = 'c3f1a8d2e6b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('image_blobs',
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('path', sa.String(length=500), nullable=False),
+    sa.Column('size', sa.BigInteger(), nullable=False),
+    sa.Column('ref_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), nullable=True),
+    sa.PrimaryKeyConstraint('sha256'),
+    sa.UniqueConstraint('path')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('image_blobs')
@@ -0,0 +1,49 @@
+"""Keyset pagination indexes on tiles
+
+Revision ID: e41b7c9d2f08
+Revises: d8a4e2b7c915
+Create Date: 2026-10-18 14:52:33.106218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e41b7c9d2f08'
+down_revision: Union[str, None] = 'd8a4e2b7c915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_tiles_collection_created_at_id', ['collection_id', 'created_at', 'id']),
+    ('ix_tiles_collection_usage_count_id', ['collection_id', 'usage_count', 'id']),
+    ('ix_tiles_collection_priority_id', ['collection_id', 'priority', 'id']),
+    ('ix_tiles_created_at_id', ['created_at', 'id']),
+    ('ix_tiles_usage_count_id', ['usage_count', 'id']),
+    ('ix_tiles_priority_id', ['priority', 'id']),
+]
+
+
+def upgrade() -> None:
+    # ✅ Sort keys must be NOT NULL for row-value seeks to be exact
+    op.execute("UPDATE tiles SET created_at = COALESCE(updated_at, now()) WHERE created_at IS NULL")
+    op.execute("UPDATE tiles SET usage_count = 0 WHERE usage_count IS NULL")
+    op.execute("UPDATE tiles SET priority = 2 WHERE priority IS NULL")
+    op.alter_column('tiles', 'created_at', existing_type=sa.TIMESTAMP(), nullable=False)
+    op.alter_column('tiles', 'usage_count', existing_type=sa.Integer(), nullable=False)
+    op.alter_column('tiles', 'priority', existing_type=sa.Integer(), nullable=False)
+
+    for name, columns in INDEXES:
+        op.create_index(name, 'tiles', columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name='tiles')
+
+    op.alter_column('tiles', 'priority', existing_type=sa.Integer(), nullable=True)
+    op.alter_column('tiles', 'usage_count', existing_type=sa.Integer(), nullable=True)
+    op.alter_column('tiles', 'created_at', existing_type=sa.TIMESTAMP(), nullable=True)
@@ -0,0 +1,59 @@
+"""Composite and partial indexes for catalog listings
+
+Revision ID: f2c6d9a1b8e3
+Revises: e41b7c9d2f08
+Create Date: 2026-10-18 15:31:07.482913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c6d9a1b8e3'
+down_revision: Union[str, None] = 'e41b7c9d2f08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LIVE = sa.text('deleted_at IS NULL')
+
+# ✅ Keyset indexes from e41b7c9d2f08, rebuilt as partial indexes over live tiles
+KEYSET_INDEXES = [
+    ('ix_tiles_collection_created_at_id', 'ix_tiles_live_collection_created_at_id', ['collection_id', 'created_at', 'id']),
+    ('ix_tiles_collection_usage_count_id', 'ix_tiles_live_collection_usage_count_id', ['collection_id', 'usage_count', 'id']),
+    ('ix_tiles_collection_priority_id', 'ix_tiles_live_collection_priority_id', ['collection_id', 'priority', 'id']),
+    ('ix_tiles_created_at_id', 'ix_tiles_live_created_at_id', ['created_at', 'id']),
+    ('ix_tiles_usage_count_id', 'ix_tiles_live_usage_count_id', ['usage_count', 'id']),
+    ('ix_tiles_priority_id', 'ix_tiles_live_priority_id', ['priority', 'id']),
+]
+
+
+def upgrade() -> None:
+    for old_name, new_name, columns in KEYSET_INDEXES:
+        op.create_index(new_name, 'tiles', columns, unique=False, postgresql_where=LIVE)
+        op.drop_index(old_name, table_name='tiles')
+
+    # ✅ Default listing of a collection filtered by status, newest first
+    op.create_index(
+        'ix_tiles_live_collection_status_created_at_id', 'tiles',
+        ['collection_id', 'status', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False, postgresql_where=LIVE,
+    )
+    op.create_index('ix_tile_collections_live_seller_id', 'tile_collections', ['seller_id', 'id'], unique=False, postgresql_where=LIVE)
+    op.create_index('ix_favorite_tiles_seller_tile', 'favorite_tiles', ['seller_id', 'tile_id'], unique=False)
+    op.create_index('ix_favorite_collections_seller_collection', 'favorite_collections', ['seller_id', 'collection_id'], unique=False)
+    op.create_index(op.f('ix_tile_designs_color_id'), 'tile_designs', ['color_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_tile_designs_color_id'), table_name='tile_designs')
+    op.drop_index('ix_favorite_collections_seller_collection', table_name='favorite_collections')
+    op.drop_index('ix_favorite_tiles_seller_tile', table_name='favorite_tiles')
+    op.drop_index('ix_tile_collections_live_seller_id', table_name='tile_collections')
+    op.drop_index('ix_tiles_live_collection_status_created_at_id', table_name='tiles')
+
+    for old_name, new_name, columns in reversed(KEYSET_INDEXES):
+        op.create_index(old_name, 'tiles', columns, unique=False)
+        op.drop_index(new_name, table_name='tiles')
@@ -0,0 +1,59 @@
+"""Extraction job results stored per page
+
+Revision ID: f4b9c2e7d1a3
+Revises: c6f1d8e3a2b7
+Create Date: 2026-10-19 15:40:12.604117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b9c2e7d1a3'
+down_revision: Union[str, None] = 'c6f1d8e3a2b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('extraction_job_pages',
+    sa.Column('job_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('page', sa.Integer(), nullable=False),
+    sa.Column('tiles', sa.JSON(), nullable=False),
+    sa.ForeignKeyConstraint(['job_id'], ['extraction_jobs.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('job_id', 'page')
+    )
+
+    # ✅ Existing results are kept as one row before the first page; completed pages keep an (empty) row so resumes skip them
+    op.execute("""
+        INSERT INTO extraction_job_pages (job_id, page, tiles)
+        SELECT id, -1, results FROM extraction_jobs WHERE json_array_length(results) > 0
+    """)
+    op.execute("""
+        INSERT INTO extraction_job_pages (job_id, page, tiles)
+        SELECT id, page::int, '[]'::json FROM extraction_jobs, json_array_elements_text(completed_pages) AS page
+    """)
+    op.drop_column('extraction_jobs', 'results')
+    op.drop_column('extraction_jobs', 'completed_pages')
+
+
+def downgrade() -> None:
+    op.add_column('extraction_jobs', sa.Column('completed_pages', sa.JSON(), server_default='[]', nullable=False))
+    op.add_column('extraction_jobs', sa.Column('results', sa.JSON(), server_default='[]', nullable=False))
+    op.execute("""
+        UPDATE extraction_jobs SET
+            completed_pages = COALESCE((
+                SELECT json_agg(page ORDER BY page) FROM extraction_job_pages
+                WHERE job_id = extraction_jobs.id AND page >= 0
+            ), '[]'::json),
+            results = COALESCE((
+                SELECT json_agg(t.tile ORDER BY page, t.n)
+                FROM extraction_job_pages, json_array_elements(tiles) WITH ORDINALITY AS t(tile, n)
+                WHERE job_id = extraction_jobs.id
+            ), '[]'::json)
+    """)
+    op.drop_table('extraction_job_pages')
@@ -0,0 +1,143 @@
+import asyncio
+import json
+import os
+import uuid
+from urllib.parse import urlencode
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")  # ✅ Must be set before the app modules are imported
+
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base, get_db
+import app.models.user, app.models.seller, app.models.image_blob_model  # noqa: F401 (register every table)
+from app.models.attribute_models import TileCategory, TileColor, TileSize
+from app.models.collection_model import CollectionSuitablePlace, FavoriteCollection, SuitablePlace, TileCollection
+from app.models.favorite_tiles_model import FavoriteTile
+from app.models.tile_designs_model import TileDesign
+from app.models.tiles_model import Tile
+from app.routes import favorite_routes, favorite_tiles_routes, tile_routes
+
+
+@pytest.fixture
+def db():
+    """ Fresh in-memory SQLite database per test (one shared connection, so every session sees the same data). """
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def api(db):
+    """ Calls the listing routes in-process (plain ASGI, no HTTP client needed); returns `(status, json)`. """
+    app = FastAPI()
+    app.include_router(favorite_routes.router)
+    app.include_router(favorite_tiles_routes.router)
+    app.include_router(tile_routes.router)
+
+    def override_get_db():
+        yield db
+    app.dependency_overrides[get_db] = override_get_db
+
+    def get(path, **params):
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+            "query_string": urlencode({k: str(v) for k, v in params.items() if v is not None}).encode(),
+            "headers": [], "server": ("testserver", 80), "client": ("testclient", 50000),
+        }
+        asyncio.run(app(scope, receive, send))
+        body = b"".join(message.get("body", b"") for message in messages if message["type"] == "http.response.body")
+        return messages[0]["status"], json.loads(body)
+
+    return get
+
+
+def seed_catalog(db):
+    """
+    A seller with many favorited collections (each with a suitable place) and many favorited tiles,
+    so any per-row query shows up as a statement-count regression.
+    """
+    seller_id = uuid.uuid4()
+    size = TileSize(id=uuid.uuid4(), name="60x60")
+    category = TileCategory(id=uuid.uuid4(), name="Floor")
+    color = TileColor(id=uuid.uuid4(), name="Red", hex_code="#ff0000")
+    place = SuitablePlace(id=uuid.uuid4(), name="Kitchen")
+    db.add_all([size, category, color, place])
+
+    collection_ids = []
+    for c in range(25):
+        collection = TileCollection(
+            id=uuid.uuid4(), seller_id=seller_id, name=f"Collection {c}",
+            size_id=size.id, category_id=category.id, status="active"
+        )
+        db.add(collection)
+        db.add(CollectionSuitablePlace(id=uuid.uuid4(), collection_id=collection.id, place_id=place.id))
+        db.add(FavoriteCollection(id=uuid.uuid4(), seller_id=seller_id, collection_id=collection.id))
+        collection_ids.append(collection.id)
+
+        for t in range(8):
+            design = TileDesign(id=uuid.uuid4(), tile_name=f"Design {c}-{t}", image_url=f"{c}-{t}.png", color_id=color.id)
+            tile = Tile(id=uuid.uuid4(), collection_id=collection.id, tile_design_id=design.id, status="active")
+            db.add_all([design, tile])
+            db.add(FavoriteTile(id=uuid.uuid4(), seller_id=seller_id, tile_id=tile.id))
+
+    db.commit()
+    db.expunge_all()  # ✅ Nothing cached in the identity map: every row must come from the endpoint's own queries
+    return {"seller_id": seller_id, "collection_ids": collection_ids}
+
+
+@pytest.fixture
+def catalog(db):
+    return seed_catalog(db)
+
+
+@pytest.fixture
+def pg_db():
+    """
+    Session on a throwaway schema of the Postgres database in `TEST_POSTGRES_URL`
+    (skipped when it isn't set). Tables and indexes come from the models, pg_trgm included.
+    """
+    url = os.getenv("TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+    engine = create_engine(url, connect_args={"options": f"-csearch_path={schema},public"})
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        conn.exec_driver_sql(f"CREATE SCHEMA {schema}")
+    Base.metadata.create_all(engine)
+
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        with engine.begin() as conn:
+            conn.exec_driver_sql(f"DROP SCHEMA {schema} CASCADE")
+        engine.dispose()
+
+
+@pytest.fixture
+def pg_catalog(pg_db):
+    catalog = seed_catalog(pg_db)
+    pg_db.execute(text("ANALYZE"))
+    pg_db.commit()
+    return catalog
@@ -0,0 +1,91 @@
+import json
+
+from sqlalchemy import event
+
+from app.services.favorite_service import get_favorites
+from app.services.favorite_tiles_service import get_favorite_tiles
+from app.services.search_service import search_tiles
+from app.services.tile_service import get_filtered_tiles, get_tiles_by_collection
+
+
+def _plan_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from _plan_nodes(child)
+
+
+def explain_statements(db, call):
+    """
+    Runs `call()` and returns the plan nodes of every SELECT it sent, as `EXPLAIN (FORMAT JSON)` reports them.
+    Sequential scans are disabled first: Postgres still falls back to one when no index fits the query,
+    so a Seq Scan in the plan means the index doesn't match, whatever the table size.
+    """
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    connection = db.connection()
+    connection.exec_driver_sql("SET enable_seqscan = off")
+    event.listen(connection, "before_cursor_execute", capture)
+    try:
+        call()
+    finally:
+        event.remove(connection, "before_cursor_execute", capture)
+
+    plans = []
+    for statement, parameters in captured:
+        result = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+        plan = (json.loads(result) if isinstance(result, str) else result)[0]["Plan"]
+        plans.append(list(_plan_nodes(plan)))
+    return plans
+
+
+def _scans(plans, relation):
+    return [node for nodes in plans for node in nodes if node.get("Relation Name") == relation]
+
+
+def _index_names(plans):
+    """ Indexes used anywhere in the plans (Bitmap Index Scans name the index but not the table). """
+    return {node["Index Name"] for nodes in plans for node in nodes if "Index Name" in node}
+
+
+def test_collection_listing_uses_live_keyset_index(pg_db, pg_catalog):
+    plans = explain_statements(pg_db, lambda: get_tiles_by_collection(
+        pg_db, pg_catalog["collection_ids"][0], seller_id=pg_catalog["seller_id"], limit=50
+    ))
+
+    scans = _scans(plans, "tiles")
+    assert scans and not [node for node in scans if node["Node Type"] == "Seq Scan"]
+    assert any(name.startswith("ix_tiles_live_collection_") for name in _index_names(plans))
+
+
+def test_favorite_tiles_use_seller_index(pg_db, pg_catalog):
+    plans = explain_statements(pg_db, lambda: get_favorite_tiles(pg_db, pg_catalog["seller_id"]))
+
+    assert "ix_favorite_tiles_seller_tile" in _index_names(plans)
+    assert not [node for node in _scans(plans, "tiles") if node["Node Type"] == "Seq Scan"]
+
+
+def test_favorite_collections_use_seller_index(pg_db, pg_catalog):
+    plans = explain_statements(pg_db, lambda: get_favorites(pg_db, pg_catalog["seller_id"]))
+
+    assert "ix_favorite_collections_seller_collection" in _index_names(plans)
+    assert not [node for node in _scans(plans, "tile_collections") if node["Node Type"] == "Seq Scan"]
+
+
+def test_tile_search_uses_each_tables_trigram_index(pg_db, pg_catalog):
+    seller_id = pg_catalog["seller_id"]
+    plans = explain_statements(pg_db, lambda: (
+        get_filtered_tiles(pg_db, seller_id, search="Design 1"),
+        search_tiles(pg_db, "Design 1", seller_id=seller_id),
+    ))
+
+    # ✅ One trigram index per matched table; a cross-table OR would leave them unused
+    assert {
+        "ix_tile_designs_tile_name_trgm", "ix_tile_designs_tile_code_trgm",
+        "ix_tile_collections_name_trgm", "ix_tile_colors_name_trgm",
+    } <= _index_names(plans)
+    for relation in ("tiles", "tile_designs", "tile_collections", "tile_colors"):
+        assert not [node for node in _scans(plans, relation) if node["Node Type"] == "Seq Scan"], relation
@@ -0,0 +1,136 @@
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app.models.attribute_models import TileCategory, TileColor, TileSeries, TileSize
+from app.models.collection_model import TileCollection
+from app.models.favorite_tiles_model import FavoriteTile
+from app.models.tile_designs_model import TileDesign
+from app.models.tiles_model import Tile
+from app.services.facet_service import FACETS, FacetCache, facet_cache, get_sidebar_facets
+
+
+@pytest.fixture
+def varied_catalog(db, catalog):
+    """ The seeded catalog with attributes spread over collections, several colors, deleted rows and priorities. """
+    categories = [TileCategory(id=uuid.uuid4(), name=f"Category {i}") for i in range(3)]
+    sizes = [TileSize(id=uuid.uuid4(), name=f"{20 * (i + 1)}x{40 * (i + 1)}") for i in range(2)]
+    series = [TileSeries(id=uuid.uuid4(), name=f"Series {i}") for i in range(2)]
+    colors = [TileColor(id=uuid.uuid4(), name=f"Color {i}", hex_code=f"#00000{i}") for i in range(3)]
+    db.add_all(categories + sizes + series + colors)
+
+    collections = db.query(TileCollection).order_by(TileCollection.name).all()
+    for index, collection in enumerate(collections):
+        collection.category_id = categories[index % 3].id
+        collection.size_id = sizes[index % 2].id
+        collection.series_id = series[index % 2].id if index % 4 else None
+    collections[-1].deleted_at = datetime.utcnow()  # ✅ Attributes of deleted collections are not listed
+
+    for index, (tile, design) in enumerate(db.query(Tile, TileDesign).join(TileDesign).order_by(Tile.id)):
+        design.color_id = colors[index % 3].id
+        tile.priority = index % 2 + 1
+        if index % 11 == 0:
+            tile.deleted_at = datetime.utcnow()
+    for tile in db.query(Tile).filter(Tile.collection_id == collections[0].id):
+        tile.deleted_at = datetime.utcnow()  # ✅ Listed with a zero count
+    db.commit()
+    facet_cache.invalidate()
+    return {**catalog, "categories": categories, "sizes": sizes, "series": series, "colors": colors}
+
+
+def _expected_facets(db, seller_id, selected, priority=None, favorite=None):
+    """ Each facet counted on its own, in Python, from the raw rows. """
+    favorites = {tile_id for (tile_id,) in db.query(FavoriteTile.tile_id).filter(FavoriteTile.seller_id == seller_id)}
+    rows = []
+    for collection in db.query(TileCollection).filter(
+        TileCollection.seller_id == seller_id, TileCollection.deleted_at.is_(None)
+    ):
+        tiles = [
+            (tile, design) for tile, design in db.query(Tile, TileDesign).outerjoin(TileDesign).filter(
+                Tile.collection_id == collection.id, Tile.deleted_at.is_(None)
+            )
+            if (not priority or tile.priority == priority) and (not favorite or tile.id in favorites)
+        ]
+        attributes = {
+            "collection_id": collection.id, "category_id": collection.category_id, "series_id": collection.series_id,
+            "finish_id": collection.finish_id, "size_id": collection.size_id, "material_id": collection.material_id,
+        }
+        rows.extend({**attributes, "color_id": design.color_id if design else None, "tile_id": tile.id} for tile, design in tiles)
+        if not tiles:
+            rows.append({**attributes, "color_id": None, "tile_id": None})
+
+    expected = {}
+    for name, _, column in FACETS:
+        counts = {}
+        for row in rows:
+            if row[column] is None:
+                continue
+            matches = all(row[other_column] in selected[other] for other, _, other_column in FACETS
+                          if other != name and selected[other])
+            counts[row[column]] = counts.get(row[column], 0) + bool(row["tile_id"] and matches)
+        expected[name] = counts
+    return expected
+
+
+def _counts(facets):
+    return {name: {value["id"]: value["count"] for value in values} for name, values in facets.items()}
+
+
+@pytest.mark.parametrize("pick, priority, favorite", [
+    ({}, None, None),
+    ({"categories": [0]}, None, None),
+    ({"categories": [0, 1], "colors": [2]}, None, None),
+    ({"sizes": [1], "series": [0], "colors": [0, 1]}, 2, True),
+])
+def test_union_facets_match_per_facet_counts(db, varied_catalog, pick, priority, favorite):
+    selected = {name: [] for name, _, _ in FACETS}
+    for name, indexes in pick.items():
+        selected[name] = [varied_catalog[name][i].id for i in indexes]
+
+    facets = get_sidebar_facets(
+        db, varied_catalog["seller_id"],
+        category_id=selected["categories"], series_id=selected["series"], size_id=selected["sizes"],
+        color_id=selected["colors"], priority=priority, favorite=favorite
+    )
+
+    assert _counts(facets) == _expected_facets(db, varied_catalog["seller_id"], selected, priority, favorite)
+    assert {value["hex_code"] for value in facets["colors"]} == {color.hex_code for color in varied_catalog["colors"]}
+    assert any(value["count"] == 0 for value in facets["collections"])
+
+
+def test_facets_are_cached_until_a_write(db, varied_catalog):
+    seller_id = varied_catalog["seller_id"]
+    first = get_sidebar_facets(db, seller_id)
+    assert get_sidebar_facets(db, seller_id) is first
+
+    collection_id = varied_catalog["collection_ids"][1]
+    db.add(Tile(id=uuid.uuid4(), collection_id=collection_id, status="active"))
+    db.commit()  # ✅ ORM insert bumps the cache generation
+
+    fresh = get_sidebar_facets(db, seller_id)
+    assert fresh is not first
+    assert _counts(fresh)["collections"][collection_id] == _counts(first)["collections"][collection_id] + 1
+
+
+def test_result_computed_before_an_invalidation_is_not_cached():
+    cache = FacetCache(ttl_seconds=60, max_entries=10)
+    cached, generation = cache.get("key")
+    assert cached is None
+
+    cache.invalidate()  # ✅ A write lands while the facets are being computed
+    cache.put("key", generation, {"stale": True})
+    assert cache.get("key")[0] is None
+
+    cache.put("key", cache.get("key")[1], {"fresh": True})
+    assert cache.get("key")[0] == {"fresh": True}
+
+
+def test_invalidation_drops_every_entry():
+    cache = FacetCache(ttl_seconds=60, max_entries=10)
+    for key in ("a", "b"):
+        cache.put(key, cache.get(key)[1], {key: 1})
+
+    cache.invalidate()
+
+    assert cache.get("a")[0] is None and cache.get("b")[0] is None
@@ -0,0 +1,106 @@
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.tiles_model import Tile
+from app.services.tile_service import get_filtered_tiles
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+@pytest.mark.parametrize("column, value", [
+    (Tile.created_at, datetime(2026, 10, 18, 9, 30, 15, 123456)),
+    (Tile.usage_count, 42),
+    (Tile.priority, 2),
+])
+def test_cursor_round_trip(column, value):
+    row_id = uuid4()
+    cursor = encode_cursor(column.key, "desc", value, row_id)
+
+    assert decode_cursor(cursor, column.key, "desc", column) == (value, row_id)
+
+
+@pytest.mark.parametrize("sort_by, order", [("usage_count", "desc"), ("created_at", "asc")])
+def test_cursor_rejects_another_sort(sort_by, order):
+    cursor = encode_cursor("created_at", "desc", datetime(2026, 1, 1), uuid4())
+
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, sort_by, order, Tile.created_at)
+    assert error.value.status_code == 400
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor("created_at", "desc", "yesterday", uuid4())])
+def test_cursor_rejects_malformed(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, "created_at", "desc", Tile.created_at)
+    assert error.value.status_code == 400
+
+
+def _tie_sort_keys(db):
+    """ Few distinct sort values, so pages must break ties on the id. """
+    for index, tile in enumerate(db.query(Tile).order_by(Tile.id)):
+        tile.priority = index % 3
+        tile.usage_count = index % 7
+        tile.created_at = datetime(2026, 10, 1 + index % 5)
+    db.commit()
+
+
+@pytest.mark.parametrize("sort_by", ["created_at", "usage_count", "priority"])
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_filtered_tiles_pages_are_continuous(db, catalog, sort_by, order):
+    _tie_sort_keys(db)
+    expected, _ = get_filtered_tiles(db, catalog["seller_id"], sort_by=sort_by, order=order, limit=1000)
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = get_filtered_tiles(db, catalog["seller_id"], sort_by=sort_by, order=order, limit=30, cursor=cursor)
+        seen.extend(tile["id"] for tile in page)
+        if cursor is None:
+            break
+
+    assert len(seen) == 200
+    assert seen == [tile["id"] for tile in expected]
+
+
+def test_last_id_continues_like_the_cursor(db, catalog):
+    _tie_sort_keys(db)
+    first, cursor = get_filtered_tiles(db, catalog["seller_id"], sort_by="priority", limit=25)
+
+    by_cursor, _ = get_filtered_tiles(db, catalog["seller_id"], sort_by="priority", limit=25, cursor=cursor)
+    by_last_id, _ = get_filtered_tiles(db, catalog["seller_id"], sort_by="priority", limit=25, last_id=first[-1]["id"])
+
+    assert [tile["id"] for tile in by_cursor] == [tile["id"] for tile in by_last_id]
+    assert not {tile["id"] for tile in first} & {tile["id"] for tile in by_cursor}
+
+
+def test_collection_tiles_pages_are_continuous(api, db, catalog):
+    _tie_sort_keys(db)
+    collection_id = catalog["collection_ids"][0]
+    params = {"seller_id": catalog["seller_id"], "sort_by": "usage_count", "order": "asc"}
+
+    status, everything = api(f"/tiles/collection/{collection_id}", limit=100, **params)
+    assert status == 200 and everything["next_cursor"] is None
+
+    seen, cursor = [], None
+    while True:
+        status, body = api(f"/tiles/collection/{collection_id}", limit=3, cursor=cursor, **params)
+        assert status == 200
+        seen.extend(tile["id"] for tile in body["tiles"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == [tile["id"] for tile in everything["tiles"]]
+
+
+def test_collection_tiles_reject_a_cursor_from_another_sort(api, catalog):
+    collection_id = catalog["collection_ids"][0]
+    status, body = api(f"/tiles/collection/{collection_id}", seller_id=catalog["seller_id"], limit=3, sort_by="priority")
+    assert status == 200
+
+    status, body = api(
+        f"/tiles/collection/{collection_id}", seller_id=catalog["seller_id"], limit=3,
+        sort_by="usage_count", cursor=body["next_cursor"]
+    )
+    assert status == 400
@@ -0,0 +1,30 @@
+from app.core.query_stats import assert_max_queries
+
+
+def test_favorite_collections_query_count(api, catalog):
+    with assert_max_queries(2):  # ✅ Collection projection + one suitable-places IN query
+        status, body = api("/collections/favorite/", seller_id=catalog["seller_id"])
+
+    assert status == 200
+    assert len(body) == 25
+    assert all(collection["is_favorite"] and collection["suitable_places"] for collection in body)
+
+
+def test_favorite_tiles_query_count(api, catalog):
+    with assert_max_queries(1):  # ✅ One projection over favorites, tiles, designs and colors
+        status, body = api(f"/favorites/{catalog['seller_id']}")
+
+    assert status == 200
+    assert len(body) == 200
+    assert all(tile["name"] for tile in body)
+
+
+def test_collection_tiles_query_count(api, catalog):
+    collection_id = catalog["collection_ids"][0]
+    with assert_max_queries(2):  # ✅ Collection projection (404 check) + one tile page projection
+        status, body = api(
+            f"/tiles/collection/{collection_id}", seller_id=catalog["seller_id"], favorite=True, limit=50
+        )
+
+    assert status == 200
+    assert len(body["tiles"]) == 8
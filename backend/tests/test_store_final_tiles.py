@@ -0,0 +1,108 @@
+import os
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+import app.services.tile_service as tile_service
+from app.ai.processing.tile_suggestion import tile_color_index
+from app.models.attribute_models import TileColor
+from app.models.collection_model import TileCollection
+from app.models.image_blob_model import ImageBlob
+from app.models.tile_designs_model import TileDesign
+from app.models.tiles_model import Tile
+from app.schemas.tile_schema import FinalTileSubmission
+from app.services.facet_service import facet_cache
+from app.services.tile_service import store_final_tiles
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    """ Runs in an empty `tiles_storage`; background thumbnail jobs are recorded instead of started. """
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("tiles_storage/temp")
+    submitted = []
+    monkeypatch.setattr(tile_service.cpu_executor, "submit_nowait", lambda func, *args: submitted.append(args))
+    return submitted
+
+
+@pytest.fixture
+def collection_id(db):
+    collection = TileCollection(id=uuid.uuid4(), seller_id=uuid.uuid4(), name="Imports", size_id=uuid.uuid4())
+    db.add(collection)
+    db.commit()
+    return collection.id
+
+
+def upload(content: bytes) -> str:
+    path = os.path.join("tiles_storage", "temp", f"{uuid.uuid4().hex}.png")
+    with open(path, "wb") as f:
+        f.write(content)
+    return path
+
+
+def new_tile(collection_id, name, content, color=("Red", "#ff0000")):
+    return FinalTileSubmission(
+        collection_id=str(collection_id), name=name, thickness="8",
+        detected_color_name=color[0], detected_color_hex=color[1], temp_image_path=upload(content)
+    )
+
+
+def test_returns_the_stored_tile_rows(db, storage, collection_id):
+    submissions = [new_tile(collection_id, "A", b"same"), new_tile(collection_id, "B", b"same"), new_tile(collection_id, "C", b"other")]
+
+    result = store_final_tiles(db, submissions)
+
+    rows = result["stored_tiles"]
+    assert len(rows) == 3
+    stored = {tile.id: tile for tile in db.query(Tile)}
+    assert [row["id"] for row in rows if row["id"] in stored] == [row["id"] for row in rows]
+    assert all(stored[row["id"]].tile_design_id == row["tile_design_id"] for row in rows)
+    assert all(row["collection_id"] == collection_id and row["status"] == "active" for row in rows)
+
+    designs = {design.id: design for design in db.query(TileDesign)}
+    assert [designs[row["tile_design_id"]].tile_name for row in rows] == ["A", "B", "C"]
+    assert designs[rows[0]["tile_design_id"]].image_url == designs[rows[1]["tile_design_id"]].image_url
+    assert sorted(blob.ref_count for blob in db.query(ImageBlob)) == [1, 2]
+    assert not any(os.path.exists(submission.temp_image_path) for submission in submissions)
+    assert len(storage) == 2  # ✅ One thumbnail job per distinct stored image
+
+
+def test_reuses_existing_designs(db, storage, collection_id):
+    first = store_final_tiles(db, [new_tile(collection_id, "A", b"image")])["stored_tiles"][0]
+
+    rows = store_final_tiles(db, [FinalTileSubmission(
+        collection_id=str(collection_id), tile_design_id=str(first["tile_design_id"]), name="A", thickness="10"
+    )])["stored_tiles"]
+
+    assert rows[0]["tile_design_id"] == first["tile_design_id"]
+    assert db.query(TileDesign).count() == 1
+    assert db.query(ImageBlob).one().ref_count == 2
+
+
+def test_rejects_unknown_designs(db, storage, collection_id):
+    with pytest.raises(HTTPException) as error:
+        store_final_tiles(db, [FinalTileSubmission(
+            collection_id=str(collection_id), tile_design_id=str(uuid.uuid4()), name="X", thickness="8"
+        )])
+
+    assert error.value.status_code == 400
+    assert db.query(Tile).count() == 0
+
+
+def test_invalidates_the_facet_cache(db, storage, collection_id):
+    _, generation = facet_cache.get("any")
+
+    store_final_tiles(db, [new_tile(collection_id, "A", b"image")])
+
+    assert facet_cache.get("any")[1] != generation
+
+
+def test_new_designs_reach_the_color_index(db, storage, collection_id):
+    first = store_final_tiles(db, [new_tile(collection_id, "A", b"a")])["stored_tiles"][0]
+    assert tile_color_index.nearest(db, first["tile_design_id"]) == []  # ✅ Index built with a single design
+
+    second = store_final_tiles(db, [new_tile(collection_id, "B", b"b", ("Darkred", "#8b0000"))])["stored_tiles"][0]
+
+    assert [design_id for design_id, _ in tile_color_index.nearest(db, first["tile_design_id"])] == [second["tile_design_id"]]
+    assert db.query(TileColor).count() == 2
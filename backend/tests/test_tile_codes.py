@@ -0,0 +1,80 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+import app.services.tile_code_service as tile_code_service
+from app.models.tile_designs_model import TileDesign
+from app.services.tile_code_service import TILE_CODE_OFFSET, encode_base36, reserve_tile_codes
+
+
+class FakeSequence:
+    """ Stands in for `nextval('tile_code_seq')`: hands out increasing block numbers, like the shared sequence. """
+
+    def __init__(self):
+        self.next_value = 1
+        self.calls = 0
+
+    def execute(self, statement, params):
+        self.calls += 1
+        values = list(range(self.next_value, self.next_value + params["blocks"]))
+        self.next_value += params["blocks"]
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: values))
+
+
+@pytest.fixture
+def sequence(monkeypatch):
+    """ Postgres allocation path with blocks of 5 codes and an empty per-process pool. """
+    sequence = FakeSequence()
+    reserve_blocks = tile_code_service._reserve_blocks
+    monkeypatch.setattr(tile_code_service, "TILE_CODE_BLOCK_SIZE", 5)
+    monkeypatch.setattr(tile_code_service, "_pool", [])
+    monkeypatch.setattr(tile_code_service, "_is_postgres", lambda db: True)
+    monkeypatch.setattr(tile_code_service, "_reserve_blocks", lambda db, count: reserve_blocks(sequence, count))
+    return sequence
+
+
+def test_base36_codes_are_eight_characters():
+    assert encode_base36(0) == "0"
+    assert encode_base36(35) == "Z"
+    assert encode_base36(TILE_CODE_OFFSET) == "10000000"
+    assert len(encode_base36(36 ** 8 - 1)) == 8
+
+
+def test_codes_are_unique_and_increasing_across_blocks(db, sequence):
+    codes = []
+    for count in (3, 4, 9, 1, 5):
+        codes.extend(reserve_tile_codes(db, count))
+
+    values = [int(code, 36) for code in codes]
+    assert len(set(codes)) == len(codes) == 22
+    assert values == sorted(values)
+    assert all(len(code) == 8 for code in codes)
+    assert sequence.calls == 4  # ✅ One round trip per refill, however many blocks it takes
+
+
+def test_workers_never_share_a_block(db, sequence, monkeypatch):
+    first_worker = reserve_tile_codes(db, 7)
+    monkeypatch.setattr(tile_code_service, "_pool", [])  # ✅ Another process: its own pool, the same sequence
+    second_worker = reserve_tile_codes(db, 7)
+
+    assert not set(first_worker) & set(second_worker)
+    assert max(int(code, 36) for code in first_worker) < min(int(code, 36) for code in second_worker)
+
+
+def test_codes_already_taken_are_skipped(db, sequence):
+    taken = encode_base36(TILE_CODE_OFFSET + 5 + 1)  # ✅ Second code of the first block
+    db.add(TileDesign(id=uuid.uuid4(), tile_name="Manual", tile_code=taken, image_url="manual.png"))
+    db.commit()
+
+    codes = reserve_tile_codes(db, 5)
+
+    assert taken not in codes
+    assert len(set(codes)) == 5
+
+
+def test_random_codes_outside_postgres(db):
+    codes = reserve_tile_codes(db, 50)
+
+    assert len(set(codes)) == 50
+    assert all(len(code) == 8 for code in codes)
@@ -1,9 +1,12 @@
 import apiRequest from "@/utils/apiHelper";
 import { getSellerId } from "@/utils/cookieuserdata";
-import { BulkTileUploadResponse, FinalTileSubmission } from "../types/pdfupload";
+import { BulkTileUploadResponse, ExtractionJobResponse, FinalTileSubmission } from "../types/pdfupload";
 
-// ✅ Upload PDF & Extract Tiles
-export const uploadPDF = async (pdfFile: File, thickness: number, collectionId: string): Promise<BulkTileUploadResponse> => {
+const JOB_POLL_INTERVAL_MS = 2000;
+let activeJobId: string | null = null;
+
+// ✅ Start PDF Extraction Job (returns immediately with a job ID)
+export const startPDFExtraction = async (pdfFile: File, thickness: number, collectionId: string): Promise<ExtractionJobResponse> => {
     const formData = new FormData();
     formData.append("file", pdfFile);
     formData.append("thickness", thickness.toString());
@@ -12,6 +15,36 @@ export const uploadPDF = async (pdfFile: File, thickness: number, collectionId:
     return await apiRequest("/pdf/upload", "POST", formData);
 };
 
+// ✅ Fetch Job Status & Tiles Extracted So Far
+export const getExtractionJob = async (jobId: string): Promise<ExtractionJobResponse> => {
+    return await apiRequest(`/pdf/jobs/${jobId}`);
+};
+
+// ✅ Upload PDF & Extract Tiles (waits for the background job to finish)
+export const uploadPDF = async (
+    pdfFile: File,
+    thickness: number,
+    collectionId: string,
+    onProgress?: (job: ExtractionJobResponse) => void
+): Promise<BulkTileUploadResponse> => {
+    let job = await startPDFExtraction(pdfFile, thickness, collectionId);
+    activeJobId = job.job_id;
+
+    try {
+        while (job.status === "queued" || job.status === "running") {
+            onProgress?.(job);
+            await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+            job = await getExtractionJob(job.job_id);
+        }
+    } finally {
+        activeJobId = null;
+    }
+
+    if (job.status === "failed") throw new Error(job.error || "PDF extraction failed");
+    onProgress?.(job);
+    return { message: job.status, tiles: job.tiles };
+};
+
 // ✅ Fetch Real-Time Progress
 export const getProgress = async (): Promise<{ progress: number }> => {
     return await apiRequest("/progress");
@@ -23,7 +56,11 @@ export const deleteTempTile = async (imagePath: string): Promise<{ message: stri
 };
 
 // ✅ Cancel Extraction Process
-export const cancelExtraction = async (): Promise<{ message: string }> => {
+export const cancelExtraction = async (jobId: string | null = activeJobId): Promise<{ message: string }> => {
+    if (jobId) {
+        await apiRequest(`/pdf/jobs/${jobId}`, "DELETE");
+        return { message: "Extraction process canceled." };
+    }
     return await apiRequest("/pdf/cancel-extraction", "DELETE");
 };
 
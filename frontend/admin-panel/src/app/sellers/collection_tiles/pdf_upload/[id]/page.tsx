@@ -88,7 +88,9 @@ const PdfUploadPage = () => {
         showNotification("Uploading PDF and extracting tiles...", "info");
 
         try {
-            const response: BulkTileUploadResponse = await uploadPDF(pdfFile, parseFloat(thickness), collection_id);
+            const response: BulkTileUploadResponse = await uploadPDF(pdfFile, parseFloat(thickness), collection_id, (job) =>
+                setProgress(Math.max(5, job.progress))
+            );
 
             if (!response.tiles || response.tiles.length === 0) {
                 showNotification("No tiles were extracted. Please try again.", "error");
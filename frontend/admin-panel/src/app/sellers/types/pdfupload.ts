@@ -37,6 +37,17 @@ export interface BulkTileUploadResponse {
     }[];
 }
 
+export interface ExtractionJobResponse {
+    job_id: string;
+    status: "queued" | "running" | "completed" | "failed" | "cancelled";
+    original_filename?: string;
+    total_pages: number | null;
+    processed_pages: number;
+    progress: number;
+    tiles: BulkTileUploadResponse["tiles"];
+    error?: string | null;
+}
+
 export interface FinalTileSubmission {
     collection_id: string;
     seller_id: string;